@@ -0,0 +1,4 @@
+# Francesco Falcon SM3201408
+
+from .runner import BenchResult, Regression, compare, load, measure, run_all, save
+from .workloads import Workload, standard_workloads
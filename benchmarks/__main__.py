@@ -0,0 +1,63 @@
+# Francesco Falcon SM3201408
+
+import argparse
+import sys
+from pathlib import Path
+
+# Aggiunge la root del progetto al sys.path per permettere `import lmc`
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.runner import format_table, load, recheck, run_all, save
+from benchmarks.workloads import standard_workloads
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark di interprete, assembler e grading")
+    parser.add_argument("--repeat", type=int, default=10, help="Campioni cronometrati per carico")
+    parser.add_argument("--min-sample-ms", type=float, default=20.0, help="Durata minima di un campione: i carichi brevi vengono ripetuti")
+    parser.add_argument("--recheck", type=int, default=2, help="Nuove misure dei carichi in regressione prima di segnalarli")
+    parser.add_argument("--scale", type=float, default=1.0, help="Dimensione dei carichi generati")
+    parser.add_argument("--only", nargs="*", default=None, help="Prefissi dei carichi da eseguire (es. kernel: example:sum2)")
+    parser.add_argument("--save", default=None, help="Salva i risultati in questo file JSON")
+    parser.add_argument("--baseline", default=str(BASELINE), help="File di riferimento per il confronto")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Peggioramento relativo ammesso")
+    parser.add_argument("--update-baseline", action="store_true", help="Sovrascrive il riferimento con i risultati correnti")
+    args = parser.parse_args()
+
+    workloads = standard_workloads(args.scale)
+    if args.only:
+        workloads = [w for w in workloads if any(w.name.startswith(p) for p in args.only)]
+    results = run_all(workloads, args.repeat, min_sample_ms=args.min_sample_ms)
+    print(format_table(results))
+
+    if args.save:
+        save(results, args.save)
+    if args.update_baseline:
+        if args.only and Path(args.baseline).exists():
+            # aggiornamento parziale: gli altri carichi restano quelli del riferimento
+            merged = load(args.baseline)
+            merged.update((r.name, r) for r in results)
+            results = list(merged.values())
+        save(results, args.baseline)
+        print(f"Riferimento aggiornato: {args.baseline}")
+        return 0
+    if not Path(args.baseline).exists():
+        print(f"Nessun riferimento in {args.baseline}: confronto saltato")
+        return 0
+    if args.scale != 1.0:
+        print("Confronto saltato: il riferimento è misurato con --scale 1")
+        return 0
+    _, regressions = recheck(workloads, results, load(args.baseline), args.tolerance, args.recheck, args.repeat, args.min_sample_ms)
+    for reg in regressions:
+        print(f"REGRESSIONE {reg}")
+    if not regressions:
+        print(f"Nessuna regressione oltre il {args.tolerance:.0%} rispetto a {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
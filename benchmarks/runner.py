@@ -0,0 +1,215 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import json
+import math
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .workloads import Workload
+
+FORMAT_VERSION = 1
+
+
+@dataclass
+class BenchResult:
+    """Misure di un carico.
+
+    Attributes:
+        name: nome del carico
+        unit: unità di lavoro
+        work: unità svolte per esecuzione
+        rate: unità al secondo (sulla mediana delle esecuzioni)
+        p50_ms: latenza mediana di un'esecuzione in millisecondi
+        p99_ms: 99° percentile della latenza in millisecondi
+        peak_kib: picco di memoria allocata durante un'esecuzione (tracemalloc), in KiB
+        runs: campioni misurati
+        loops: esecuzioni per campione (i carichi brevi vengono ripetuti fino a `min_sample_ms`)
+    """
+
+    name: str
+    unit: str
+    work: int
+    rate: float
+    p50_ms: float
+    p99_ms: float
+    peak_kib: float
+    runs: int
+    loops: int = 1
+
+
+@dataclass
+class Regression:
+    """Metrica peggiorata oltre la tolleranza rispetto al riferimento."""
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.metric} {self.baseline:.4g} -> {self.current:.4g}"
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Percentile con il metodo nearest-rank (q in 0..1)."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def measure(workload: Workload, repeat: int = 20, warmup: int = 1, min_sample_ms: float = 0.0) -> BenchResult:
+    """Misura un carico: `warmup` esecuzioni scartate, `repeat` campioni cronometrati, una con tracemalloc.
+
+    Con `min_sample_ms` un'esecuzione cronometrata stabilisce quante esecuzioni
+    servono per campione perché ognuno duri almeno quel tempo: un carico da pochi
+    microsecondi misurato da solo è dominato dalla risoluzione del timer e dal
+    rumore del sistema. Latenze e throughput restano per singola esecuzione.
+    L'esecuzione con tracemalloc è separata perché il tracciamento rallenta
+    l'interprete e falserebbe le latenze.
+    """
+    for _ in range(warmup):
+        workload.run()
+    loops = 1
+    if min_sample_ms > 0:
+        t0 = time.perf_counter_ns()
+        workload.run()
+        elapsed = (time.perf_counter_ns() - t0) / 1e6
+        loops = max(1, math.ceil(min_sample_ms / elapsed)) if elapsed else 1000
+    times = []
+    work = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        for _ in range(loops):
+            work = workload.run()
+        times.append((time.perf_counter_ns() - t0) / 1e6 / loops)
+    tracemalloc.start()
+    try:
+        workload.run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    p50 = percentile(times, 0.5)
+    return BenchResult(
+        workload.name,
+        workload.unit,
+        work,
+        work / (p50 / 1e3) if p50 else 0.0,
+        p50,
+        percentile(times, 0.99),
+        peak / 1024,
+        repeat,
+        loops,
+    )
+
+
+def run_all(workloads: Iterable[Workload], repeat: int = 20, warmup: int = 1, min_sample_ms: float = 0.0) -> List[BenchResult]:
+    """Misura tutti i carichi nell'ordine dato."""
+    return [measure(w, repeat, warmup, min_sample_ms) for w in workloads]
+
+
+def save(results: List[BenchResult], path: str):
+    """Salva i risultati in JSON (con versione di Python e piattaforma, per riferimento)."""
+    data = {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {r.name: asdict(r) for r in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path: str) -> Dict[str, BenchResult]:
+    """Legge un file salvato da `save`.
+
+    Raises:
+        ValueError: se il formato non è riconosciuto
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Formato benchmark non supportato: {data.get('version')}")
+    return {name: BenchResult(**fields) for name, fields in data["results"].items()}
+
+
+def compare(results: Iterable[BenchResult], baseline: Dict[str, BenchResult], tolerance: float = 0.2) -> List[Regression]:
+    """Confronta con il riferimento: throughput più basso o picco di memoria più alto oltre `tolerance`.
+
+    I carichi assenti dal riferimento (nuovi) non vengono confrontati; un cambio
+    di `work` indica un carico diverso e rende il confronto del throughput non
+    significativo, quindi viene segnalato a parte.
+
+    Args:
+        results: misure correnti
+        baseline: misure di riferimento (da `load`)
+        tolerance: scostamento relativo ammesso (0.2 = 20%)
+
+    Returns:
+        Regressioni trovate (vuota se nessuna)
+    """
+    regressions = []
+    for r in results:
+        ref = baseline.get(r.name)
+        if ref is None:
+            continue
+        if r.work != ref.work:
+            regressions.append(Regression(r.name, "work", ref.work, r.work))
+            continue
+        if r.rate < ref.rate * (1 - tolerance):
+            regressions.append(Regression(r.name, "rate", ref.rate, r.rate))
+        if r.peak_kib > ref.peak_kib * (1 + tolerance):
+            regressions.append(Regression(r.name, "peak_kib", ref.peak_kib, r.peak_kib))
+    return regressions
+
+
+def median_result(results: Sequence[BenchResult]) -> BenchResult:
+    """Misura con il throughput mediano (la più veloce delle due centrali se sono in numero pari)."""
+    ordered = sorted(results, key=lambda r: r.rate)
+    return ordered[len(ordered) // 2]
+
+
+def recheck(
+    workloads: Iterable[Workload],
+    results: List[BenchResult],
+    baseline: Dict[str, BenchResult],
+    tolerance: float = 0.2,
+    rounds: int = 2,
+    repeat: int = 20,
+    min_sample_ms: float = 0.0,
+) -> Tuple[List[BenchResult], List[Regression]]:
+    """Confronta con il riferimento rimisurando i carichi che sembrano peggiorati.
+
+    Un rallentamento temporaneo della macchina può abbassare la mediana di una
+    singola misura; una regressione vera invece si ripete. Ogni carico segnalato
+    viene rimisurato fino a `rounds` volte e si confronta la misura mediana tra
+    tutti i tentativi. I cambi di `work` non vengono rimisurati.
+
+    Returns:
+        Tupla (risultati, con la misura mediana per i carichi rimisurati; regressioni confermate)
+    """
+    by_name = {w.name: w for w in workloads}
+    attempts = {r.name: [r] for r in results}
+    current = list(results)
+    regressions = compare(current, baseline, tolerance)
+    for _ in range(rounds):
+        suspects = {reg.name for reg in regressions if reg.metric != "work" and reg.name in by_name}
+        if not suspects:
+            break
+        for name in sorted(suspects):
+            attempts[name].append(measure(by_name[name], repeat, 1, min_sample_ms))
+        current = [median_result(attempts[r.name]) for r in results]
+        regressions = compare(current, baseline, tolerance)
+    return current, regressions
+
+
+def format_table(results: List[BenchResult]) -> str:
+    """Tabella leggibile dei risultati."""
+    lines = [f"{'carico':<24}{'throughput':>22}{'p50 ms':>10}{'p99 ms':>10}{'picco KiB':>12}"]
+    for r in results:
+        rate = f"{r.rate:,.0f} {r.unit}/s"
+        lines.append(f"{r.name:<24}{rate:>22}{r.p50_ms:>10.2f}{r.p99_ms:>10.2f}{r.peak_kib:>12.1f}")
+    return "\n".join(lines)
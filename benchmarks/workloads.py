@@ -0,0 +1,220 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+from lmc import Assembler, LMC, LMCPool, TrustedImage, WIDE
+from lmc.grading import Case, Program, grade
+from lmc.incremental import IncrementalAssembler
+from lmc.trace import TraceRecorder
+
+ROOT = Path(__file__).resolve().parents[1]
+EXAMPLES = ROOT / "examples"
+
+# (file, input, max_steps) degli esempi classici: counter con n=999 non termina e misura un ciclo lungo
+EXAMPLE_RUNS = [
+    ("sum2.asm", [123, 456], 10000),
+    ("counter.asm", [999], 200000),
+    ("multiplication.lmc", [99, 99], 10000),
+    ("exec.lmc", [901, 902, 705, 600, 0, 4, 5, 6, 7, 8, 9, 0], 10000),
+    ("quine.lmc", [], 10000),
+]
+
+MNEMONICS = ["ADD", "SUB", "STA", "LDA", "BRA", "BRZ", "BRP"]
+
+
+@dataclass
+class Workload:
+    """Carico di lavoro misurabile.
+
+    Attributes:
+        name: identificativo stabile (chiave nel JSON dei risultati)
+        unit: unità di lavoro contata ("istruzioni", "programmi", "casi")
+        run: esegue il carico una volta e restituisce le unità di lavoro svolte
+    """
+
+    name: str
+    unit: str
+    run: Callable[[], int]
+
+
+def _machine_run(memory: Sequence[int], inputs: Sequence[int], max_steps: int, machine: LMC) -> Callable[[], int]:
+    """Esecuzione ripetibile: reset della stessa macchina e `run()`, restituisce i passi."""
+    def run() -> int:
+        machine.reset(memory=memory, inputs=inputs)
+        return machine.run(max_steps)
+
+    return run
+
+
+def multiply_kernel(a: int, b: int, repeat: int) -> str:
+    """Sorgente classico che calcola `repeat` volte a*b per somme ripetute (circa 9*b*repeat passi)."""
+    return f"""\
+        LDA REP
+        STA R
+OUTER   LDA ZERO
+        STA ACC
+        LDA B
+        STA CNT
+MUL     LDA CNT
+        BRZ NEXT
+        LDA ACC
+        ADD A
+        STA ACC
+        LDA CNT
+        SUB ONE
+        STA CNT
+        BRA MUL
+NEXT    LDA R
+        SUB ONE
+        STA R
+        BRZ END
+        BRA OUTER
+END     LDA ACC
+        OUT
+        HLT
+A       DAT {a}
+B       DAT {b}
+REP     DAT {repeat}
+R       DAT
+CNT     DAT
+ACC     DAT
+ZERO    DAT 0
+ONE     DAT 1
+"""
+
+
+def synthetic_source(rng: random.Random, length: int) -> str:
+    """Sorgente casuale valido di `length` istruzioni con etichette e commenti."""
+    lines = []
+    data = max(1, length // 5)
+    for i in range(length - data):
+        op = rng.choice(MNEMONICS + ["INP", "OUT"])
+        label = f"L{i}" if rng.random() < 0.2 else ""
+        if op in ("INP", "OUT"):
+            instr = op
+        else:
+            instr = f"{op} D{rng.randrange(data)}"
+        comment = "  // passo" if rng.random() < 0.3 else ""
+        lines.append(f"{label:<6}{instr}{comment}")
+    lines[-1] = "      HLT"
+    for d in range(data):
+        lines.append(f"D{d}    DAT {rng.randrange(1000)}")
+    return "\n".join(lines)
+
+
+def assembly_corpus(count: int, seed: int = 0) -> List[str]:
+    """Esempi classici del progetto più programmi sintetici, per un totale di `count` sorgenti."""
+    paths = sorted(EXAMPLES.glob("*"))
+    # solo esempi del profilo classico (gli `*_wide` usano la geometria estesa)
+    sources = [p.read_text(encoding="utf-8") for p in paths if p.suffix in (".asm", ".lmc") and not p.stem.endswith("_wide")]
+    rng = random.Random(seed)
+    while len(sources) < count:
+        sources.append(synthetic_source(rng, rng.randint(10, 100)))
+    return sources[:count]
+
+
+def grading_programs(programs: int, cases: int, seed: int = 0) -> List[Program]:
+    """Manifest sintetico: somme e moltiplicazioni con `cases` casi ciascuna e output atteso."""
+    rng = random.Random(seed)
+    sum2 = (EXAMPLES / "sum2.asm").read_text(encoding="utf-8")
+    mul = (EXAMPLES / "multiplication.lmc").read_text(encoding="utf-8")
+    out = []
+    for i in range(programs):
+        if i % 2:
+            pairs = [(rng.randrange(100), rng.randrange(100)) for _ in range(cases)]
+            out.append(Program(f"mul{i}", mul + f"\n// variante {i}", [Case([a, b], [a * b % 1000]) for a, b in pairs]))
+        else:
+            pairs = [(rng.randrange(1000), rng.randrange(1000)) for _ in range(cases)]
+            out.append(Program(f"sum{i}", sum2 + f"\n// variante {i}", [Case([a, b], [(a + b) % 1000]) for a, b in pairs]))
+    return out
+
+
+def standard_workloads(scale: float = 1.0, seed: int = 0) -> List[Workload]:
+    """Carichi standard: esempi, kernel lunghi, corpus da assemblare e grading in lotti.
+
+    Args:
+        scale: moltiplicatore della dimensione dei carichi generati (es. 0.1 per una prova rapida)
+        seed: seme dei dati casuali (stesso seme, stessi carichi)
+
+    Returns:
+        Lista dei carichi, in ordine stabile
+    """
+    asm = Assembler()
+    workloads = []
+    for name, inputs, max_steps in EXAMPLE_RUNS:
+        memory = asm.assemble_file(str(EXAMPLES / name))
+        workloads.append(Workload(f"example:{Path(name).stem}", "istruzioni", _machine_run(memory, inputs, max_steps, LMC())))
+
+    repeat = max(1, min(999, int(200 * scale)))
+    memory = asm.assemble_source(multiply_kernel(37, 999, repeat))
+    workloads.append(Workload("kernel:multiply", "istruzioni", _machine_run(memory, [], 10 ** 8, LMC())))
+    # stesso kernel con la traccia attiva: il rapporto con kernel:multiply è il costo di registrazione
+    workloads.append(Workload("trace:multiply", "istruzioni", _machine_run(memory, [], 10 ** 8, LMC(trace=TraceRecorder()))))
+
+    rng = random.Random(seed)
+    n = max(2, min(500, int(150 * scale)))
+    values = [rng.randrange(WIDE.modulus) for _ in range(n)]
+    memory = Assembler(WIDE).assemble_file(str(EXAMPLES / "sort_wide.asm"))
+    workloads.append(Workload("kernel:sort_wide", "istruzioni", _machine_run(memory, [n] + values, 10 ** 8, LMC(isa=WIDE))))
+
+    corpus = assembly_corpus(max(10, int(10000 * scale)), seed)
+
+    def assemble_corpus() -> int:
+        for _ in asm.assemble_many(corpus):
+            pass
+        return len(corpus)
+
+    workloads.append(Workload("assemble:corpus", "programmi", assemble_corpus))
+
+    # sessione di editor: modifiche di un operando alternate a inserimenti/cancellazioni in testa.
+    # Ogni modifica viene annullata subito dopo, quindi ogni gruppo di 8 (e ogni esecuzione)
+    # riparte dallo stesso sorgente: senza, il carico cambierebbe da un'esecuzione all'altra.
+    edits = max(8, int(2000 * scale)) // 8 * 8
+    lines = synthetic_source(random.Random(seed), 90).splitlines()
+    session = IncrementalAssembler("\n".join(lines))
+
+    def assemble_edits() -> int:
+        for k in range(edits):
+            phase = k % 8
+            if phase == 6:
+                session.replace_lines(0, 0, "      OUT")  # sposta tutte le celle e le etichette
+            elif phase == 7:
+                session.replace_lines(0, 1, "")
+            else:
+                i = k // 2 % 60
+                session.replace_lines(i, i + 1, lines[i] if k % 2 else lines[i].replace("ADD", "SUB"))
+        return edits
+
+    workloads.append(Workload("assemble:edits", "modifiche", assemble_edits))
+
+    programs = grading_programs(max(2, int(40 * scale)), 50, seed)
+
+    def grade_batch() -> int:
+        return sum(1 for _ in grade(programs, workers=0))
+
+    workloads.append(Workload("grading:batch", "casi", grade_batch))
+
+    # preparazione di una richiesta: macchina nuova + reset validato contro pool + TrustedImage
+    requests = max(10, int(2000 * scale))
+    sum2 = asm.assemble_file(str(EXAMPLES / "sum2.asm"))
+
+    def setup_fresh() -> int:
+        for _ in range(requests):
+            LMC().reset(memory=sum2, inputs=[1, 2])
+        return requests
+
+    pool = LMCPool(size=4)
+    image = TrustedImage.from_memory(sum2)
+
+    def setup_pool() -> int:
+        for _ in range(requests):
+            pool.release(pool.acquire(image, [1, 2]))
+        return requests
+
+    workloads.append(Workload("setup:fresh", "richieste", setup_fresh))
+    workloads.append(Workload("setup:pool", "richieste", setup_pool))
+    return workloads
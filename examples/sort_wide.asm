@@ -0,0 +1,84 @@
+// Ordinamento a bolle per il profilo "wide" (1000 celle, valori 0..99999).
+// Legge N e poi N valori, stampa i valori in ordine crescente.
+// Il vettore parte dalla cella 500 ed è scorso con LDI/STI tramite puntatori.
+        INP
+        STA N
+        LDA BASE
+        STA P
+        LDA N
+        STA CNT
+READ    LDA CNT
+        BRZ SORT
+        INP
+        STI P
+        LDA P
+        ADD ONE
+        STA P
+        LDA CNT
+        SUB ONE
+        STA CNT
+        BRA READ
+SORT    LDA N
+        BRZ DONE
+        SUB ONE
+        STA I           // passate rimaste
+OUTER   LDA I
+        BRZ PRINT
+        LDA BASE
+        STA P
+        ADD ONE
+        STA Q
+        LDA I
+        STA J           // confronti nella passata
+INNER   LDA J
+        BRZ NEXT
+        LDI P
+        STA A
+        LDI Q
+        STA B
+        SUB A           // B - A < 0: scambio
+        BRP NOSWAP
+        LDA A
+        STI Q
+        LDA B
+        STI P
+NOSWAP  LDA P
+        ADD ONE
+        STA P
+        LDA Q
+        ADD ONE
+        STA Q
+        LDA J
+        SUB ONE
+        STA J
+        BRA INNER
+NEXT    LDA I
+        SUB ONE
+        STA I
+        BRA OUTER
+PRINT   LDA BASE
+        STA P
+        LDA N
+        STA CNT
+PLOOP   LDA CNT
+        BRZ DONE
+        LDI P
+        OUT
+        LDA P
+        ADD ONE
+        STA P
+        LDA CNT
+        SUB ONE
+        STA CNT
+        BRA PLOOP
+DONE    HLT
+N       DAT
+CNT     DAT
+I       DAT
+J       DAT
+P       DAT
+Q       DAT
+A       DAT
+B       DAT
+ONE     DAT 1
+BASE    DAT 500
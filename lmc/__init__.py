@@ -1,11 +1,60 @@
 # Francesco Falcon SM3201408
 
-from .assembler import Assembler
-from .machine import LMC
+import importlib
+
 from .exceptions import (
     LMCError,
     IllegalInstructionError,
     MemoryErrorLMC,
     InputUnderflowError,
+    NonTerminationDetected,
     AssemblerError,
+    ImageError,
+    ProgramRejected,
+    ServerError,
+    ServerBusy,
 )
+
+# Le classi principali si importano al primo accesso (PEP 562): `import lmc.client`
+# non paga il caricamento di assembler e simulatore, che domina l'avvio dei CLI brevi.
+_LAZY = {
+    "Assembler": "assembler",
+    "LMC": "machine",
+    "MachineSnapshot": "machine",
+    "RunResult": "machine",
+    "TrustedImage": "machine",
+    "CompiledLMC": "compiler",
+    "ISA": "isa",
+    "CLASSIC": "isa",
+    "WIDE": "isa",
+    "LMCPool": "pool",
+    "Debugger": "debugger",
+    "Hit": "debugger",
+}
+
+__all__ = [
+    *_LAZY,
+    "LMCError",
+    "IllegalInstructionError",
+    "MemoryErrorLMC",
+    "InputUnderflowError",
+    "NonTerminationDetected",
+    "AssemblerError",
+    "ImageError",
+    "ProgramRejected",
+    "ServerError",
+    "ServerBusy",
+]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
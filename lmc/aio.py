@@ -0,0 +1,77 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .machine import (
+    LMC,
+    INPUT_WAIT,
+    STEP_LIMIT,
+    UNDERFLOW_BLOCK,
+    RunResult,
+)
+
+
+@dataclass
+class AsyncLMC(LMC):
+    """LMC per asyncio: esegue a fette di istruzioni cedendo il controllo al loop.
+
+    INP legge prima da `input_queue`, poi attende un valore su `inputs`; OUT scrive
+    su `outputs`. Tra una fetta e l'altra la coroutine cede il controllo, quindi un
+    solo processo può servire migliaia di macchine in modo equo senza thread.
+
+    Attributes:
+        inputs: coda asyncio da cui INP attende i valori
+        outputs: coda asyncio su cui OUT pubblica i valori (se limitata, applica backpressure)
+        slice_steps: istruzioni eseguite tra due cessioni del controllo
+    """
+
+    inputs: asyncio.Queue = field(default_factory=asyncio.Queue, repr=False, compare=False)
+    outputs: asyncio.Queue = field(default_factory=asyncio.Queue, repr=False, compare=False)
+    slice_steps: int = 1000
+    _pending_out: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.input_source = self._next_input
+        self.output_sink = self._pending_out.append
+        self.on_underflow = UNDERFLOW_BLOCK
+
+    def _next_input(self) -> Optional[int]:
+        """Valore già disponibile su `inputs`, senza attendere."""
+        try:
+            return self.inputs.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+    async def run_async(self, max_steps: Optional[int] = 10000) -> RunResult:
+        """Esegue fino a HALT, errore o max_steps istruzioni senza bloccare il loop.
+
+        Args:
+            max_steps: numero massimo di istruzioni (None = nessun limite)
+
+        Returns:
+            RunResult cumulativo; gli output sono su `outputs`, quindi `outputs` del
+            risultato è vuoto
+        """
+        start = time.perf_counter_ns()
+        steps = 0
+        while True:
+            budget = self.slice_steps if max_steps is None else min(self.slice_steps, max_steps - steps)
+            res = self.execute(budget)
+            steps += res.steps
+            for value in self._pending_out:
+                await self.outputs.put(value)
+            self._pending_out.clear()
+            if res.reason == INPUT_WAIT:
+                self.push_input(await self.inputs.get())
+                continue
+            if res.reason != STEP_LIMIT or (max_steps is not None and steps >= max_steps):
+                break
+            await asyncio.sleep(0)
+        res.steps = steps
+        res.wall_ns = time.perf_counter_ns() - start
+        return res
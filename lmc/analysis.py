@@ -0,0 +1,369 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from .compiler import is_block_end
+from .exceptions import ProgramRejected
+from .machine import _DECODE, _NEXT_PC, _LDA, _ADD, _STA, _SUB, _BRZ, _BRP, _BRA, _INP, _OUT, _HLT, _ILLEGAL
+
+# Valore sconosciuto nel dominio astratto (accumulatore, flag, contenuto di una cella)
+TOP = None
+
+# Oltre questo numero di valori possibili una cella scritta da STA diventa TOP
+MAX_CELL_VALUES = 8
+
+AbstractState = Tuple[Optional[int], Optional[bool]]  # (accumulatore, flag); None = sconosciuto
+
+
+@dataclass(frozen=True)
+class BasicBlock:
+    """Blocco base raggiungibile del grafo di controllo.
+
+    Attributes:
+        start: indirizzo del leader
+        cells: indirizzi del blocco in ordine di esecuzione
+        successors: leader dei blocchi successori (dopo la potatura dei salti a esito costante)
+    """
+
+    start: int
+    cells: Tuple[int, ...]
+    successors: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class Loop:
+    """Ciclo da cui l'esecuzione non può uscire: il programma non termina se lo raggiunge.
+
+    Attributes:
+        entry: prima cella del ciclo raggiunta dal programma
+        cells: celle del ciclo in ordine crescente
+    """
+
+    entry: int
+    cells: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class Analysis:
+    """Risultato di `analyze`.
+
+    Attributes:
+        reachable: celle che possono essere eseguite
+        unreachable: celle mai eseguite e mai lette/scritte (codice morto)
+        data: celle mai eseguite ma lette o scritte da istruzioni raggiungibili
+        dynamic: celle scritte da STA raggiungibili (contenuto non costante)
+        halts: celle raggiungibili che possono essere un HLT
+        illegal: celle raggiungibili che possono contenere un'istruzione illegale
+        infinite_loops: cicli senza uscita raggiungibili
+        blocks: blocchi base raggiungibili indicizzati per leader
+        successors: successori di ogni cella raggiungibile (dopo la potatura)
+        unknown_code: True se viene eseguita una cella dal contenuto non determinabile;
+            in tal caso le altre informazioni sono solo una sovrastima
+    """
+
+    reachable: FrozenSet[int]
+    unreachable: FrozenSet[int]
+    data: FrozenSet[int]
+    dynamic: FrozenSet[int]
+    halts: FrozenSet[int]
+    illegal: FrozenSet[int]
+    infinite_loops: Tuple[Loop, ...]
+    blocks: Dict[int, BasicBlock]
+    successors: Dict[int, FrozenSet[int]]
+    unknown_code: bool
+
+    @property
+    def leaders(self) -> Tuple[int, ...]:
+        """Indirizzi iniziali dei blocchi base, in ordine crescente."""
+        return tuple(sorted(self.blocks))
+
+    @property
+    def can_halt(self) -> bool:
+        """False se nessuna esecuzione può raggiungere un HLT."""
+        return self.unknown_code or bool(self.halts)
+
+
+def _join(a: Optional[object], b: Optional[object]) -> Optional[object]:
+    return a if a == b else TOP
+
+
+def _value(values: List[Optional[Set[int]]], addr: int) -> Optional[int]:
+    """Contenuto costante della cella, se noto."""
+    vals = values[addr]
+    if vals is not None and len(vals) == 1:
+        return next(iter(vals))
+    return TOP
+
+
+def _transfer(
+    word: int,
+    pc: int,
+    state: AbstractState,
+    values: List[Optional[Set[int]]],
+) -> Tuple[List[int], AbstractState, Optional[Tuple[int, Optional[int]]]]:
+    """Esegue astrattamente la parola `word` in `pc`.
+
+    Returns:
+        Tupla (successori, stato dopo l'istruzione, scrittura (indirizzo, valore) o None)
+    """
+    acc, flag = state
+    op, arg = _DECODE[word]
+    nxt = _NEXT_PC[pc]
+    if op == _LDA:
+        return [nxt], (_value(values, arg), flag), None
+    if op == _ADD or op == _SUB:
+        operand = _value(values, arg)
+        if acc is TOP or operand is TOP:
+            return [nxt], (TOP, TOP), None
+        raw = acc + operand if op == _ADD else acc - operand
+        return [nxt], (raw % 1000, raw < 0), None
+    if op == _STA:
+        return [nxt], state, (arg, TOP if acc is TOP else acc % 1000)
+    if op == _BRA:
+        return [arg], state, None
+    if op == _BRZ:
+        if acc is TOP:
+            return [arg, nxt], state, None
+        return [arg if acc % 1000 == 0 else nxt], state, None
+    if op == _BRP:
+        if flag is TOP:
+            return [arg, nxt], state, None
+        return [nxt if flag else arg], state, None
+    if op == _INP:
+        return [nxt], (TOP, flag), None
+    if op == _OUT:
+        return [nxt], state, None
+    return [], state, None  # HLT o illegale
+
+
+def _strongly_connected(nodes: Sequence[int], succ: Dict[int, Set[int]]) -> List[List[int]]:
+    """Componenti fortemente connesse (Tarjan iterativo)."""
+    index: Dict[int, int] = {}
+    low: Dict[int, int] = {}
+    on_stack: Set[int] = set()
+    stack: List[int] = []
+    result: List[List[int]] = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(sorted(succ[root])))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, it = work[-1]
+            advanced = False
+            for nxt in it:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(sorted(succ[nxt]))))
+                    advanced = True
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    top = stack.pop()
+                    on_stack.discard(top)
+                    component.append(top)
+                    if top == node:
+                        break
+                result.append(component)
+    return result
+
+
+def analyze(memory: Sequence[int], entry: int = 0) -> Analysis:
+    """Analisi statica di un'immagine di memoria prodotta dall'`Assembler`.
+
+    Interpretazione astratta a punto fisso sulle celle: per ogni cella raggiungibile
+    si tiene (accumulatore, flag) come costante o sconosciuto, e per ogni cella di
+    memoria l'insieme dei valori possibili (il valore iniziale più quelli scritti
+    dalle STA raggiungibili). I salti il cui esito è costante vengono potati, quindi
+    un ciclo senza INP né STA che ne modifichino la condizione d'uscita risulta
+    senza uscita. Una cella eseguita il cui contenuto diventa sconosciuto
+    (codice automodificante con valore non costante) imposta `unknown_code`.
+
+    Args:
+        memory: 100 celle 0..999
+        entry: cella di partenza (pc iniziale)
+
+    Returns:
+        Analysis con raggiungibilità, blocchi base e diagnosi
+    """
+    values: List[Optional[Set[int]]] = [{v} for v in memory]
+    states: Dict[int, AbstractState] = {entry: (0, False)}
+    succ: Dict[int, Set[int]] = {}
+    dynamic: Set[int] = set()
+    operands: Set[int] = set()
+    unknown_code = False
+    work = [entry]
+    while work and not unknown_code:
+        pc = work.pop()
+        state = states[pc]
+        words = values[pc]
+        if words is None:
+            unknown_code = True
+            break
+        targets: Set[int] = set()
+        changed_memory = False
+        for word in sorted(words):
+            nexts, out, write = _transfer(word, pc, state, values)
+            op, arg = _DECODE[word]
+            if op in (_LDA, _ADD, _SUB, _STA):
+                operands.add(arg)
+            if write is not None:
+                addr, val = write
+                dynamic.add(addr)
+                cell = values[addr]
+                if cell is not None and (val is TOP or len(cell | {val}) > MAX_CELL_VALUES):
+                    values[addr] = None
+                    changed_memory = True
+                elif cell is not None and val not in cell:
+                    cell.add(val)
+                    changed_memory = True
+            for n in nexts:
+                targets.add(n)
+                prev = states.get(n)
+                new = out if prev is None else (_join(prev[0], out[0]), _join(prev[1], out[1]))
+                if new != prev:
+                    states[n] = new
+                    work.append(n)
+        succ[pc] = targets
+        if changed_memory:
+            # una scrittura nuova può cambiare letture o codice già analizzati
+            work.extend(states)
+
+    if unknown_code:
+        everything = frozenset(range(100))
+        return Analysis(
+            reachable=everything,
+            unreachable=frozenset(),
+            data=frozenset(),
+            dynamic=everything,
+            halts=everything,
+            illegal=everything,
+            infinite_loops=(),
+            blocks={},
+            successors={},
+            unknown_code=True,
+        )
+
+    reachable = frozenset(states)
+    halts = set()
+    illegal = set()
+    for pc in reachable:
+        for word in values[pc]:
+            op = _DECODE[word][0]
+            if op == _HLT:
+                halts.add(pc)
+            elif op == _ILLEGAL:
+                illegal.add(pc)
+
+    loops = []
+    inputs = {pc for pc in reachable if any(_DECODE[w][0] == _INP for w in values[pc])}
+    for component in _strongly_connected(sorted(reachable), succ):
+        cells = set(component)
+        if len(cells) == 1 and component[0] not in succ[component[0]]:
+            continue
+        if any(succ[c] - cells for c in cells) or cells & (halts | illegal | dynamic | inputs):
+            continue
+        loops.append(Loop(_loop_entry(entry, succ, cells), tuple(sorted(cells))))
+
+    return Analysis(
+        reachable=reachable,
+        unreachable=frozenset(range(100)) - reachable - operands,
+        data=frozenset(operands - reachable),
+        dynamic=frozenset(dynamic),
+        halts=frozenset(halts),
+        illegal=frozenset(illegal),
+        infinite_loops=tuple(loops),
+        blocks=_basic_blocks(memory, entry, succ, dynamic),
+        successors={pc: frozenset(targets) for pc, targets in succ.items()},
+        unknown_code=False,
+    )
+
+
+def _loop_entry(entry: int, succ: Dict[int, Set[int]], cells: Set[int]) -> int:
+    """Prima cella del ciclo incontrata in una visita in ampiezza da `entry`."""
+    seen = {entry}
+    frontier = [entry]
+    while frontier:
+        nxt = []
+        for pc in frontier:
+            if pc in cells:
+                return pc
+            for n in sorted(succ[pc]):
+                if n not in seen:
+                    seen.add(n)
+                    nxt.append(n)
+        frontier = nxt
+    return min(cells)
+
+
+def _basic_blocks(
+    memory: Sequence[int],
+    entry: int,
+    succ: Dict[int, Set[int]],
+    dynamic: Set[int],
+) -> Dict[int, BasicBlock]:
+    """Divide le celle raggiungibili in blocchi base.
+
+    Un blocco termina come in `lmc.compiler` (salti, I/O, HLT, illegali) e inoltre
+    prima di un leader (destinazione di salto) e su ogni cella scritta da STA.
+    """
+    leaders = {entry}
+    for pc, targets in succ.items():
+        ends = is_block_end(memory[pc]) or pc in dynamic
+        if ends or len(targets) != 1 or _NEXT_PC[pc] not in targets:
+            leaders.update(targets)
+        if pc in dynamic:
+            leaders.add(pc)
+    blocks = {}
+    for start in leaders:
+        cells = [start]
+        pc = start
+        while not (is_block_end(memory[pc]) or pc in dynamic):
+            nxt = _NEXT_PC[pc]
+            if nxt in leaders or succ[pc] != {nxt}:
+                break
+            cells.append(nxt)
+            pc = nxt
+        blocks[start] = BasicBlock(start, tuple(cells), tuple(sorted(succ[pc])))
+    return blocks
+
+
+def check_program(memory: Sequence[int], entry: int = 0) -> Analysis:
+    """Analizza il programma e lo rifiuta se nessuna esecuzione può terminare con HLT.
+
+    Returns:
+        Analysis del programma accettato
+
+    Raises:
+        ProgramRejected: se il programma non può raggiungere HLT (ciclo senza uscita
+            o istruzione illegale su ogni percorso)
+    """
+    result = analyze(memory, entry)
+    if not result.can_halt:
+        if result.infinite_loops:
+            loop = result.infinite_loops[0]
+            reason = f"ciclo infinito alla cella {loop.entry}"
+        elif result.illegal:
+            reason = f"istruzione illegale alla cella {min(result.illegal)}"
+        else:
+            reason = "nessun HLT raggiungibile"
+        raise ProgramRejected(f"Programma rifiutato: {reason}")
+    return result
@@ -2,26 +2,51 @@
 
 from __future__ import annotations
 import re
-from typing import Dict, List, Tuple
-
-from .exceptions import AssemblerError
-
-INSTRUCTION_OPCODES = {
-    # arith/mem
-    "ADD": 1,
-    "SUB": 2,
-    "STA": 3,
-    "LDA": 5,
-    "BRA": 6,
-    "BRZ": 7,
-    "BRP": 8,
-    # io/ctrl
-    "INP": 901,
-    "OUT": 902,
-    "HLT": 0,
-}
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .exceptions import AssemblerError, ImageError
+from .image import encode_image
+from .isa import CLASSIC, ISA
+
+# Codici del profilo classico (istruzioni con operando: centinaia; I/O e HLT: parola intera)
+INSTRUCTION_OPCODES = dict(CLASSIC.mnemonics)
 
 LABEL_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_TOKEN_RE = re.compile(r"\S+")
+
+
+def _is_label(token: str) -> bool:
+    """Equivalente a `LABEL_RE.match`: identificatore ASCII."""
+    return token.isidentifier() and token.isascii()
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """Errore di assemblaggio con posizione nel sorgente.
+
+    Attributes:
+        line: numero di riga (da 1)
+        column: colonna iniziale (da 1)
+        end_column: colonna successiva all'ultimo carattere del token
+        message: descrizione dell'errore
+    """
+
+    line: int
+    column: int
+    end_column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"Linea {self.line}, colonna {self.column}: {self.message}"
+
+
+def _span(code: str, base: int, index: int) -> Tuple[int, int]:
+    """Colonne (da 1) del token numero `index` di `code[base:]`; usato solo per gli errori."""
+    for i, match in enumerate(_TOKEN_RE.finditer(code, base)):
+        if i == index:
+            return match.start() + 1, match.end() + 1
+    return base + 1, len(code) + 1
 
 
 class Assembler:
@@ -35,40 +60,93 @@ class Assembler:
     - Pseudo-istruzione DAT [val]: memorizza un dato costante 0..999 (default 0)
     - Commenti con // fino a fine riga
     - Una istruzione per riga, al più 100 righe utili; restanti celle riempite con 0.
+
+    Il sorgente viene letto in un'unica passata: ogni riga è divisa una sola volta
+    in token, i riferimenti a etichette non ancora definite vengono annotati e
+    risolti alla fine. Gli errori non interrompono l'assemblaggio: vengono raccolti
+    tutti, con riga e colonne, e riportati insieme in `AssemblerError.errors`.
+
+    Con un `isa` diverso dal classico (vedi `lmc.isa`) numero di celle, range di
+    DAT e codici delle istruzioni seguono il profilo scelto.
     """
 
+    def __init__(self, isa: ISA = CLASSIC):
+        self.isa = isa
+        self._zeros = (0,) * isa.cells
+
     def assemble_source(self, source: str) -> List[int]:
-        lines = source.splitlines()
-        parsed: List[Tuple[int, str, str | None]] = []  # (lineno, mnemonic, arg)
+        return self.assemble_program(source)[0]
+
+    def assemble_program(self, source: str) -> Tuple[List[int], Dict[str, int], List[int]]:
+        """Assembla un sorgente restituendo anche le informazioni di debug.
+
+        Args:
+            source: sorgente assembly LMC
+
+        Returns:
+            Tupla (memoria, etichette, linee) dove etichette mappa il nome (maiuscolo)
+            all'indirizzo e linee contiene, per ogni cella, il numero di riga sorgente
+            (0 per le celle non generate dal sorgente)
+
+        Raises:
+            AssemblerError: per errori di sintassi o riferimenti (tutti in `errors`)
+        """
+        memory = list(self._zeros)
+        line_map = list(self._zeros)
         labels: Dict[str, int] = {}
+        errors = self._assemble_into(source, memory, line_map, labels, [])
+        if errors:
+            raise self._error(errors)
+        return memory, labels, line_map
 
-        # prima passata: raccogli etichette e tokenizza
-        mem_index = 0
-        for lineno, raw in enumerate(lines, start=1):
-            code = raw.split("//", 1)[0].strip()
-            if not code:
-                continue
-            label, instr_part = self._split_label(code, lineno)
-            if label:
-                key = label.upper()
-                if key in labels:
-                    raise AssemblerError(f"Linea {lineno}: etichetta duplicata '{label}'")
-                labels[key] = mem_index
-            if not instr_part:
-                # riga con sola etichetta: non conta memoria
-                continue
-            mnemonic, arg = self._parse_instruction(instr_part, lineno)
-            parsed.append((lineno, mnemonic, arg))
-            mem_index += 1
-            if mem_index > 100:
-                raise AssemblerError("Programma troppo lungo (oltre 100 istruzioni)")
-
-        # seconda passata: risolvi etichette e costruisci memoria
-        memory = [0] * 100
-        for i, (lineno, mnemonic, arg) in enumerate(parsed):
-            opcode = self._encode(mnemonic, arg, labels, lineno)
-            memory[i] = opcode
-        return memory
+    def check(self, source: str) -> List[Diagnostic]:
+        """Tutti gli errori del sorgente, senza sollevare eccezioni (lista vuota se valido)."""
+        return self._assemble_into(source, list(self._zeros), list(self._zeros), {}, [])
+
+    def assemble_many(self, sources: Iterable[str]) -> Iterator[Union[List[int], AssemblerError]]:
+        """Assembla molti sorgenti, uno dopo l'altro.
+
+        Pensato per la validazione in blocco: un sorgente non valido non interrompe
+        gli altri.
+
+        Args:
+            sources: sorgenti assembly LMC
+
+        Yields:
+            Per ogni sorgente, nell'ordine, la memoria (nuova lista di 100 interi)
+            oppure l'`AssemblerError` con tutte le diagnostiche
+        """
+        zeros = self._zeros
+        memory = list(zeros)
+        line_map = list(zeros)
+        labels: Dict[str, int] = {}
+        fixups: List[Tuple[int, str, int, str, int, int]] = []
+        for source in sources:
+            memory[:] = zeros
+            labels.clear()
+            fixups.clear()
+            errors = self._assemble_into(source, memory, line_map, labels, fixups)
+            yield self._error(errors) if errors else memory[:]
+
+    def assemble_image(self, source: str, debug: bool = True) -> bytes:
+        """Assembla un sorgente in un'immagine binaria (vedi `lmc.image`).
+
+        Args:
+            source: sorgente assembly LMC
+            debug: se True include tabella dei simboli e mappa delle linee
+
+        Returns:
+            Immagine binaria pronta per `LMC.load_image`
+
+        Raises:
+            ImageError: se l'assembler non usa il profilo classico
+        """
+        if self.isa is not CLASSIC:
+            raise ImageError(f"Le immagini binarie richiedono il profilo classico, non '{self.isa.name}'")
+        memory, labels, line_map = self.assemble_program(source)
+        if not debug:
+            return encode_image(memory)
+        return encode_image(memory, labels, line_map)
 
     def assemble_file(self, path: str) -> List[int]:
         """Assembla un file sorgente assembly LMC.
@@ -87,132 +165,171 @@ class Assembler:
             return self.assemble_source(f.read())
 
     # internals
-    def _split_label(self, code: str, lineno: int) -> tuple[str | None, str | None]:
-        """Separa etichetta da istruzione in una riga di codice.
-        
-        Args:
-            code: riga di codice assembly (senza commenti)
-            lineno: numero riga per error reporting
-            
-        Returns:
-            Tupla (etichetta, parte_istruzione) dove None indica assenza
-        """
-        # 1) Stile con due punti: "LABEL: INSTR ..." o solo "LABEL:"
-        if ":" in code:
-            left, right = code.split(":", 1)
-            left = left.strip()
-            right = right.strip()
-            if left and LABEL_RE.match(left):
-                return left, (right if right else None)
-        # 2) Stile senza due punti: "LABEL INSTR ..." oppure solo "LABEL"
-        parts = code.split()
-        if not parts:
-            return None, code
-        first = parts[0]
-        first_up = first.upper()
-        # Se la prima parola è un mnemonico valido o DAT, NON è un'etichetta
-        if first_up == "DAT" or first_up in INSTRUCTION_OPCODES:
-            return None, code
-        # Altrimenti, se è una parola valida come etichetta
-        if LABEL_RE.match(first):
-            rest = " ".join(parts[1:])
-            return first, (rest if rest else None)
-        return None, code
-
-    def _parse_instruction(self, text: str, lineno: int) -> tuple[str, str | None]:
-        """Analizza una parte di istruzione estraendo mnemonico e argomento.
-        
-        Args:
-            text: testo dell'istruzione (senza etichetta)
-            lineno: numero riga per error reporting
-            
-        Returns:
-            Tupla (mnemonico_maiuscolo, argomento_o_None)
-            
-        Raises:
-            AssemblerError: per istruzioni malformate o sconosciute
-        """
-        parts = text.split()
-        if not parts:
-            raise AssemblerError(f"Linea {lineno}: istruzione mancante")
-        mnemonic = parts[0].upper()
-        if mnemonic == "DAT":
-            # DAT [val]
-            if len(parts) > 2:
-                raise AssemblerError(f"Linea {lineno}: DAT accetta al più un argomento")
-            arg = parts[1] if len(parts) == 2 else None
-            if arg is not None and not arg.isdigit():
-                raise AssemblerError(f"Linea {lineno}: DAT richiede un numero 0..999")
-            return mnemonic, arg
-        if mnemonic not in INSTRUCTION_OPCODES:
-            raise AssemblerError(f"Linea {lineno}: istruzione sconosciuta '{mnemonic}'")
-        arg: str | None = None
-        if len(parts) > 1:
-            arg = parts[1]
-        if len(parts) > 2:
-            raise AssemblerError(f"Linea {lineno}: troppi argomenti")
-        # Controlli base su arg presenza/assenza
-        needs_arg = INSTRUCTION_OPCODES[mnemonic] in {1, 2, 3, 5, 6, 7, 8}
-        if needs_arg and arg is None:
-            raise AssemblerError(f"Linea {lineno}: l'istruzione {mnemonic} richiede un argomento")
-        if (not needs_arg) and arg is not None:
-            raise AssemblerError(f"Linea {lineno}: l'istruzione {mnemonic} non accetta argomenti")
-        return mnemonic, arg
-
-    def _encode(self, mnemonic: str, arg: str | None, labels: Dict[str, int], lineno: int) -> int:
-        """Converte mnemonico e argomento in codice macchina LMC.
-        
-        Args:
-            mnemonic: istruzione in maiuscolo (es. "ADD", "DAT")
-            arg: argomento opzionale (numero o etichetta)
-            labels: dizionario etichette->indirizzi
-            lineno: numero riga per error reporting
-            
-        Returns:
-            Codice macchina LMC (0-999)
-            
-        Raises:
-            AssemblerError: per errori di codifica o riferimenti non risolti
+    @staticmethod
+    def _error(errors: List[Diagnostic]) -> AssemblerError:
+        """AssemblerError con il primo errore nel messaggio e tutti in `errors`."""
+        message = str(errors[0])
+        if len(errors) > 1:
+            message += f" (e altri {len(errors) - 1} errori)"
+        return AssemblerError(message, errors)
+
+    def _parse_lines(self, lines: Iterable[str]) -> List[Optional[tuple]]:
+        """Analizza le righe di sorgente una per una, senza risolvere le etichette.
+
+        Per ogni riga restituisce None (vuota o di solo commento) oppure la tupla
+        `(label, emits, word, ref, problem, code, base, skip)`:
+
+        - label: etichetta definita dalla riga (come scritta) o None
+        - emits: True se la riga occupa una cella (istruzione o DAT)
+        - word: parola della cella senza l'indirizzo dell'etichetta operando (0 se c'è un errore)
+        - ref: etichetta usata come operando, da sommare a `word` (None se assente o se c'è un errore)
+        - problem: (indice del token, messaggio) dell'errore della riga, o None
+        - code, base, skip: riga senza commento e posizione dei token, per le colonne
+
+        Il risultato di una riga non dipende dalle altre: numero di riga, indirizzo
+        della cella e valore delle etichette li applica chi assembla.
         """
-        if mnemonic == "DAT":
-            if arg is None:
-                return 0
-            val = int(arg)
-            if not (0 <= val <= 999):
-                raise AssemblerError(f"Linea {lineno}: DAT fuori range {val}")
-            return val
-        code = INSTRUCTION_OPCODES[mnemonic]
-        if code in {901, 902, 0}:
-            return code
-        # Istruzioni con operando
-        addr = self._resolve_address(arg, labels, lineno)
-        return code * 100 + addr
-
-    def _resolve_address(self, token: str | None, labels: Dict[str, int], lineno: int) -> int:
-        """Risolve un token (numero o etichetta) in un indirizzo memoria.
-        
-        Args:
-            token: stringa da risolvere (numero 0-99 o nome etichetta)
-            labels: dizionario etichette->indirizzi
-            lineno: numero riga per error reporting
-            
+        isa = self.isa
+        cells = isa.cells
+        top = isa.max_value
+        opcodes = isa.mnemonics
+        addressed = isa.opcodes
+        out: List[Optional[tuple]] = []
+        append = out.append
+        for raw in lines:
+            cut = raw.find("//")
+            code = raw if cut < 0 else raw[:cut]
+            parts = code.split()
+            if not parts:
+                append(None)
+                continue
+            # etichetta: "LABEL: ..." oppure "LABEL ..." se la prima parola non è un mnemonico
+            label = None
+            base = 0  # offset in `code` da cui partono i token di `parts`
+            skip = 0  # token di `code[base:]` già consumati dall'etichetta
+            colon = code.find(":")
+            if colon >= 0:
+                left = code[:colon].strip()
+                if left and _is_label(left):
+                    label = left
+                    base = colon + 1
+                    parts = code[base:].split()
+            if label is None:
+                first = parts[0]
+                first_up = first.upper()
+                if first_up != "DAT" and first_up not in opcodes and _is_label(first):
+                    label = first
+                    skip = 1
+                    parts = parts[1:]
+            if not parts:
+                append((label, False, 0, None, None, code, base, skip))
+                continue
+
+            mnemonic = parts[0].upper()
+            n = len(parts)
+            word = 0
+            ref = None
+            problem = None  # (indice del token, messaggio)
+            if mnemonic == "DAT":
+                if n > 2:
+                    problem = (2, "DAT accetta al più un argomento")
+                elif n == 2:
+                    arg = parts[1]
+                    if not arg.isdigit():
+                        problem = (1, f"DAT richiede un numero 0..{top}")
+                    else:
+                        word = int(arg)
+                        if word > top:
+                            problem = (1, f"DAT fuori range {word}")
+            else:
+                code_ = opcodes.get(mnemonic)
+                if code_ is None:
+                    problem = (0, f"istruzione sconosciuta '{mnemonic}'")
+                elif n > 2:
+                    problem = (2, "troppi argomenti")
+                elif mnemonic in addressed:
+                    if n == 1:
+                        problem = (0, f"l'istruzione {mnemonic} richiede un argomento")
+                    else:
+                        arg = parts[1]
+                        word = code_ * cells
+                        if arg.isdigit():
+                            addr = int(arg)
+                            if addr >= cells:
+                                problem = (1, f"indirizzo fuori range {addr}")
+                            else:
+                                word += addr
+                        elif _is_label(arg):
+                            ref = arg
+                        else:
+                            problem = (1, f"argomento non valido '{arg}'")
+                else:
+                    word = code_
+                    if n == 2:
+                        problem = (1, f"l'istruzione {mnemonic} non accetta argomenti")
+            if problem is not None:
+                word = 0
+            append((label, True, word, ref, problem, code, base, skip))
+        return out
+
+    def _assemble_into(
+        self,
+        source: str,
+        memory: List[int],
+        line_map: List[int],
+        labels: Dict[str, int],
+        fixups: List[Tuple[int, str, int, str, int, int]],
+    ) -> List[Diagnostic]:
+        """Passata unica sul sorgente: riempie i buffer dati e restituisce gli errori.
+
+        `memory` deve essere azzerata e `labels`/`fixups` vuoti; `line_map` viene
+        riscritta per intero.
+
         Returns:
-            Indirizzo memoria risolto (0-99)
-            
-        Raises:
-            AssemblerError: per token non validi o etichette non trovate
+            Diagnostiche ordinate per posizione (vuota se il sorgente è valido)
         """
-        assert token is not None
-        # Prova numero diretto
-        if token.isdigit():
-            addr = int(token)
-            if not (0 <= addr <= 99):
-                raise AssemblerError(f"Linea {lineno}: indirizzo fuori range {addr}")
-            return addr
-        # Etichetta
-        if LABEL_RE.match(token):
-            key = token.upper()
-            if key not in labels:
-                raise AssemblerError(f"Linea {lineno}: etichetta sconosciuta '{token}'")
-            return labels[key]
-        raise AssemblerError(f"Linea {lineno}: argomento non valido '{token}'")
+        errors: List[Diagnostic] = []
+        cells = self.isa.cells
+        index = 0
+        for lineno, line in enumerate(self._parse_lines(source.splitlines()), start=1):
+            if line is None:
+                continue
+            label, emits, word, ref, problem, code, base, skip = line
+            if label is not None:
+                key = label.upper()
+                if key in labels:
+                    col = code.find(label) + 1
+                    errors.append(Diagnostic(lineno, col, col + len(label), f"etichetta duplicata '{label}'"))
+                else:
+                    labels[key] = index
+            if not emits:
+                # riga con sola etichetta: non conta memoria
+                continue
+            if index == cells:
+                col, end = _span(code, base, skip)
+                errors.append(Diagnostic(lineno, col, end, f"programma troppo lungo (oltre {cells} istruzioni)"))
+            if index >= cells:
+                index += 1
+                continue
+            if problem is not None:
+                col, end = _span(code, base, skip + problem[0])
+                errors.append(Diagnostic(lineno, col, end, problem[1]))
+            elif ref is not None:
+                fixups.append((index, ref, lineno, code, base, skip + 1))
+            memory[index] = word
+            line_map[index] = lineno
+            index += 1
+
+        if index < cells:
+            line_map[index:] = self._zeros[index:]
+        for cell, name, lineno, code, base, token in fixups:
+            addr = labels.get(name.upper())
+            if addr is None:
+                col, end = _span(code, base, token)
+                errors.append(Diagnostic(lineno, col, end, f"etichetta sconosciuta '{name}'"))
+                memory[cell] = 0
+            else:
+                memory[cell] += addr
+        if errors:
+            errors.sort(key=lambda d: (d.line, d.column))
+        return errors
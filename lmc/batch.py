@@ -0,0 +1,191 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+from typing import List, Sequence
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - dipendenza opzionale
+    raise ImportError("BatchLMC richiede numpy: pip install numpy") from e
+
+from .exceptions import MemoryErrorLMC
+from . import machine as _machine
+
+# Stato di ciascuna corsia
+RUNNING = 0
+HALTED = 1
+STEP_LIMIT = 2
+INPUT_UNDERFLOW = 3
+ILLEGAL_INSTRUCTION = 4
+
+# Stessi nomi dei motivi di arresto di `LMC.execute`
+REASON_NAMES = {
+    RUNNING: "running",
+    HALTED: _machine.HALTED,
+    STEP_LIMIT: _machine.STEP_LIMIT,
+    INPUT_UNDERFLOW: _machine.INPUT_UNDERFLOW,
+    ILLEGAL_INSTRUCTION: _machine.ILLEGAL_INSTRUCTION,
+}
+
+
+class BatchLMC:
+    """Esegue lo stesso programma LMC su N sequenze di input in lockstep con NumPy.
+
+    Lo stato è vettoriale: memoria (N, 100) int16, accumulatore/pc/flag/stato di
+    lunghezza N. A ogni passo si leggono gli opcode ai pc correnti delle corsie attive
+    e si applicano le istruzioni come operazioni mascherate. Input e output sono array
+    "ragged" (dati concatenati + offset per corsia). Ogni corsia termina per conto proprio
+    e registra motivo di arresto e numero di passi, con la stessa semantica di `LMC.run`.
+
+    Args:
+        memory: immagine di memoria (100 interi 0..999) condivisa da tutte le corsie
+        inputs: una sequenza di input per ciascuna corsia
+
+    Raises:
+        MemoryErrorLMC: se la memoria non ha 100 celle o contiene valori fuori range
+        ValueError: se un input è fuori range 0..999
+    """
+
+    def __init__(self, memory: Sequence[int], inputs: Sequence[Sequence[int]]):
+        if len(memory) != 100:
+            raise MemoryErrorLMC("La memoria deve avere 100 celle")
+        for i, v in enumerate(memory):
+            if not (0 <= v <= 999):
+                raise MemoryErrorLMC(f"Valore memoria fuori range in cella {i}: {v}")
+        n = len(inputs)
+        self.size = n
+        self.memory = np.tile(np.asarray(memory, dtype=np.int16), (n, 1))
+        self.accumulator = np.zeros(n, dtype=np.int16)
+        self.pc = np.zeros(n, dtype=np.int16)
+        self.flag = np.zeros(n, dtype=bool)
+        self.status = np.zeros(n, dtype=np.int8)
+        self.steps = np.zeros(n, dtype=np.int64)
+
+        lengths = np.fromiter((len(seq) for seq in inputs), dtype=np.int64, count=n)
+        self.input_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.input_offsets[1:])
+        flat = [v for seq in inputs for v in seq]
+        if flat and not (0 <= min(flat) and max(flat) <= 999):
+            raise ValueError("Input fuori range: ogni valore deve essere in 0..999")
+        self.input_data = np.asarray(flat, dtype=np.int16)
+        self.input_pos = self.input_offsets[:-1].copy()
+
+        self.output_data = np.zeros(0, dtype=np.int16)
+        self.output_offsets = np.zeros(n + 1, dtype=np.int64)
+
+    @property
+    def halted(self) -> np.ndarray:
+        """Maschera delle corsie non più in esecuzione."""
+        return self.status != RUNNING
+
+    def run(self, max_steps: int = 10000) -> np.ndarray:
+        """Esegue tutte le corsie fino a HALT, errore o max_steps passi.
+
+        Gli errori (input esaurito, istruzione illegale) non sollevano eccezioni:
+        fermano solo la corsia interessata e ne impostano lo stato. Le corsie fermate
+        per max_steps riprendono a una chiamata successiva, come con `LMC.run`.
+
+        Returns:
+            Array dei passi eseguiti per corsia
+        """
+        mem = self.memory
+        acc = self.accumulator
+        pc = self.pc
+        flag = self.flag
+        status = self.status
+        steps = self.steps
+        in_data = self.input_data
+        in_end = self.input_offsets[1:]
+        in_pos = self.input_pos
+        out_lanes: List[np.ndarray] = []
+        out_vals: List[np.ndarray] = []
+        status[status == STEP_LIMIT] = RUNNING
+
+        for _ in range(max_steps):
+            lanes = np.flatnonzero(status == RUNNING)
+            if lanes.size == 0:
+                break
+            p = pc[lanes].astype(np.intp)
+            word = mem[lanes, p]
+            hundred = word // 100
+            arg = (word % 100).astype(np.intp)
+            a = acc[lanes].astype(np.int32)
+            next_pc = (p + 1) % 100
+            new_pc = next_pc.copy()
+            done = np.ones(lanes.size, dtype=bool)  # istruzione eseguita (conta come passo)
+
+            m = hundred == 0  # HLT
+            status[lanes[m]] = HALTED
+            done[m] = False
+
+            m = (hundred == 1) | (hundred == 2)  # ADD / SUB
+            if m.any():
+                operand = mem[lanes[m], arg[m]].astype(np.int32)
+                value = np.where(hundred[m] == 1, a[m] + operand, a[m] - operand)
+                flag[lanes[m]] = value < 0
+                a[m] = value % 1000
+
+            m = hundred == 3  # STA
+            if m.any():
+                mem[lanes[m], arg[m]] = a[m]
+
+            m = hundred == 5  # LDA
+            if m.any():
+                a[m] = mem[lanes[m], arg[m]]
+
+            m = hundred == 6  # BRA
+            new_pc[m] = arg[m]
+            m = (hundred == 7) & (a == 0)  # BRZ
+            new_pc[m] = arg[m]
+            m = (hundred == 8) & ~flag[lanes]  # BRP
+            new_pc[m] = arg[m]
+
+            m = word == 901  # INP
+            if m.any():
+                idx = np.flatnonzero(m)
+                pos = in_pos[lanes[idx]]
+                ok = pos < in_end[lanes[idx]]
+                starved = idx[~ok]
+                status[lanes[starved]] = INPUT_UNDERFLOW
+                done[starved] = False
+                fed = idx[ok]
+                a[fed] = in_data[pos[ok]]
+                in_pos[lanes[fed]] += 1
+
+            m = word == 902  # OUT
+            if m.any():
+                out_lanes.append(lanes[m])
+                out_vals.append(a[m].astype(np.int16))
+
+            m = (hundred == 4) | ((hundred == 9) & (word != 901) & (word != 902))
+            status[lanes[m]] = ILLEGAL_INSTRUCTION
+            done[m] = False
+
+            ex = lanes[done]
+            acc[ex] = a[done]
+            pc[ex] = new_pc[done]
+            steps[ex] += 1
+        status[status == RUNNING] = STEP_LIMIT
+
+        self._collect_outputs(out_lanes, out_vals)
+        return steps
+
+    def _collect_outputs(self, out_lanes: List[np.ndarray], out_vals: List[np.ndarray]):
+        """Accoda gli output raccolti durante `run()` nel formato ragged per corsia."""
+        old_lanes = np.repeat(np.arange(self.size), np.diff(self.output_offsets))
+        lanes = np.concatenate([old_lanes] + out_lanes)
+        vals = np.concatenate([self.output_data] + out_vals)
+        order = np.argsort(lanes, kind="stable")  # mantiene l'ordine temporale per corsia
+        self.output_data = vals[order]
+        counts = np.bincount(lanes, minlength=self.size)
+        self.output_offsets = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.output_offsets[1:])
+
+    def outputs(self, lane: int) -> List[int]:
+        """Output prodotti dalla corsia `lane`, nell'ordine di emissione."""
+        start, end = self.output_offsets[lane], self.output_offsets[lane + 1]
+        return self.output_data[start:end].tolist()
+
+    def reason(self, lane: int) -> str:
+        """Motivo di arresto della corsia `lane` (vedi `REASON_NAMES`)."""
+        return REASON_NAMES[int(self.status[lane])]
@@ -0,0 +1,148 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+from .assembler import Assembler
+from .exceptions import ImageError
+from .isa import CLASSIC, ISA
+from .image import decode_image, encode_image
+
+
+def normalize_source(source: str) -> str:
+    """Normalizza un sorgente per il calcolo della chiave (fine riga e spazi finali)."""
+    return "\n".join(line.rstrip() for line in source.splitlines()).strip("\n")
+
+
+def source_key(source: str, isa: ISA = CLASSIC) -> str:
+    """Chiave SHA-256 (esadecimale) del profilo e del sorgente normalizzato.
+
+    Lo stesso sorgente dà memorie diverse in geometrie diverse, quindi il profilo fa
+    parte della chiave di ogni cache di programmi assemblati.
+    """
+    return hashlib.sha256(f"{isa.name}\n{normalize_source(source)}".encode("utf-8")).hexdigest()
+
+
+class AssemblyCache:
+    """Cache dei programmi assemblati indicizzata per hash del sorgente.
+
+    Due livelli: una LRU in memoria di dimensione limitata e, opzionalmente, una
+    cartella su disco con le immagini di memoria nel formato di `lmc.image`.
+    Le scritture su disco sono atomiche (file temporaneo + rename), quindi più
+    processi possono condividere la stessa cartella. La chiave (`source_key`) comprende
+    il profilo dell'assembler, così cache di profili diversi possono condividere la cartella;
+    il formato di `lmc.image` è solo classico, quindi con gli altri profili si usa
+    solo la LRU in memoria.
+
+    Args:
+        maxsize: numero massimo di programmi nella LRU in memoria
+        directory: opzionale, cartella della cache su disco (creata se manca)
+        assembler: opzionale, istanza di Assembler da usare
+
+    Attributes:
+        hits: richieste servite dalla LRU in memoria
+        disk_hits: richieste servite dalla cache su disco
+        misses: richieste che hanno richiesto l'assemblaggio
+    """
+
+    def __init__(self, maxsize: int = 1024, directory: Optional[str] = None, assembler: Optional[Assembler] = None):
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.assembler = assembler or Assembler()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def assemble(self, source: str) -> List[int]:
+        """Restituisce la memoria assemblata per `source`, usando la cache se possibile.
+
+        Returns:
+            Nuova lista di `isa.cells` interi (può essere modificata dal chiamante)
+
+        Raises:
+            AssemblerError: se il sorgente non è valido (gli errori non vengono memorizzati)
+        """
+        key = source_key(source, self.assembler.isa)
+        with self._lock:
+            mem = self._lru.get(key)
+            if mem is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return list(mem)
+        mem = self._load(key)
+        if mem is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            mem = self.assembler.assemble_source(source)
+            self._store(key, mem)
+            with self._lock:
+                self.misses += 1
+        self._remember(key, mem)
+        return list(mem)
+
+    def stats(self) -> dict:
+        """Contatori della cache."""
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "size": len(self._lru)}
+
+    def clear(self):
+        """Svuota la LRU in memoria (la cache su disco resta)."""
+        with self._lock:
+            self._lru.clear()
+
+    # internals
+    @property
+    def _on_disk(self) -> bool:
+        return self.directory is not None and self.assembler.isa is CLASSIC
+
+    def _remember(self, key: str, mem: List[int]):
+        with self._lock:
+            self._lru[key] = list(mem)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / key[:2] / f"{key}.lmci"
+
+    def _load(self, key: str) -> Optional[List[int]]:
+        """Legge un'immagine dal disco; file assenti o corrotti contano come miss."""
+        if not self._on_disk:
+            return None
+        try:
+            data = self._path(key).read_bytes()
+        except OSError:
+            return None
+        try:
+            return decode_image(data).memory()
+        except ImageError:
+            return None
+
+    def _store(self, key: str, mem: List[int]):
+        """Scrive l'immagine su disco in modo atomico."""
+        if not self._on_disk:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encode_image(mem))
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,198 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import math
+import socket
+from typing import Optional, Sequence, Tuple, Union
+
+from .exceptions import AssemblerError, ServerBusy, ServerError
+from .protocol import (
+    DEFAULT_PORT,
+    KEY_SIZE,
+    LENGTH,
+    OP_ASSEMBLE,
+    OP_CLOSE,
+    OP_INSPECT,
+    OP_OPEN,
+    OP_RUN,
+    OP_RUN_SOURCE,
+    OP_STATS,
+    OP_STEP,
+    STATUS_BUSY,
+    STATUS_INVALID,
+    STATUS_OK,
+    _RUN,
+    _RUN_SOURCE,
+    _SESSION,
+    _STEP,
+    RunReply,
+    SessionState,
+    decode_result,
+    decode_state,
+    decode_stats,
+    pack_words,
+)
+
+Address = Union[str, Tuple[str, int]]
+
+
+def _ms(time_limit: Optional[float]) -> int:
+    """Limite di tempo in ms per il protocollo (0 = predefinito del server)."""
+    if time_limit is None:
+        return 0
+    return max(1, math.ceil(time_limit * 1000))
+
+
+class LMCClient:
+    """Client sincrono di `lmc.server.LMCServer` su una connessione persistente.
+
+    Importa solo la libreria standard e `lmc.protocol`: l'avvio resta leggero e ogni
+    richiesta costa un giro sul socket. Non è thread-safe (una connessione per thread).
+
+    Args:
+        address: percorso del socket Unix oppure (host, porta)
+        timeout: timeout delle operazioni di rete in secondi (None = senza limite)
+
+    Raises:
+        OSError: server non raggiungibile
+    """
+
+    def __init__(self, address: Address = ("127.0.0.1", DEFAULT_PORT), timeout: Optional[float] = 30.0):
+        if isinstance(address, str):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET6 if ":" in address[0] else socket.AF_INET, socket.SOCK_STREAM)
+            # richieste piccole e sincrone: senza Nagle ogni giro non aspetta l'ACK ritardato
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+        except BaseException:
+            sock.close()
+            raise
+        self._sock = sock
+
+    def close(self):
+        """Chiude la connessione (il server chiude le sessioni aperte)."""
+        self._sock.close()
+
+    def __enter__(self) -> "LMCClient":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def assemble(self, source: str, isa: str = "classic") -> bytes:
+        """Assembla `source` sul server (o lo trova in cache).
+
+        Returns:
+            Chiave del programma, da passare a `run` e `open`
+
+        Raises:
+            AssemblerError: sorgente non valido
+        """
+        raw = isa.encode("ascii")
+        return bytes(self._call(bytes([OP_ASSEMBLE, len(raw)]) + raw + source.encode("utf-8")))
+
+    def run(self, program: bytes, inputs: Sequence[int] = (), max_steps: int = 0, time_limit: Optional[float] = None) -> RunReply:
+        """Esegue un programma già assemblato su una macchina del server.
+
+        Args:
+            program: chiave restituita da `assemble`
+            inputs: coda di input
+            max_steps: budget di istruzioni (0 = predefinito del server)
+            time_limit: opzionale, tempo massimo di esecuzione in secondi
+
+        Raises:
+            ServerError: programma sconosciuto (uscito dalla cache: va riassemblato)
+        """
+        return decode_result(self._call(bytes([OP_RUN]) + _RUN.pack(program, max_steps, _ms(time_limit)) + pack_words(inputs)))
+
+    def run_source(
+        self,
+        source: str,
+        inputs: Sequence[int] = (),
+        isa: str = "classic",
+        max_steps: int = 0,
+        time_limit: Optional[float] = None,
+    ) -> RunReply:
+        """Assembla (con la cache del server) ed esegue in un solo giro.
+
+        Raises:
+            AssemblerError: sorgente non valido
+        """
+        raw_isa = isa.encode("ascii")
+        raw = source.encode("utf-8")
+        return decode_result(self._call(b"".join([
+            bytes([OP_RUN_SOURCE]),
+            _RUN_SOURCE.pack(max_steps, _ms(time_limit), len(raw_isa)),
+            raw_isa,
+            LENGTH.pack(len(raw)),
+            raw,
+            pack_words(inputs),
+        ])))
+
+    def open(self, program: bytes, inputs: Sequence[int] = ()) -> int:
+        """Apre una sessione interattiva sul programma: INP senza input la sospende.
+
+        Returns:
+            Identificativo della sessione (valido su questa connessione)
+        """
+        if len(program) != KEY_SIZE:
+            raise ValueError(f"La chiave del programma deve avere {KEY_SIZE} byte")
+        return _SESSION.unpack(self._call(bytes([OP_OPEN]) + program + pack_words(inputs)))[0]
+
+    def step(self, session: int, steps: int = 1, inputs: Sequence[int] = (), time_limit: Optional[float] = None) -> RunReply:
+        """Accoda `inputs` ed esegue fino a `steps` istruzioni della sessione.
+
+        Returns:
+            Esito della fetta: `outputs` contiene solo gli output prodotti in questa
+            chiamata; motivo "input_wait" se la macchina attende un input
+        """
+        return decode_result(self._call(bytes([OP_STEP]) + _STEP.pack(session, steps, _ms(time_limit)) + pack_words(inputs)))
+
+    def inspect(self, session: int) -> SessionState:
+        """Registri, passi eseguiti, input in coda e memoria della sessione."""
+        return decode_state(self._call(bytes([OP_INSPECT]) + _SESSION.pack(session)))
+
+    def close_session(self, session: int):
+        """Chiude una sessione."""
+        self._call(bytes([OP_CLOSE]) + _SESSION.pack(session))
+
+    def stats(self) -> dict:
+        """Contatori del server: richieste, rifiutate (busy), hit e miss della cache, programmi, sessioni."""
+        return decode_stats(self._call(bytes([OP_STATS])))
+
+    def _call(self, body: bytes) -> memoryview:
+        """Invia una richiesta e restituisce i dati della risposta OK.
+
+        Raises:
+            ServerBusy: coda del server piena, la richiesta non è stata eseguita
+            AssemblerError: sorgente non valido
+            ServerError: richiesta rifiutata
+            ConnectionError: connessione chiusa dal server
+        """
+        sock = self._sock
+        sock.sendall(LENGTH.pack(len(body)) + body)
+        (size,) = LENGTH.unpack(self._recv(LENGTH.size))
+        reply = memoryview(self._recv(size))
+        status = reply[0]
+        if status == STATUS_OK:
+            return reply[1:]
+        message = bytes(reply[1:]).decode("utf-8")
+        if status == STATUS_BUSY:
+            raise ServerBusy(message)
+        if status == STATUS_INVALID:
+            raise AssemblerError(message)
+        raise ServerError(message)
+
+    def _recv(self, size: int) -> bytearray:
+        buf = bytearray(size)
+        view = memoryview(buf)
+        got = 0
+        while got < size:
+            n = self._sock.recv_into(view[got:])
+            if n == 0:
+                raise ConnectionError("Connessione chiusa dal server")
+            got += n
+        return buf
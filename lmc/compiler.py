@@ -0,0 +1,318 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .exceptions import IllegalInstructionError
+from .machine import LMC, LoopDetector
+
+# Istruzioni che chiudono un blocco base (incluse nel blocco)
+BLOCK_TERMINATORS = frozenset({6, 7, 8})  # BRA, BRZ, BRP (centinaia)
+IO_TERMINATORS = frozenset({901, 902})    # INP, OUT
+
+# Stati restituiti dai blocchi compilati
+_OK, _HALT, _UNDERFLOW, _ILLEGAL = range(4)
+
+# Cache globale del codice compilato, indicizzata per (indirizzo iniziale, parole del blocco):
+# macchine diverse che eseguono lo stesso programma condividono le funzioni compilate.
+BlockFn = Callable[..., Tuple[int, int, bool, int, int]]
+
+_CODE_CACHE: Dict[Tuple[int, Tuple[int, ...]], Tuple[BlockFn, int]] = {}
+_CODE_CACHE_MAX = 4096
+
+# Dopo quante invalidazioni un indirizzo iniziale viene eseguito cella per cella
+VOLATILE_AFTER = 2
+
+
+def is_block_end(value: int) -> bool:
+    """True se la cella chiude un blocco base (salti, I/O, HLT o istruzione illegale)."""
+    hundred = value // 100
+    if hundred == 0 or value in IO_TERMINATORS or hundred in BLOCK_TERMINATORS:
+        return True
+    return hundred not in (1, 2, 3, 5)
+
+
+def block_cells(memory: List[int], start: int) -> List[int]:
+    """Indirizzi del blocco base che inizia in `start`.
+
+    Il blocco prosegue in sequenza (con wrap 99 -> 0) fino alla prima istruzione
+    terminatrice inclusa, e comunque per al più 100 celle.
+
+    Args:
+        memory: immagine di memoria (100 celle)
+        start: indirizzo iniziale del blocco (0-99)
+
+    Returns:
+        Lista degli indirizzi coperti, nell'ordine di esecuzione
+    """
+    cells = []
+    addr = start
+    for _ in range(100):
+        cells.append(addr)
+        if is_block_end(memory[addr]):
+            break
+        addr = (addr + 1) % 100
+    return cells
+
+
+def _emit_block(start: int, words: Tuple[int, ...]) -> Tuple[str, int]:
+    """Genera il sorgente Python di un blocco base.
+
+    La funzione generata ha firma `(mem, inq, out, acc, flag, watched, invalidate)` e restituisce
+    `(pc, acc, flag, eseguite, stato)`. Ogni STA verso una cella coperta da un blocco
+    compilato invalida i blocchi interessati ed esce subito dal blocco corrente.
+
+    Returns:
+        Tupla (sorgente, costo in celle)
+    """
+    body = ["def _block(mem, inq, out, acc, flag, watched, invalidate):"]
+    addr = start
+    n = 0
+    for word in words:
+        hundred, arg = divmod(word, 100)
+        nxt = (addr + 1) % 100
+        if hundred == 0:
+            body.append(f"    return {addr}, acc, flag, {n}, {_HALT}")
+            break
+        if word == 901:
+            body.append("    if not inq:")
+            body.append(f"        return {addr}, acc, flag, {n}, {_UNDERFLOW}")
+            body.append(f"    return {nxt}, inq.popleft(), flag, {n + 1}, {_OK}")
+            n += 1
+            break
+        if word == 902:
+            body.append("    out(acc % 1000)")
+            body.append(f"    return {nxt}, acc, flag, {n + 1}, {_OK}")
+            n += 1
+            break
+        if hundred == 1:
+            body.append(f"    acc += mem[{arg}]; flag = acc < 0; acc %= 1000")
+        elif hundred == 2:
+            body.append(f"    acc -= mem[{arg}]; flag = acc < 0; acc %= 1000")
+        elif hundred == 3:
+            body.append(f"    mem[{arg}] = acc % 1000")
+            body.append(f"    if watched[{arg}]:")
+            body.append(f"        invalidate({arg})")
+            body.append(f"        return {nxt}, acc, flag, {n + 1}, {_OK}")
+        elif hundred == 5:
+            body.append(f"    acc = mem[{arg}]")
+        elif hundred == 6:
+            body.append(f"    return {arg}, acc, flag, {n + 1}, {_OK}")
+            n += 1
+            break
+        elif hundred == 7:
+            body.append(f"    return ({arg} if acc % 1000 == 0 else {nxt}), acc, flag, {n + 1}, {_OK}")
+            n += 1
+            break
+        elif hundred == 8:
+            body.append(f"    return ({nxt} if flag else {arg}), acc, flag, {n + 1}, {_OK}")
+            n += 1
+            break
+        else:
+            body.append(f"    return {addr}, acc, flag, {n}, {_ILLEGAL}")
+            break
+        n += 1
+        addr = nxt
+    else:
+        # blocco senza terminatore: prosegue in sequenza
+        body.append(f"    return {addr}, acc, flag, {n}, {_OK}")
+    # il costo conta anche un eventuale HLT/INP/illegale finale: il blocco viene
+    # eseguito solo se il budget residuo copre tutte le sue celle
+    return "\n".join(body) + "\n", len(words)
+
+
+def _interpreted_cell(addr: int) -> BlockFn:
+    """Blocco di una sola istruzione, decodificata dalla memoria a ogni esecuzione.
+
+    Usato per le celle riscritte di continuo (codice automodificante "caldo"),
+    per le quali ricompilare un blocco intero a ogni passaggio costerebbe più
+    che eseguire l'istruzione singola dalla cache globale.
+    """
+    def _block(mem, inq, out, acc, flag, watched, invalidate):
+        fn = _compile_words(addr, (mem[addr],))[0]
+        return fn(mem, inq, out, acc, flag, watched, invalidate)
+
+    return _block
+
+
+def _compile_words(start: int, words: Tuple[int, ...]) -> Tuple[BlockFn, int]:
+    """Compila (o recupera dalla cache globale) il blocco con le parole date."""
+    key = (start, words)
+    cached = _CODE_CACHE.get(key)
+    if cached is None:
+        source, cost = _emit_block(start, words)
+        namespace: Dict[str, BlockFn] = {}
+        exec(compile(source, f"<lmc-block-{start:02d}>", "exec"), namespace)
+        cached = (namespace["_block"], cost)
+        if len(_CODE_CACHE) >= _CODE_CACHE_MAX:
+            _CODE_CACHE.clear()
+        _CODE_CACHE[key] = cached
+    return cached
+
+
+_INTERPRETED: Tuple[BlockFn, ...] = tuple(_interpreted_cell(a) for a in range(100))
+
+
+@dataclass
+class CompiledLMC(LMC):
+    """LMC con motore a blocchi base compilati in funzioni Python.
+
+    Ogni blocco viene generato come sorgente Python, compilato con `compile()`/`exec`
+    una sola volta e memorizzato per indirizzo iniziale. Le scritture STA in celle
+    coperte da un blocco compilato lo invalidano, così il codice automodificante
+    resta corretto; gli indirizzi invalidati ripetutamente passano all'esecuzione
+    cella per cella. `run()` ha la stessa semantica e lo stesso conteggio di
+    `max_steps` di `LMC.run`.
+
+    Rispetto a `LMC.run` il guadagno è modesto (circa 1.2-1.7x) e solo sui cicli
+    lunghi senza I/O; sui programmi brevi, ricchi di INP/OUT o automodificanti la
+    chiamata per blocco costa più dell'interprete e il motore è circa 2x più lento
+    (vedi `tools/bench_compiled.py`). `LMC` resta la scelta predefinita.
+    """
+
+    _blocks: Dict[int, Tuple[BlockFn, int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _covers: List[Set[int]] = field(default_factory=lambda: [set() for _ in range(100)], init=False, repr=False, compare=False)
+    _watched: bytearray = field(default_factory=lambda: bytearray(100), init=False, repr=False, compare=False)
+    _spans: Dict[int, Tuple[List[int], Tuple[int, ...]]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _rewrites: Dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _snapshot: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def _execute_slice(self, max_steps: int, detector: Optional[LoopDetector]) -> int:
+        """Esegue al più max_steps istruzioni usando i blocchi compilati.
+
+        Con il rilevamento dei cicli, la profilazione, la traccia, la copertura o il debugger attivi
+        l'esecuzione passa all'interprete di `LMC`.
+
+        Returns:
+            Numero di istruzioni eseguite (HLT esclusa)
+        """
+        debug = self.debugger
+        if (
+            detector is not None
+            or self.profile is not None
+            or self.trace is not None
+            or self.coverage is not None
+            or (debug is not None and debug.active)
+            or not self._fast_path_ok()
+        ):
+            return super()._execute_slice(max_steps, detector)
+        if debug is not None:
+            debug.hit = None
+        self._waiting = False
+        if self._cow:
+            # i blocchi scrivono direttamente in memoria: niente condivisione copy-on-write
+            self._unshare()
+        mem = self._memory.cells
+        if mem != self._snapshot:
+            # memoria cambiata dall'esterno (reset o scrittura diretta)
+            self._revalidate()
+        blocks = self._blocks
+        watched = self._watched
+        invalidate = self._invalidate
+        inq = self.input_queue
+        emit = self.output_sink or self.output_queue.append
+        pull = self._pull_input
+        pc = self.pc
+        acc = self.accumulator
+        flag = self.flag
+        steps = 0
+        status = _OK
+        try:
+            while True:
+                entry = blocks.get(pc)
+                if entry is None:
+                    entry = self._compile(pc)
+                fn, cost = entry
+                if steps + cost > max_steps:
+                    break
+                pc, acc, flag, n, status = fn(mem, inq, emit, acc, flag, watched, invalidate)
+                steps += n
+                if status:
+                    if status != _UNDERFLOW:
+                        break
+                    # coda vuota: INP legge da input_source (o si ferma/solleva secondo on_underflow)
+                    value = pull()
+                    if value is None:
+                        break
+                    acc = value
+                    pc = (pc + 1) % 100
+                    steps += 1
+                    status = _OK
+        finally:
+            self.pc = pc
+            self.accumulator = acc
+            self.flag = flag
+            self._steps = steps
+            self._snapshot = list(mem)
+        if status == _ILLEGAL:
+            raise IllegalInstructionError(pc, mem[pc])
+        if status == _HALT or status == _UNDERFLOW:
+            return steps
+        # budget quasi esaurito: il residuo viene eseguito istruzione per istruzione
+        try:
+            return steps + self._run_fast(max_steps - steps)
+        finally:
+            self._steps += steps
+            self._snapshot = list(mem)
+
+    def precompile(self, starts: Iterable[int]):
+        """Compila in anticipo i blocchi che iniziano agli indirizzi dati.
+
+        Pensato per i leader calcolati da `lmc.analysis.analyze` (`Analysis.leaders`),
+        così il costo di compilazione non ricade sulla prima esecuzione.
+        """
+        if self._cow:
+            self._unshare()
+        for start in starts:
+            if start not in self._blocks:
+                self._compile(start)
+        self._snapshot = list(self._memory.cells)
+
+    def invalidate_all(self):
+        """Scarta tutti i blocchi compilati di questa macchina."""
+        self._blocks.clear()
+        self._spans.clear()
+        self._rewrites.clear()
+        for s in self._covers:
+            s.clear()
+        self._watched[:] = bytes(100)
+
+    def _revalidate(self):
+        """Scarta solo i blocchi le cui celle non corrispondono più alla memoria."""
+        mem = self._memory.cells
+        for start, (cells, words) in list(self._spans.items()):
+            if any(mem[c] != w for c, w in zip(cells, words)):
+                self._drop(start)
+
+    def _invalidate(self, addr: int):
+        """Scarta i blocchi che coprono la cella `addr` (chiamata dai blocchi su STA)."""
+        for start in list(self._covers[addr]):
+            self._drop(start)
+
+    def _drop(self, start: int):
+        """Rimuove il blocco `start` e aggiorna la mappa delle celle osservate."""
+        covers = self._covers
+        self._rewrites[start] = self._rewrites.get(start, 0) + 1
+        del self._blocks[start]
+        for cell in self._spans.pop(start)[0]:
+            covers[cell].discard(start)
+            if not covers[cell]:
+                self._watched[cell] = 0
+
+    def _compile(self, start: int) -> Tuple[BlockFn, int]:
+        """Compila (o recupera dalla cache globale) il blocco che inizia in `start`."""
+        if self._rewrites.get(start, 0) >= VOLATILE_AFTER:
+            entry = (_INTERPRETED[start], 1)
+            self._blocks[start] = entry
+            return entry
+        mem = self._memory.cells
+        cells = block_cells(mem, start)
+        words = tuple(mem[c] for c in cells)
+        cached = _compile_words(start, words)
+        self._blocks[start] = cached
+        self._spans[start] = (cells, words)
+        for c in cells:
+            self._covers[c].add(start)
+            self._watched[c] = 1
+        return cached
@@ -0,0 +1,156 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from .exceptions import IllegalInstructionError, MemoryErrorLMC
+from .isa import _LDA, _ADD, _STA, _SUB, _BRZ, _BRP, _BRA, _INP, _OUT, _HLT, _LDI, _STI
+
+if TYPE_CHECKING:
+    from .machine import LMC, LoopDetector
+
+
+def _bucket(count: int) -> int:
+    """Classe del numero di passaggi su un arco (come AFL): un bit per classe."""
+    if count == 0:
+        return 0
+    for bit, limit in enumerate((1, 2, 3, 7, 15, 31, 127)):
+        if count <= limit:
+            return 1 << bit
+    return 128
+
+
+# Classe (bit) per ogni valore del contatore di un arco 0..255
+BUCKETS = bytes(_bucket(c) for c in range(256))
+
+
+class EdgeCoverage:
+    """Copertura degli archi `pc -> pc successivo` di un'esecuzione.
+
+    `bitmap[src * cells + dst]` conta i passaggi sull'arco (saturando a 255) ed è
+    preallocata: durante l'esecuzione si fanno solo incrementi. Gli archi visti per
+    la prima volta finiscono anche in `touched`, così azzerare la bitmap e
+    confrontarla con la copertura già nota costa quanto gli archi toccati, non
+    quanto la bitmap. Si attiva assegnando l'istanza a `LMC.coverage`; con
+    `coverage=None` `run()` usa l'interprete normale.
+
+    Args:
+        cells: celle della macchina (`isa.cells`)
+
+    Attributes:
+        bitmap: contatori per arco
+        touched: indici degli archi con contatore non nullo, in ordine di prima visita
+    """
+
+    __slots__ = ("cells", "bitmap", "touched")
+
+    def __init__(self, cells: int = 100):
+        self.cells = cells
+        self.bitmap = bytearray(cells * cells)
+        self.touched: List[int] = []
+
+    def reset(self):
+        """Azzera i contatori degli archi toccati (la bitmap non viene riallocata)."""
+        bitmap = self.bitmap
+        for e in self.touched:
+            bitmap[e] = 0
+        self.touched.clear()
+
+    def edges(self) -> List[Tuple[int, int]]:
+        """Archi percorsi come coppie (origine, destinazione), ordinati."""
+        return sorted(divmod(e, self.cells) for e in self.touched)
+
+    def buckets(self) -> List[Tuple[int, int]]:
+        """Coppie (indice dell'arco, classe del numero di passaggi) degli archi toccati."""
+        bitmap = self.bitmap
+        return [(e, BUCKETS[bitmap[e]]) for e in self.touched]
+
+    def run(self, machine: LMC, max_steps: int, detector: Optional[LoopDetector] = None) -> int:
+        """Interprete strumentato: come `LMC._run_fast` (o `_run_isa`) ma registra gli archi.
+
+        Viene chiamato da `LMC._execute_slice` quando `machine.coverage` è impostato.
+        """
+        isa = machine.isa
+        if isa.cells != self.cells:
+            raise ValueError(f"Copertura per {self.cells} celle, macchina con {isa.cells}")
+        mod = isa.modulus
+        cells = self.cells
+        decode = isa.decode
+        next_pc = isa.next_pc
+        bitmap = self.bitmap
+        touched = self.touched
+        mem = machine._memory.cells
+        inq = machine.input_queue
+        emit = machine.output_sink or machine.output_queue.append
+        pull = machine._pull_input
+        cow = machine._cow
+        pc = machine.pc
+        acc = machine.accumulator
+        flag = machine.flag
+        steps = 0
+        try:
+            while steps < max_steps:
+                op, arg = decode[mem[pc]]
+                if op == _LDA:
+                    acc = mem[arg]
+                    new_pc = next_pc[pc]
+                elif op == _ADD or op == _SUB:
+                    acc = acc + mem[arg] if op == _ADD else acc - mem[arg]
+                    flag = acc < 0
+                    acc %= mod
+                    new_pc = next_pc[pc]
+                elif op == _STA:
+                    if cow:
+                        mem = machine._unshare()
+                        cow = False
+                    mem[arg] = acc % mod
+                    new_pc = next_pc[pc]
+                elif op == _BRA or op == _BRZ or op == _BRP:
+                    if op == _BRA or (acc % mod == 0 if op == _BRZ else not flag):
+                        if detector is not None and arg <= pc:
+                            detector.observe(arg, acc, flag, len(inq) - machine._pulled, mem, steps)
+                        new_pc = arg
+                    else:
+                        new_pc = next_pc[pc]
+                elif op == _INP:
+                    if inq:
+                        acc = inq.popleft()
+                    else:
+                        value = pull()
+                        if value is None:
+                            break
+                        acc = value
+                    new_pc = next_pc[pc]
+                elif op == _OUT:
+                    emit(acc % mod)
+                    new_pc = next_pc[pc]
+                elif op == _LDI or op == _STI:
+                    ptr = mem[arg]
+                    if ptr >= cells:
+                        raise MemoryErrorLMC(f"Accesso memoria fuori range: {ptr}")
+                    if op == _LDI:
+                        acc = mem[ptr]
+                    else:
+                        if cow:
+                            mem = machine._unshare()
+                            cow = False
+                        mem[ptr] = acc % mod
+                    new_pc = next_pc[pc]
+                elif op == _HLT:
+                    break
+                else:
+                    raise IllegalInstructionError(pc, mem[pc])
+                e = pc * cells + new_pc
+                c = bitmap[e]
+                if c < 255:
+                    if not c:
+                        touched.append(e)
+                    bitmap[e] = c + 1
+                pc = new_pc
+                steps += 1
+        finally:
+            machine.pc = pc
+            machine.accumulator = acc
+            machine.flag = flag
+            machine._steps = steps
+        return steps
@@ -0,0 +1,242 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
+
+from .exceptions import IllegalInstructionError, MemoryErrorLMC
+from .isa import _LDA, _ADD, _STA, _SUB, _BRZ, _BRP, _BRA, _INP, _OUT, _HLT, _LDI, _STI
+
+if TYPE_CHECKING:
+    from .machine import LMC, LoopDetector
+
+# Tipi di arresto riportati in `Hit.kind`
+BREAK = "break"
+READ = "read"
+WRITE = "write"
+ACCUMULATOR = "accumulator"
+
+# Condizione di un breakpoint: (accumulatore, memoria) -> True per fermarsi
+Condition = Callable[[int, Sequence[int]], bool]
+
+
+@dataclass(frozen=True)
+class Hit:
+    """Motivo dell'ultimo arresto del debugger.
+
+    Attributes:
+        kind: BREAK (prima di eseguire `pc`), READ/WRITE (dopo l'accesso alla cella
+            `address`) o ACCUMULATOR (dopo l'istruzione che ha reso vera la condizione)
+        address: indirizzo del breakpoint o della cella osservata (per ACCUMULATOR il pc
+            dell'istruzione eseguita)
+        pc: program counter all'arresto (prossima istruzione da eseguire)
+        step: istruzioni eseguite nella chiamata prima dell'arresto
+        value: accumulatore per BREAK/ACCUMULATOR, contenuto della cella per READ/WRITE
+    """
+
+    kind: str
+    address: int
+    pc: int
+    step: int
+    value: int
+
+
+class Debugger:
+    """Breakpoint, watchpoint sulla memoria e condizioni sull'accumulatore.
+
+    Si attiva assegnando l'istanza a `LMC.debugger` (o con i metodi `break_at`,
+    `watch`, `watch_accumulator` della macchina). Finché non c'è nulla di attivo
+    `run()` usa l'interprete normale e non paga nulla; altrimenti `LMC._execute_slice`
+    passa all'interprete strumentato `Debugger.run`, che ferma l'esecuzione al
+    primo evento e lo registra in `hit` (`LMC.execute` riporta il motivo "breakpoint").
+
+    Una nuova esecuzione riparte dal punto di arresto: il breakpoint su cui ci si è
+    fermati non scatta di nuovo alla prima istruzione.
+
+    Attributes:
+        hit: ultimo arresto (None se l'ultima esecuzione non si è fermata su un evento)
+        hits: numero totale di arresti
+    """
+
+    def __init__(self):
+        self._breaks: Dict[int, List[Optional[Condition]]] = {}
+        self._reads: set = set()
+        self._writes: set = set()
+        self._acc: List[Callable[[int], bool]] = []
+        self._resume: Optional[int] = None
+        self.hit: Optional[Hit] = None
+        self.hits = 0
+
+    @property
+    def active(self) -> bool:
+        """True se almeno un breakpoint o watchpoint è impostato."""
+        return bool(self._breaks or self._reads or self._writes or self._acc)
+
+    def break_at(self, address: int, condition: Optional[Condition] = None):
+        """Ferma l'esecuzione prima dell'istruzione in `address`.
+
+        Args:
+            address: indirizzo dell'istruzione
+            condition: opzionale, `condition(acc, memory)`; il breakpoint scatta solo se vera
+        """
+        self._breaks.setdefault(address, []).append(condition)
+
+    def watch(self, address: int, read: bool = False, write: bool = True):
+        """Ferma l'esecuzione dopo una lettura e/o scrittura della cella `address`.
+
+        Sono letture gli operandi di LDA/ADD/SUB (e le celle lette da LDI), scritture
+        STA e STI; il prelievo delle istruzioni non conta.
+        """
+        if read:
+            self._reads.add(address)
+        if write:
+            self._writes.add(address)
+
+    def watch_accumulator(self, predicate: Callable[[int], bool]):
+        """Ferma l'esecuzione dopo un'istruzione che scrive l'accumulatore rendendo vero `predicate(acc)`."""
+        self._acc.append(predicate)
+
+    def clear(self, address: Optional[int] = None):
+        """Rimuove breakpoint e watchpoint di `address`, oppure tutto se None."""
+        if address is None:
+            self._breaks.clear()
+            self._reads.clear()
+            self._writes.clear()
+            self._acc.clear()
+        else:
+            self._breaks.pop(address, None)
+            self._reads.discard(address)
+            self._writes.discard(address)
+
+    def _flags(self, addresses, cells: int) -> bytearray:
+        flags = bytearray(cells)
+        for a in addresses:
+            if 0 <= a < cells:
+                flags[a] = 1
+        return flags
+
+    def _should_break(self, pc: int, acc: int, mem: Sequence[int]) -> bool:
+        return any(cond is None or cond(acc, mem) for cond in self._breaks[pc])
+
+    def run(self, machine: LMC, max_steps: int, detector: Optional[LoopDetector] = None) -> int:
+        """Interprete strumentato: come `LMC._run_fast` (o `_run_isa`) con i controlli del debugger.
+
+        Viene chiamato da `LMC._execute_slice` quando `machine.debugger` ha qualcosa di attivo.
+        I controlli usano tabelle di flag per cella, quindi il costo per istruzione
+        non dipende dal numero di breakpoint.
+        """
+        isa = machine.isa
+        mod = isa.modulus
+        cells = isa.cells
+        decode = isa.decode
+        next_pc = isa.next_pc
+        breaks = self._flags(self._breaks, cells)
+        reads = self._flags(self._reads, cells)
+        writes = self._flags(self._writes, cells)
+        acc_watch = tuple(self._acc)
+        mem = machine._memory.cells
+        inq = machine.input_queue
+        emit = machine.output_sink or machine.output_queue.append
+        pull = machine._pull_input
+        cow = machine._cow
+        pc = machine.pc
+        acc = machine.accumulator
+        flag = machine.flag
+        # il breakpoint su cui ci si è fermati non scatta di nuovo alla ripresa
+        skip = pc if self._resume == pc else -1
+        self._resume = None
+        hit = None
+        steps = 0
+        try:
+            while steps < max_steps:
+                if breaks[pc] and pc != skip and self._should_break(pc, acc, mem):
+                    hit = Hit(BREAK, pc, pc, steps, acc % mod)
+                    self._resume = pc
+                    break
+                skip = -1
+                op, arg = decode[mem[pc]]
+                watched = -1  # cella osservata toccata dall'istruzione
+                kind = None
+                new_acc = False
+                if op == _LDA:
+                    acc = mem[arg]
+                    new_acc = True
+                    if reads[arg]:
+                        watched, kind = arg, READ
+                    pc_next = next_pc[pc]
+                elif op == _ADD or op == _SUB:
+                    acc = acc + mem[arg] if op == _ADD else acc - mem[arg]
+                    flag = acc < 0
+                    acc %= mod
+                    new_acc = True
+                    if reads[arg]:
+                        watched, kind = arg, READ
+                    pc_next = next_pc[pc]
+                elif op == _STA:
+                    if cow:
+                        mem = machine._unshare()
+                        cow = False
+                    mem[arg] = acc % mod
+                    if writes[arg]:
+                        watched, kind = arg, WRITE
+                    pc_next = next_pc[pc]
+                elif op == _BRA or op == _BRZ or op == _BRP:
+                    if op == _BRA or (acc % mod == 0 if op == _BRZ else not flag):
+                        if detector is not None and arg <= pc:
+                            detector.observe(arg, acc, flag, len(inq) - machine._pulled, mem, steps)
+                        pc_next = arg
+                    else:
+                        pc_next = next_pc[pc]
+                elif op == _INP:
+                    if inq:
+                        acc = inq.popleft()
+                    else:
+                        value = pull()
+                        if value is None:
+                            break
+                        acc = value
+                    new_acc = True
+                    pc_next = next_pc[pc]
+                elif op == _OUT:
+                    emit(acc % mod)
+                    pc_next = next_pc[pc]
+                elif op == _LDI or op == _STI:
+                    ptr = mem[arg]
+                    if ptr >= cells:
+                        raise MemoryErrorLMC(f"Accesso memoria fuori range: {ptr}")
+                    if op == _LDI:
+                        acc = mem[ptr]
+                        new_acc = True
+                        if reads[arg] or reads[ptr]:
+                            watched, kind = (ptr if reads[ptr] else arg), READ
+                    else:
+                        if cow:
+                            mem = machine._unshare()
+                            cow = False
+                        mem[ptr] = acc % mod
+                        if writes[ptr]:
+                            watched, kind = ptr, WRITE
+                        elif reads[arg]:
+                            watched, kind = arg, READ
+                    pc_next = next_pc[pc]
+                elif op == _HLT:
+                    break
+                else:
+                    raise IllegalInstructionError(pc, mem[pc])
+                steps += 1
+                if watched >= 0:
+                    hit = Hit(kind, watched, pc_next, steps, mem[watched])
+                elif new_acc and acc_watch and any(p(acc) for p in acc_watch):
+                    hit = Hit(ACCUMULATOR, pc, pc_next, steps, acc)
+                pc = pc_next
+                if hit is not None:
+                    break
+        finally:
+            machine.pc = pc
+            machine.accumulator = acc
+            machine.flag = flag
+            machine._steps = steps
+            self.hit = hit
+            if hit is not None:
+                self.hits += 1
+        return steps
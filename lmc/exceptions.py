@@ -22,6 +22,41 @@ class InputUnderflowError(LMCError):
     pass
 
 
+class NonTerminationDetected(LMCError):
+    """Stato della macchina ripetuto: il programma non terminerà mai."""
+    def __init__(self, pc: int, period: int, steps: int):
+        super().__init__(f"Ciclo infinito rilevato alla cella {pc} (periodo {period} istruzioni)")
+        self.pc = pc
+        self.period = period
+        self.steps = steps
+
+
 class AssemblerError(LMCError):
-    """Errore generato dall'assembler per problemi di sintassi o riferimenti."""
+    """Errore generato dall'assembler per problemi di sintassi o riferimenti.
+
+    Attributes:
+        errors: tutte le diagnostiche raccolte (`lmc.assembler.Diagnostic`), in ordine di posizione
+    """
+    def __init__(self, message: str, errors=None):
+        super().__init__(message)
+        self.errors = list(errors or [])
+
+
+class ImageError(LMCError):
+    """Immagine binaria di memoria (o archivio) non valida."""
+    pass
+
+
+class ProgramRejected(LMCError):
+    """Programma rifiutato dall'analisi statica senza eseguirlo (non può terminare)."""
+    pass
+
+
+class ServerError(LMCError):
+    """Richiesta rifiutata dal server di sessione (malformata, programma o sessione sconosciuti)."""
+    pass
+
+
+class ServerBusy(ServerError):
+    """Server di sessione saturo: la coda delle richieste è piena, riprovare più tardi."""
     pass
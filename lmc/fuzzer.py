@@ -0,0 +1,318 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .coverage import EdgeCoverage
+from .isa import CLASSIC, ISA
+from .machine import (
+    HALTED,
+    ILLEGAL_INSTRUCTION,
+    INPUT_UNDERFLOW,
+    MEMORY_ERROR,
+    STEP_LIMIT,
+    LMC,
+    TrustedImage,
+)
+
+# Esiti considerati crash: vengono minimizzati e riportati una volta per (motivo, pc)
+CRASH_REASONS = (INPUT_UNDERFLOW, ILLEGAL_INSTRUCTION, MEMORY_ERROR, STEP_LIMIT)
+
+Inputs = Tuple[int, ...]
+# Esito di un'esecuzione interessante: (input, [(arco, classe)], motivo, pc finale, passi)
+Outcome = Tuple[Inputs, List[Tuple[int, int]], str, int, int]
+
+
+@dataclass(frozen=True)
+class Crash:
+    """Input che porta il programma a un errore o al budget di istruzioni.
+
+    Attributes:
+        reason: INPUT_UNDERFLOW, ILLEGAL_INSTRUCTION, MEMORY_ERROR o STEP_LIMIT
+        pc: program counter all'arresto
+        inputs: input minimizzato che riproduce il crash
+        original: input trovato dal fuzzer, prima della minimizzazione
+    """
+
+    reason: str
+    pc: int
+    inputs: Inputs
+    original: Inputs
+
+
+@dataclass
+class FuzzReport:
+    """Risultato di `Fuzzer.run`.
+
+    Attributes:
+        executions: esecuzioni del programma (minimizzazione inclusa)
+        seconds: durata della campagna
+        corpus: input che hanno portato copertura nuova, in ordine di scoperta
+        crashes: un crash minimizzato per ogni (motivo, pc)
+        edges: archi (origine, destinazione) coperti da almeno un input
+    """
+
+    executions: int
+    seconds: float
+    corpus: List[Inputs] = field(default_factory=list)
+    crashes: List[Crash] = field(default_factory=list)
+    edges: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def execs_per_sec(self) -> float:
+        """Esecuzioni al secondo."""
+        return self.executions / self.seconds if self.seconds else 0.0
+
+
+def _novel(virgin: bytearray, buckets: Iterable[Tuple[int, int]]) -> bool:
+    """True se almeno un arco (o classe di passaggi) non è in `virgin`; aggiorna `virgin`."""
+    new = False
+    for e, bit in buckets:
+        seen = virgin[e]
+        if bit & ~seen:
+            virgin[e] = seen | bit
+            new = True
+    return new
+
+
+def _crash_key(reason: str, pc: int) -> Tuple[str, int]:
+    # al budget di istruzioni il pc è casuale: un solo crash STEP_LIMIT
+    return (reason, -1 if reason == STEP_LIMIT else pc)
+
+
+class _Runner:
+    """Esegue input sul programma con copertura e tiene gli archi e i crash già visti.
+
+    Una istanza per processo: nel processo principale con `workers=0`, altrimenti
+    una per worker (ciascuno con la propria copertura, ricontrollata dal principale).
+    """
+
+    def __init__(self, cells: Sequence[int], isa: ISA, max_steps: int):
+        self.image = TrustedImage.from_memory(cells, isa)
+        self.coverage = EdgeCoverage(isa.cells)
+        self.machine = LMC(isa=isa)
+        self.machine.coverage = self.coverage
+        self.max_steps = max_steps
+        self.virgin = bytearray(isa.cells * isa.cells)
+        self.crashes: Set[Tuple[str, int]] = set()
+
+    def execute(self, inputs: Inputs) -> Tuple[str, int, int]:
+        """Esegue un input; la copertura resta in `self.coverage` fino all'esecuzione successiva."""
+        self.coverage.reset()
+        m = self.machine
+        m.reset(memory=self.image, inputs=inputs)
+        res = m.execute(self.max_steps)
+        return res.reason, res.pc, res.steps
+
+    def run_batch(self, batch: Sequence[Inputs]) -> List[Outcome]:
+        """Esegue un lotto e restituisce solo gli input con copertura nuova o un crash nuovo."""
+        out = []
+        for inputs in batch:
+            reason, pc, steps = self.execute(inputs)
+            buckets = self.coverage.buckets()
+            fresh = _novel(self.virgin, buckets)
+            if reason in CRASH_REASONS:
+                key = _crash_key(reason, pc)
+                if key not in self.crashes:
+                    self.crashes.add(key)
+                    fresh = True
+            if fresh:
+                out.append((inputs, buckets, reason, pc, steps))
+        return out
+
+
+_WORKER: Optional[_Runner] = None
+
+
+def _init_worker(cells: Sequence[int], isa: ISA, max_steps: int):
+    """Inizializzatore dei worker: programma validato e macchina creati una volta per processo."""
+    global _WORKER
+    _WORKER = _Runner(cells, isa, max_steps)
+
+
+def _run_batch(batch: Sequence[Inputs]) -> List[Outcome]:
+    return _WORKER.run_batch(batch)
+
+
+class Fuzzer:
+    """Fuzzer guidato dalla copertura degli archi per gli input di un programma.
+
+    Parte dai `seeds` e a ogni giro muta input del corpus (sostituzioni, valori
+    notevoli, piccoli incrementi, inserimenti, cancellazioni, incroci tra input);
+    un input entra nel corpus se percorre un arco nuovo o un arco già visto un
+    numero di volte di classe nuova (1, 2, 3, 4-7, 8-15, ... come AFL). I crash
+    (input esaurito, istruzione illegale, errore di memoria, budget di istruzioni)
+    vengono minimizzati e riportati una volta per (motivo, pc).
+
+    Args:
+        memory: immagine del programma (o `TrustedImage`)
+        isa: geometria (ignorata se `memory` è una `TrustedImage`)
+        seeds: input iniziali del corpus (default: la lista vuota)
+        max_steps: budget di istruzioni per esecuzione
+        max_len: lunghezza massima degli input generati
+        seed: seme del generatore casuale (stesso seme, stessa campagna con workers=0)
+        workers: processi paralleli (0 = nel processo corrente)
+        batch: input per lotto inviato a un worker
+    """
+
+    def __init__(
+        self,
+        memory: Union[Sequence[int], TrustedImage],
+        isa: ISA = CLASSIC,
+        seeds: Iterable[Sequence[int]] = ((),),
+        max_steps: int = 10000,
+        max_len: int = 16,
+        seed: int = 0,
+        workers: int = 0,
+        batch: int = 256,
+    ):
+        image = memory if isinstance(memory, TrustedImage) else TrustedImage.from_memory(memory, isa)
+        self.isa = image.isa
+        self.cells = image.cells
+        self.max_steps = max_steps
+        self.max_len = max_len
+        self.workers = workers
+        self.batch = batch
+        self.rng = random.Random(seed)
+        self.seeds = [tuple(s) for s in seeds] or [()]
+        top = self.isa.max_value
+        self.interesting = sorted({0, 1, 2, top, top - 1, self.isa.cells - 1, self.isa.cells, (top + 1) // 2})
+        self._local = _Runner(self.cells, self.isa, max_steps)
+
+    def mutate(self, inputs: Inputs, corpus: Sequence[Inputs]) -> Inputs:
+        """Da 1 a 4 mutazioni casuali sovrapposte di `inputs`."""
+        rng = self.rng
+        top = self.isa.max_value
+        values = list(inputs)
+        for _ in range(rng.randint(1, 4)):
+            kind = rng.randrange(8)
+            if kind == 0 and len(values) < self.max_len:
+                values.insert(rng.randint(0, len(values)), rng.randint(0, top))
+            elif kind == 1 and values:
+                del values[rng.randrange(len(values))]
+            elif kind == 2 and values:
+                values[rng.randrange(len(values))] = rng.randint(0, top)
+            elif kind == 3 and values:
+                values[rng.randrange(len(values))] = rng.choice(self.interesting)
+            elif kind == 4 and values:
+                i = rng.randrange(len(values))
+                values[i] = (values[i] + rng.randint(-16, 16)) % (top + 1)
+            elif kind == 5 and len(corpus) > 1:
+                other = rng.choice(corpus)
+                cut = rng.randint(0, len(values))
+                values = values[:cut] + list(other[rng.randint(0, len(other)):])
+            elif kind == 6 and values and len(values) < self.max_len:
+                i = rng.randrange(len(values))
+                values.insert(i, values[i])
+            elif kind == 7:
+                values.append(rng.choice(self.interesting) if rng.random() < 0.5 else rng.randint(0, top))
+        return tuple(values[:self.max_len])
+
+    def _candidates(self, corpus: Sequence[Inputs]) -> List[Inputs]:
+        rng = self.rng
+        recent = corpus[-8:]
+        return [self.mutate(rng.choice(recent if rng.random() < 0.5 else corpus), corpus) for _ in range(self.batch)]
+
+    def _crash_at(self, inputs: Inputs) -> Tuple[str, int]:
+        reason, pc, _ = self._local.execute(inputs)
+        return _crash_key(reason, pc)
+
+    def minimize(self, inputs: Sequence[int], reason: str, pc: int) -> Tuple[Inputs, int]:
+        """Riduce un input mantenendo lo stesso crash (motivo e pc).
+
+        Prima toglie blocchi di valori (dimezzando la dimensione dei blocchi), poi
+        prova ad abbassare ogni valore a 0, 1 o alla metà.
+
+        Returns:
+            Tupla (input minimizzato, esecuzioni usate)
+        """
+        key = _crash_key(reason, pc)
+        current = list(inputs)
+        runs = 0
+        chunk = max(1, len(current) // 2)
+        while current:
+            i = 0
+            removed = False
+            while i < len(current):
+                cand = current[:i] + current[i + chunk:]
+                runs += 1
+                if self._crash_at(tuple(cand)) == key:
+                    current = cand
+                    removed = True
+                else:
+                    i += chunk
+            if chunk == 1 and not removed:
+                break
+            chunk = max(1, chunk // 2)
+        for i in range(len(current)):
+            for v in (0, 1, current[i] // 2):
+                if v >= current[i]:
+                    continue
+                cand = current[:i] + [v] + current[i + 1:]
+                runs += 1
+                if self._crash_at(tuple(cand)) == key:
+                    current = cand
+                    break
+        return tuple(current), runs
+
+    def run(self, executions: int = 10000, time_limit: Optional[float] = None) -> FuzzReport:
+        """Esegue la campagna fino a `executions` esecuzioni o allo scadere di `time_limit` secondi.
+
+        Returns:
+            FuzzReport con corpus, crash minimizzati, archi coperti ed esecuzioni al secondo
+        """
+        start = time.perf_counter()
+        deadline = None if time_limit is None else start + time_limit
+        report = FuzzReport(0, 0.0)
+        corpus: List[Inputs] = []
+        known: Dict[Tuple[str, int], Crash] = {}
+        local = self._local
+        # copertura globale: i risultati dei worker sono nuovi solo rispetto a quanto visto dal worker
+        virgin = bytearray(len(local.virgin))
+
+        def absorb(results: List[Outcome]):
+            for inputs, buckets, reason, pc, _ in results:
+                if _novel(virgin, buckets):
+                    corpus.append(inputs)
+                if reason in CRASH_REASONS:
+                    key = _crash_key(reason, pc)
+                    if key not in known:
+                        small, runs = self.minimize(inputs, reason, pc)
+                        report.executions += runs
+                        known[key] = Crash(reason, pc, small, inputs)
+
+        def done() -> bool:
+            return report.executions >= executions or (deadline is not None and time.perf_counter() >= deadline)
+
+        # i seed vengono eseguiti sempre, anche se non portano copertura nuova
+        seeds = self.seeds
+        absorb(local.run_batch(seeds))
+        corpus.extend(s for s in seeds if s not in corpus)
+        report.executions += len(seeds)
+
+        if self.workers == 0:
+            while not done():
+                batch = self._candidates(corpus)[:max(1, executions - report.executions)]
+                absorb(local.run_batch(batch))
+                report.executions += len(batch)
+        else:
+            with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.cells, self.isa, self.max_steps)) as pool:
+                inflight = {pool.submit(_run_batch, self._candidates(corpus)): self.batch for _ in range(self.workers)}
+                while inflight:
+                    finished, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        report.executions += inflight.pop(fut)
+                        absorb(fut.result())
+                        if not done():
+                            inflight[pool.submit(_run_batch, self._candidates(corpus))] = self.batch
+
+        report.seconds = time.perf_counter() - start
+        report.corpus = corpus
+        report.crashes = sorted(known.values(), key=lambda c: (c.reason, c.pc))
+        cells = self.isa.cells
+        report.edges = sorted(divmod(e, cells) for e, bits in enumerate(virgin) if bits)
+        return report
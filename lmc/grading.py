@@ -0,0 +1,228 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .analysis import check_program
+from .cache import AssemblyCache
+from .exceptions import LMCError
+from .machine import LMC, TrustedImage
+from .optimizer import optimize as optimize_memory
+
+
+@dataclass
+class Case:
+    """Un caso di prova: input da fornire e output atteso (None = non verificato)."""
+
+    inputs: List[int]
+    expected: Optional[List[int]] = None
+
+
+@dataclass
+class Program:
+    """Un programma da valutare con i suoi casi di prova."""
+
+    id: str
+    source: str
+    cases: List[Case] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        """Hash SHA-256 del sorgente: identifica il programma nella cache dei worker."""
+        return hashlib.sha256(self.source.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CaseResult:
+    """Esito di un caso di prova.
+
+    Attributes:
+        program: id del programma
+        case: indice del caso nel programma
+        passed: True se l'output coincide con quello atteso (e non ci sono errori)
+        outputs: output prodotti
+        steps: istruzioni eseguite
+        halted: True se il programma ha raggiunto HLT entro il budget
+        wall_ns: tempo di esecuzione del caso in nanosecondi
+        error: nome della classe dell'eccezione, se presente
+    """
+
+    program: str
+    case: int
+    passed: bool
+    outputs: List[int]
+    steps: int
+    halted: bool
+    wall_ns: int
+    error: Optional[str] = None
+
+
+# Chunk di lavoro: (id, chiave, sorgente, [(indice, inputs, expected), ...], max_steps, precheck, optimize)
+Chunk = Tuple[str, str, str, List[Tuple[int, List[int], Optional[List[int]]]], int, bool, bool]
+
+# Cache per processo worker: programmi assemblati e sorgenti non validi (per chiave e precheck)
+_CACHE = AssemblyCache()
+_FAILED: Dict[Tuple[str, bool], LMCError] = {}
+
+
+def _init_worker(cache_dir: Optional[str]):
+    """Inizializzatore dei worker: collega la cache su disco condivisa, se richiesta."""
+    global _CACHE
+    _CACHE = AssemblyCache(directory=cache_dir)
+
+
+def _assembled(key: str, source: str, precheck: bool = False):
+    """Assembla il sorgente una sola volta per processo (errori inclusi).
+
+    Con precheck il programma assemblato passa anche da `check_program`; un
+    rifiuto viene memorizzato come un errore di assemblaggio.
+    """
+    err = _FAILED.get((key, precheck))
+    if err is not None:
+        return err
+    try:
+        mem = _CACHE.assemble(source)
+        if precheck:
+            check_program(mem)
+        return mem
+    except LMCError as e:
+        _FAILED[key, precheck] = e
+        return e
+
+
+def run_chunk(chunk: Chunk) -> List[CaseResult]:
+    """Esegue tutti i casi di un chunk riusando la stessa istanza LMC.
+
+    Args:
+        chunk: tupla prodotta da `make_chunks`
+
+    Returns:
+        Lista dei risultati, uno per caso
+    """
+    prog_id, key, source, cases, max_steps, precheck, optimize = chunk
+    mem = _assembled(key, source, precheck)
+    results = []
+    if isinstance(mem, LMCError):
+        for idx, _, _ in cases:
+            results.append(CaseResult(prog_id, idx, False, [], 0, False, 0, type(mem).__name__))
+        return results
+    if optimize:
+        mem = optimize_memory(mem).memory
+    # validata una volta per chunk: ogni caso copia la memoria senza ricontrollarla
+    image = TrustedImage.from_memory(mem)
+    machine = LMC()
+    for idx, inputs, expected in cases:
+        try:
+            machine.reset(memory=image, inputs=inputs)
+        except ValueError as e:
+            results.append(CaseResult(prog_id, idx, False, [], 0, False, 0, type(e).__name__))
+            continue
+        res = machine.execute(max_steps)
+        error = type(res.error).__name__ if res.error is not None else None
+        outputs = list(res.outputs)
+        passed = res.halted and (expected is None or outputs == expected)
+        results.append(CaseResult(prog_id, idx, passed, outputs, res.steps, res.halted, res.wall_ns, error))
+    return results
+
+
+def make_chunks(
+    programs: Iterable[Program],
+    chunk_size: int = 64,
+    max_steps: int = 10000,
+    precheck: bool = False,
+    optimize: bool = False,
+) -> Iterator[Chunk]:
+    """Raggruppa i casi di ogni programma in chunk di al più `chunk_size` casi."""
+    for prog in programs:
+        key = prog.key
+        cases = [(i, c.inputs, c.expected) for i, c in enumerate(prog.cases)]
+        for start in range(0, len(cases), chunk_size):
+            yield prog.id, key, prog.source, cases[start:start + chunk_size], max_steps, precheck, optimize
+
+
+def grade(
+    programs: Iterable[Program],
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    max_steps: int = 10000,
+    cache_dir: Optional[str] = None,
+    precheck: bool = False,
+    optimize: bool = False,
+) -> Iterator[CaseResult]:
+    """Valuta i programmi distribuendo i chunk su un ProcessPoolExecutor.
+
+    I risultati vengono restituiti appena disponibili, quindi non nell'ordine del manifest.
+    Al più due chunk per worker sono in volo alla volta: i programmi (anche da un
+    generatore) vengono letti e inviati man mano, non tutti all'inizio.
+
+    Args:
+        programs: programmi con i relativi casi
+        workers: numero di processi (None = os.cpu_count(), 0 = esecuzione nel processo corrente)
+        chunk_size: casi per chunk inviato a un worker
+        max_steps: budget di istruzioni per caso
+        cache_dir: opzionale, cartella della cache su disco dei programmi assemblati
+        precheck: se True i programmi che l'analisi statica dimostra non terminanti
+            vengono bocciati senza eseguirli (errore `ProgramRejected`)
+        optimize: se True i programmi passano da `lmc.optimizer.optimize` prima
+            dell'esecuzione (meno istruzioni contate nel budget)
+
+    Yields:
+        CaseResult per ogni caso
+    """
+    chunks = make_chunks(programs, chunk_size, max_steps, precheck, optimize)
+    if workers == 0:
+        if cache_dir is not None:
+            _init_worker(cache_dir)
+        for chunk in chunks:
+            yield from run_chunk(chunk)
+        return
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_dir,)) as pool:
+        # finestra limitata di chunk in volo: ognuno completato ne fa partire uno nuovo
+        inflight = {pool.submit(run_chunk, chunk) for chunk in islice(chunks, window)}
+        while inflight:
+            finished, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                for chunk in islice(chunks, 1):
+                    inflight.add(pool.submit(run_chunk, chunk))
+                yield from fut.result()
+
+
+def load_manifest(path: str) -> List[Program]:
+    """Legge un manifest JSONL.
+
+    Ogni riga descrive un programma: `{"id": ..., "source": ... | "path": ..., "cases": [...]}`,
+    dove ogni caso è `{"inputs": [...], "expected": [...]}` (expected opzionale).
+    I percorsi relativi sono risolti rispetto alla cartella del manifest.
+
+    Raises:
+        ValueError: se una riga non è un oggetto valido
+    """
+    base = Path(path).resolve().parent
+    programs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "source" in entry:
+                source = entry["source"]
+            elif "path" in entry:
+                source = (base / entry["path"]).read_text(encoding="utf-8")
+            else:
+                raise ValueError(f"Linea {lineno}: serve 'source' o 'path'")
+            cases = [Case(list(c.get("inputs", [])), c.get("expected")) for c in entry.get("cases", [])]
+            programs.append(Program(str(entry.get("id", lineno)), source, cases))
+    return programs
+
+
+def result_to_json(result: CaseResult) -> str:
+    """Serializza un risultato come riga JSON."""
+    return json.dumps(asdict(result))
@@ -0,0 +1,309 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .exceptions import ImageError
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# Immagine singola:
+#   header  <4s H H H H I I>  magic, versione, flag, celle, riservato, len simboli, len mappa linee
+#   payload celle x uint16 little-endian
+#   simboli (opzionale): count uint16, poi per voce addr uint16, len uint8, nome utf-8
+#   linee   (opzionale): celle x uint32, numero di riga sorgente (0 = nessuna)
+#   crc32   uint32 di tutto ciò che precede
+IMAGE_MAGIC = b"LMCI"
+IMAGE_VERSION = 1
+FLAG_SYMBOLS = 0x1
+FLAG_LINES = 0x2
+CELLS = 100
+
+_HEADER = struct.Struct("<4sHHHHII")
+_CRC = struct.Struct("<I")
+_PAYLOAD_SIZE = CELLS * 2
+
+# Archivio:
+#   header  <4s H H I Q>  magic, versione, riservato, numero immagini, offset indice
+#   immagini concatenate
+#   indice  per voce: offset uint64, lunghezza uint32, len nome uint16, nome utf-8
+ARCHIVE_MAGIC = b"LMCA"
+ARCHIVE_VERSION = 1
+_ARCHIVE_HEADER = struct.Struct("<4sHHIQ")
+_INDEX_ENTRY = struct.Struct("<QIH")
+
+_LITTLE = sys.byteorder == "little"
+
+
+@dataclass
+class ProgramImage:
+    """Immagine di memoria decodificata.
+
+    Attributes:
+        cells: le 100 celle (array 'H' o memoryview sul buffer originale)
+        symbols: etichette -> indirizzo (vuoto se assente)
+        lines: numero di riga sorgente per cella (vuoto se assente)
+    """
+
+    cells: Union[array, memoryview]
+    symbols: Dict[str, int] = field(default_factory=dict)
+    lines: List[int] = field(default_factory=list)
+
+    def memory(self) -> List[int]:
+        """Le celle come lista Python (formato accettato da `LMC.reset`)."""
+        return self.cells.tolist()
+
+
+def encode_image(
+    memory: List[int],
+    symbols: Optional[Dict[str, int]] = None,
+    lines: Optional[List[int]] = None,
+) -> bytes:
+    """Serializza una memoria (più simboli e mappa delle linee opzionali) in un'immagine binaria.
+
+    Args:
+        memory: 100 interi 0..999
+        symbols: opzionale, etichette -> indirizzo
+        lines: opzionale, 100 numeri di riga sorgente (0 = cella senza sorgente)
+
+    Returns:
+        Immagine binaria con checksum CRC32
+
+    Raises:
+        ImageError: se memoria, simboli o linee non sono validi
+    """
+    if len(memory) != CELLS:
+        raise ImageError(f"L'immagine deve avere {CELLS} celle")
+    if min(memory) < 0 or max(memory) > 999:
+        raise ImageError("Valore di memoria fuori range 0..999")
+    cells = array("H", memory)
+    if not _LITTLE:
+        cells.byteswap()
+    flags = 0
+    sym_blob = b""
+    if symbols:
+        flags |= FLAG_SYMBOLS
+        parts = [struct.pack("<H", len(symbols))]
+        for name, addr in symbols.items():
+            raw = name.encode("utf-8")
+            if len(raw) > 255 or not (0 <= addr < CELLS):
+                raise ImageError(f"Simbolo non valido: {name!r}")
+            parts.append(struct.pack("<HB", addr, len(raw)) + raw)
+        sym_blob = b"".join(parts)
+    line_blob = b""
+    if lines:
+        if len(lines) != CELLS:
+            raise ImageError(f"La mappa delle linee deve avere {CELLS} voci")
+        flags |= FLAG_LINES
+        line_arr = array("I", lines)
+        if not _LITTLE:
+            line_arr.byteswap()
+        line_blob = line_arr.tobytes()
+    body = b"".join([
+        _HEADER.pack(IMAGE_MAGIC, IMAGE_VERSION, flags, CELLS, 0, len(sym_blob), len(line_blob)),
+        cells.tobytes(),
+        sym_blob,
+        line_blob,
+    ])
+    return body + _CRC.pack(zlib.crc32(body))
+
+
+def decode_image(data: Buffer, verify: bool = True) -> ProgramImage:
+    """Decodifica un'immagine da bytes, memoryview o mmap senza copiare il payload.
+
+    La validazione delle celle avviene con un'unica passata in C (`max`), non con
+    un ciclo Python per cella.
+
+    Args:
+        data: buffer contenente esattamente un'immagine
+        verify: se True controlla checksum e range dei valori
+
+    Returns:
+        ProgramImage; su macchine little-endian `cells` è una memoryview sul buffer
+
+    Raises:
+        ImageError: per magic, versione, dimensioni o checksum non validi
+    """
+    view = memoryview(data)
+    if view.ndim != 1 or view.itemsize != 1:
+        view = view.cast("B")
+    size = view.nbytes
+    if size < _HEADER.size + _PAYLOAD_SIZE + _CRC.size:
+        raise ImageError("Immagine troncata")
+    magic, version, flags, ncells, _, sym_len, line_len = _HEADER.unpack_from(view, 0)
+    if magic != IMAGE_MAGIC:
+        raise ImageError("Magic dell'immagine non valido")
+    if version != IMAGE_VERSION:
+        raise ImageError(f"Versione immagine non supportata: {version}")
+    if ncells != CELLS:
+        raise ImageError(f"Numero di celle non supportato: {ncells}")
+    end = _HEADER.size + _PAYLOAD_SIZE + sym_len + line_len
+    if end + _CRC.size != size:
+        raise ImageError("Dimensione dell'immagine incoerente con l'header")
+    if verify and zlib.crc32(view[:end]) != _CRC.unpack_from(view, end)[0]:
+        raise ImageError("Checksum dell'immagine non valido")
+
+    payload = view[_HEADER.size:_HEADER.size + _PAYLOAD_SIZE]
+    if _LITTLE:
+        cells: Union[array, memoryview] = payload.cast("H")
+    else:
+        cells = array("H", payload.tobytes())
+        cells.byteswap()
+    if verify and max(cells) > 999:
+        raise ImageError("Valore di memoria fuori range 0..999")
+
+    pos = _HEADER.size + _PAYLOAD_SIZE
+    symbols: Dict[str, int] = {}
+    if flags & FLAG_SYMBOLS:
+        (count,) = struct.unpack_from("<H", view, pos)
+        p = pos + 2
+        for _ in range(count):
+            addr, n = struct.unpack_from("<HB", view, p)
+            p += 3
+            symbols[bytes(view[p:p + n]).decode("utf-8")] = addr
+            p += n
+    pos += sym_len
+    lines: List[int] = []
+    if flags & FLAG_LINES:
+        line_arr = array("I", view[pos:pos + line_len].tobytes())
+        if not _LITTLE:
+            line_arr.byteswap()
+        lines = line_arr.tolist()
+    return ProgramImage(cells, symbols, lines)
+
+
+def write_archive(path: str, images: Iterable[Tuple[str, bytes]]):
+    """Scrive un archivio di immagini (nome, bytes) in modo atomico.
+
+    Raises:
+        ImageError: per nomi duplicati o troppo lunghi
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0" * _ARCHIVE_HEADER.size)
+            index = []
+            seen = set()
+            offset = _ARCHIVE_HEADER.size
+            for name, blob in images:
+                raw = name.encode("utf-8")
+                if name in seen or len(raw) > 0xFFFF:
+                    raise ImageError(f"Nome non valido o duplicato nell'archivio: {name!r}")
+                seen.add(name)
+                f.write(blob)
+                index.append(_INDEX_ENTRY.pack(offset, len(blob), len(raw)) + raw)
+                offset += len(blob)
+            f.write(b"".join(index))
+            f.seek(0)
+            f.write(_ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0, len(index), offset))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class ImageArchive:
+    """Archivio di immagini mappato in memoria (sola lettura).
+
+    L'indice viene letto all'apertura; le immagini sono decodificate su richiesta
+    come memoryview sul file mappato, senza copie.
+
+    Args:
+        path: percorso del file archivio
+
+    Raises:
+        ImageError: se il file non è un archivio valido
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # file vuoto
+            self._file.close()
+            raise ImageError("Archivio vuoto")
+        self._view = memoryview(self._map)
+        try:
+            self._index = self._read_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_index(self) -> Dict[str, Tuple[int, int]]:
+        view = self._view
+        if len(view) < _ARCHIVE_HEADER.size:
+            raise ImageError("Archivio troncato")
+        magic, version, _, count, index_off = _ARCHIVE_HEADER.unpack_from(view, 0)
+        if magic != ARCHIVE_MAGIC:
+            raise ImageError("Magic dell'archivio non valido")
+        if version != ARCHIVE_VERSION:
+            raise ImageError(f"Versione archivio non supportata: {version}")
+        index: Dict[str, Tuple[int, int]] = {}
+        size = len(view)
+        p = index_off
+        for _ in range(count):
+            if p + _INDEX_ENTRY.size > size:
+                raise ImageError("Indice dell'archivio troncato")
+            offset, length, n = _INDEX_ENTRY.unpack_from(view, p)
+            p += _INDEX_ENTRY.size
+            if p + n > size:
+                raise ImageError("Indice dell'archivio troncato")
+            try:
+                name = bytes(view[p:p + n]).decode("utf-8")
+            except UnicodeDecodeError:
+                raise ImageError("Nome non valido nell'indice dell'archivio") from None
+            p += n
+            if offset + length > index_off:
+                raise ImageError(f"Voce di indice fuori dai limiti: {name!r}")
+            index[name] = (offset, length)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def names(self) -> Iterator[str]:
+        """Nomi delle immagini nell'ordine di scrittura."""
+        return iter(self._index)
+
+    def raw(self, name: str) -> memoryview:
+        """Byte dell'immagine `name` (memoryview sul file mappato)."""
+        offset, length = self._index[name]
+        return self._view[offset:offset + length]
+
+    def __getitem__(self, name: str) -> ProgramImage:
+        return decode_image(self.raw(name))
+
+    def close(self):
+        """Rilascia mappa e file. Le memoryview già restituite non vanno più usate."""
+        view = getattr(self, "_view", None)
+        if view is not None:
+            view.release()
+            self._view = None
+        if getattr(self, "_map", None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # esistono ancora viste esportate: la mappa verrà chiusa dal GC
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "ImageArchive":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
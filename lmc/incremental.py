@@ -0,0 +1,255 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Set, Tuple
+
+from .assembler import Assembler, Diagnostic, _span, _TOKEN_RE
+from .isa import CLASSIC, ISA
+
+
+def _same_shape(old: Optional[tuple], new: Optional[tuple]) -> bool:
+    """True se le due righe occupano le stesse celle e definiscono la stessa etichetta."""
+    if old is None or new is None:
+        return old is new
+    return old[1] == new[1] and (old[0] or "").upper() == (new[0] or "").upper()
+
+
+class IncrementalAssembler:
+    """Assemblaggio incrementale di un sorgente modificato a righe (editor, LSP).
+
+    Tiene l'analisi di ogni riga, la posizione in memoria di ogni riga e la tabella
+    delle etichette. `replace_lines` rianalizza solo le righe modificate e ricodifica
+    solo le celle interessate: quelle delle righe nuove, quelle spostate da
+    inserimenti o cancellazioni di istruzioni e quelle che usano un'etichetta il cui
+    indirizzo è cambiato. Memoria, etichette, mappa delle linee e diagnostiche sono
+    sempre uguali a quelle di `Assembler` sul sorgente completo (con gli errori, le
+    celle errate valgono 0 come in `Assembler.check`).
+
+    Args:
+        source: sorgente iniziale
+        isa: geometria (come in `Assembler`)
+
+    Attributes:
+        memory: immagine di memoria corrente (`isa.cells` interi)
+        labels: etichette (maiuscole) -> indirizzo
+        line_map: per ogni cella il numero di riga sorgente (da 1; 0 se nessuna)
+    """
+
+    def __init__(self, source: str = "", isa: ISA = CLASSIC):
+        self.assembler = Assembler(isa)
+        self.isa = isa
+        self.memory: List[int] = [0] * isa.cells
+        self.line_map: List[int] = [0] * isa.cells
+        self.labels: Dict[str, int] = {}
+        self._raw: List[str] = []
+        self._parsed: List[Optional[tuple]] = []
+        self._addr: List[int] = []  # per riga: cella occupata (-1 se nessuna o oltre la memoria)
+        self._refs: Dict[str, List[int]] = {}  # etichetta -> righe che la usano come operando
+        self._duplicates: List[int] = []  # righe con un'etichetta già definita
+        self._used = 0  # celle occupate (anche oltre la memoria)
+        self.replace_lines(0, 0, source)
+
+    @property
+    def source(self) -> str:
+        """Sorgente corrente."""
+        return "\n".join(self._raw)
+
+    @property
+    def line_count(self) -> int:
+        """Numero di righe del sorgente."""
+        return len(self._raw)
+
+    def replace_lines(self, start: int, end: int, text: str) -> Dict[int, int]:
+        """Sostituisce le righe `start..end-1` (da 0, come una fetta) con le righe di `text`.
+
+        `start == end` inserisce prima della riga `start`; `text` vuoto cancella.
+
+        Returns:
+            Celle cambiate: indirizzo -> nuovo valore, in ordine di indirizzo
+
+        Raises:
+            IndexError: intervallo di righe non valido
+        """
+        if not (0 <= start <= end <= len(self._raw)):
+            raise IndexError(f"Righe {start}..{end} fuori dal sorgente di {len(self._raw)} righe")
+        new_raw = text.splitlines()
+        old_block = self._parsed[start:end]
+        new_block = self.assembler._parse_lines(new_raw)
+        self._raw[start:end] = new_raw
+        self._parsed[start:end] = new_block
+        stop = start + len(new_raw)
+        old_used = self._used
+        dirty: Set[int] = set(range(start, stop))
+        if len(old_block) == len(new_block) and all(map(_same_shape, old_block, new_block)):
+            # stesse celle e stesse etichette (il caso tipico di una modifica a un operando):
+            # indirizzi e tabella delle etichette non cambiano, si aggiornano solo gli usi
+            refs = self._refs
+            addr = self._addr
+            for i, old, new in zip(range(start, stop), old_block, new_block):
+                if addr[i] < 0:
+                    continue
+                if old[3] is not None:
+                    refs[old[3].upper()].remove(i)
+                if new[3] is not None:
+                    refs.setdefault(new[3].upper(), []).append(i)
+        else:
+            old_addr = self._addr
+            old_labels = self.labels
+            self._layout()
+            addr = self._addr
+            labels = self.labels
+            # da ricodificare anche le righe spostate e quelle che usano un'etichetta spostata
+            shift = len(old_addr) - len(addr)
+            for i in range(stop, len(addr)):
+                if addr[i] != old_addr[i + shift]:
+                    dirty.add(i)
+            for key in old_labels.keys() | labels.keys():
+                if old_labels.get(key) != labels.get(key):
+                    dirty.update(self._refs.get(key, ()))
+
+        memory = self.memory
+        line_map = self.line_map
+        changed: Dict[int, int] = {}
+        cells = self.isa.cells
+        for cell in range(min(self._used, cells), min(old_used, cells)):
+            # celle non più occupate
+            line_map[cell] = 0
+            if memory[cell]:
+                memory[cell] = 0
+                changed[cell] = 0
+        for i in dirty:
+            cell = addr[i]
+            if cell < 0:
+                continue
+            word = self._encode(self._parsed[i])
+            if memory[cell] != word:
+                memory[cell] = word
+                changed[cell] = word
+        return dict(sorted(changed.items()))
+
+    def _encode(self, line: tuple) -> int:
+        ref = line[3]
+        if ref is None:
+            return line[2]
+        addr = self.labels.get(ref.upper())
+        return 0 if addr is None else line[2] + addr
+
+    def _layout(self):
+        """Ricalcola indirizzi delle righe, etichette e mappa delle linee (niente analisi di testo)."""
+        cells = self.isa.cells
+        line_map = self.line_map
+        labels: Dict[str, int] = {}
+        refs: Dict[str, List[int]] = {}
+        addr: List[int] = []
+        duplicates: List[int] = []
+        index = 0
+        for i, line in enumerate(self._parsed):
+            if line is None:
+                addr.append(-1)
+                continue
+            label = line[0]
+            if label is not None:
+                key = label.upper()
+                if key in labels:
+                    duplicates.append(i)
+                else:
+                    labels[key] = index
+            if not line[1]:
+                addr.append(-1)
+                continue
+            if index < cells:
+                addr.append(index)
+                line_map[index] = i + 1
+                ref = line[3]
+                if ref is not None:
+                    refs.setdefault(ref.upper(), []).append(i)
+            else:
+                addr.append(-1)
+            index += 1
+        self._addr = addr
+        self.labels = labels
+        self._refs = refs
+        self._duplicates = duplicates
+        self._used = index
+
+    @property
+    def diagnostics(self) -> List[Diagnostic]:
+        """Errori del sorgente corrente, come `Assembler.check` (lista vuota se valido)."""
+        errors: List[Diagnostic] = []
+        cells = self.isa.cells
+        duplicates = set(self._duplicates)
+        index = 0
+        for i, line in enumerate(self._parsed):
+            if line is None:
+                continue
+            label, emits, _, ref, problem, code, base, skip = line
+            lineno = i + 1
+            if i in duplicates:
+                col = code.find(label) + 1
+                errors.append(Diagnostic(lineno, col, col + len(label), f"etichetta duplicata '{label}'"))
+            if not emits:
+                continue
+            if index == cells:
+                col, end = _span(code, base, skip)
+                errors.append(Diagnostic(lineno, col, end, f"programma troppo lungo (oltre {cells} istruzioni)"))
+            if index < cells and problem is not None:
+                col, end = _span(code, base, skip + problem[0])
+                errors.append(Diagnostic(lineno, col, end, problem[1]))
+            index += 1
+        labels = self.labels
+        for key, lines in self._refs.items():
+            if key not in labels:
+                for i in lines:
+                    line = self._parsed[i]
+                    col, end = _span(line[5], line[6], line[7] + 1)
+                    errors.append(Diagnostic(i + 1, col, end, f"etichetta sconosciuta '{line[3]}'"))
+        errors.sort(key=lambda d: (d.line, d.column))
+        return errors
+
+    def program(self) -> Tuple[List[int], Dict[str, int], List[int]]:
+        """Copia di (memoria, etichette, linee) come `Assembler.assemble_program`.
+
+        Raises:
+            AssemblerError: se il sorgente corrente ha errori
+        """
+        errors = self.diagnostics
+        if errors:
+            raise Assembler._error(errors)
+        return self.memory[:], dict(self.labels), self.line_map[:]
+
+    def address_of(self, line: int) -> Optional[int]:
+        """Cella occupata dalla riga `line` (da 1), o None se la riga non genera una cella."""
+        if not (1 <= line <= len(self._addr)):
+            return None
+        cell = self._addr[line - 1]
+        return None if cell < 0 else cell
+
+    def hover(self, line: int, column: int) -> Optional[str]:
+        """Descrizione del token alla posizione data (riga e colonna da 1), per l'editor.
+
+        Su un'etichetta (definizione o operando) riporta il suo indirizzo e il valore
+        della cella, altrimenti la cella generata dalla riga; None se non c'è nulla.
+        """
+        if not (1 <= line <= len(self._parsed)):
+            return None
+        parsed = self._parsed[line - 1]
+        if parsed is None:
+            return None
+        label, _, _, ref, _, code, _, _ = parsed
+        word = None
+        for match in _TOKEN_RE.finditer(code):
+            if match.start() < column <= match.end():
+                word = match.group().rstrip(":")
+                break
+        if word is not None:
+            key = word.upper()
+            if word in (label, ref) and key in self.labels:
+                addr = self.labels[key]
+                value = self.memory[addr] if addr < self.isa.cells else 0
+                return f"{key} = {addr} (cella: {value})"
+            if word == ref:
+                return f"etichetta sconosciuta '{ref}'"
+        cell = self.address_of(line)
+        if cell is None:
+            return None
+        return f"cella {cell}: {self.memory[cell]}"
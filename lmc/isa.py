@@ -0,0 +1,174 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+# Codici interni dell'interprete veloce (ordinati per frequenza tipica)
+_LDA, _ADD, _STA, _SUB, _BRZ, _BRP, _BRA, _INP, _OUT, _HLT, _ILLEGAL = range(11)
+# Indirizzamento indiretto (solo nelle geometrie che lo prevedono)
+_LDI, _STI = 11, 12
+
+# Semantica di ogni mnemonico riconosciuto dalla macchina
+ADDRESSED_OPS = {
+    "ADD": _ADD,
+    "SUB": _SUB,
+    "STA": _STA,
+    "LDA": _LDA,
+    "BRA": _BRA,
+    "BRZ": _BRZ,
+    "BRP": _BRP,
+    "LDI": _LDI,  # acc = mem[mem[x]]
+    "STI": _STI,  # mem[mem[x]] = acc
+}
+IO_OPS = {"INP": _INP, "OUT": _OUT}
+
+Memory = Union[List[int], array]
+
+
+@dataclass(frozen=True, eq=False)
+class ISA:
+    """Geometria e set di istruzioni di una macchina LMC.
+
+    Un'istruzione con operando vale `codice * cells + indirizzo`; le parole con
+    codice 0 sono HLT, INP e OUT sono parole fisse. Assembler e macchina leggono
+    la stessa descrizione, quindi un programma assemblato per una geometria gira
+    solo su macchine con la stessa geometria.
+
+    Attributes:
+        name: nome del profilo
+        cells: numero di celle di memoria (e di indirizzi)
+        modulus: le celle contengono valori 0..modulus-1, l'aritmetica è modulo `modulus`
+        opcodes: codice numerico di ogni istruzione con operando (ADD, SUB, STA, LDA,
+            BRA, BRZ, BRP e le opzionali LDI/STI)
+        io: parola fissa di INP e OUT
+    """
+
+    name: str
+    cells: int
+    modulus: int
+    opcodes: Mapping[str, int] = field(repr=False)
+    io: Mapping[str, int] = field(repr=False)
+
+    def __post_init__(self):
+        if self.cells < 2:
+            raise ValueError("Servono almeno 2 celle di memoria")
+        if self.modulus < self.cells:
+            raise ValueError("Il modulo deve essere almeno pari al numero di celle")
+        limit = self.modulus // self.cells
+        for name, code in self.opcodes.items():
+            if name not in ADDRESSED_OPS:
+                raise ValueError(f"Istruzione con operando sconosciuta: {name}")
+            if not (1 <= code < limit):
+                raise ValueError(f"Codice di {name} fuori range 1..{limit - 1}: {code}")
+        if len(set(self.opcodes.values())) != len(self.opcodes):
+            raise ValueError("Codici di istruzione duplicati")
+        for name, word in self.io.items():
+            if name not in IO_OPS:
+                raise ValueError(f"Istruzione di I/O sconosciuta: {name}")
+            if not (self.cells <= word < self.modulus) or word // self.cells in self.opcodes.values():
+                raise ValueError(f"Parola di {name} non valida: {word}")
+
+    def __reduce__(self):
+        # i profili predefiniti restano singleton anche dopo pickle (il percorso veloce usa `is`)
+        if PROFILES.get(self.name) is self:
+            return profile, (self.name,)
+        return ISA, (self.name, self.cells, self.modulus, dict(self.opcodes), dict(self.io))
+
+    @property
+    def max_value(self) -> int:
+        """Valore massimo di una cella."""
+        return self.modulus - 1
+
+    @cached_property
+    def mnemonics(self) -> Dict[str, int]:
+        """Mnemonico -> codice (istruzioni con operando) o parola (INP, OUT, HLT)."""
+        return {**self.opcodes, **self.io, "HLT": 0}
+
+    @cached_property
+    def decode(self) -> Tuple[Tuple[int, int], ...]:
+        """Tabella (operazione interna, argomento) per ogni valore 0..modulus-1."""
+        ops = {code: ADDRESSED_OPS[name] for name, code in self.opcodes.items()}
+        fixed = {word: IO_OPS[name] for name, word in self.io.items()}
+        table = []
+        for value in range(self.modulus):
+            code, arg = divmod(value, self.cells)
+            if code == 0:
+                table.append((_HLT, 0))
+            elif value in fixed:
+                table.append((fixed[value], 0))
+            else:
+                table.append((ops.get(code, _ILLEGAL), arg))
+        return tuple(table)
+
+    @cached_property
+    def next_pc(self) -> Tuple[int, ...]:
+        """Successore del program counter con wrap all'ultima cella."""
+        return tuple((i + 1) % self.cells for i in range(self.cells))
+
+    @property
+    def typecode(self) -> str:
+        """Typecode `array` più piccolo che contiene tutti i valori di una cella."""
+        if self.modulus <= 1 << 16:
+            return "H"
+        if self.modulus <= 1 << 32:
+            return "I" if array("I").itemsize >= 4 else "L"
+        return "Q"
+
+    def encode(self, mnemonic: str, address: int = 0) -> int:
+        """Parola macchina di un'istruzione (l'indirizzo è ignorato per INP/OUT/HLT).
+
+        Raises:
+            KeyError: se il mnemonico non appartiene al profilo
+        """
+        if mnemonic in self.opcodes:
+            return self.opcodes[mnemonic] * self.cells + address
+        return self.mnemonics[mnemonic]
+
+    def allocate(self, values: Optional[Sequence[int]] = None) -> Memory:
+        """Nuova memoria per questa geometria (senza validazione dei valori).
+
+        Il profilo classico usa una lista, su cui l'interprete veloce è più rapido;
+        le altre geometrie un `array` tipizzato.
+        """
+        if self is CLASSIC:
+            return [0] * self.cells if values is None else list(values)
+        if values is None:
+            return array(self.typecode, bytes(array(self.typecode).itemsize * self.cells))
+        return array(self.typecode, values)
+
+
+# LMC classico: 100 celle, valori 0..999, INP 901 e OUT 902
+CLASSIC = ISA(
+    "classic",
+    cells=100,
+    modulus=1000,
+    opcodes={"ADD": 1, "SUB": 2, "STA": 3, "LDA": 5, "BRA": 6, "BRZ": 7, "BRP": 8},
+    io={"INP": 901, "OUT": 902},
+)
+
+# Geometria estesa: 1000 celle, parole 0..99999 (codice a 2 cifre + indirizzo a 3),
+# con caricamento e memorizzazione indiretti per scorrere vettori
+WIDE = ISA(
+    "wide",
+    cells=1000,
+    modulus=100000,
+    opcodes={"ADD": 1, "SUB": 2, "STA": 3, "LDI": 4, "LDA": 5, "BRA": 6, "BRZ": 7, "BRP": 8, "STI": 9},
+    io={"INP": 90001, "OUT": 90002},
+)
+
+PROFILES: Dict[str, ISA] = {CLASSIC.name: CLASSIC, WIDE.name: WIDE}
+
+
+def profile(name: str) -> ISA:
+    """Profilo predefinito per nome ("classic" o "wide").
+
+    Raises:
+        ValueError: se il profilo non esiste
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Profilo ISA sconosciuto: {name}") from None
@@ -1,62 +1,505 @@
 # Francesco Falcon SM3201408
 
 from __future__ import annotations
+import time
+from array import array
 from collections import deque
-from dataclasses import dataclass, field
-from typing import Deque, List, Optional
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from typing import Callable, Deque, Iterable, List, Optional, Tuple, Union
 
 from .exceptions import (
     LMCError,
     IllegalInstructionError,
+    ImageError,
     MemoryErrorLMC,
     InputUnderflowError,
+    NonTerminationDetected,
 )
+from .coverage import EdgeCoverage
+from .debugger import Condition, Debugger, Hit
+from .image import ProgramImage, decode_image
+from .memory import GuardedMemory
+from .isa import CLASSIC, ISA, Memory, _LDA, _ADD, _STA, _SUB, _BRZ, _BRP, _BRA, _INP, _OUT, _HLT, _ILLEGAL, _LDI, _STI
+
+
+# Tabella di dispatch precalcolata per tutti i 1000 valori possibili di una cella (profilo classico)
+_DECODE: tuple[tuple[int, int], ...] = CLASSIC.decode
+# Successore del program counter con wrap 99 -> 0
+_NEXT_PC: tuple[int, ...] = CLASSIC.next_pc
+
+
+# Politiche per INP senza input disponibile
+UNDERFLOW_RAISE = "raise"  # solleva InputUnderflowError
+UNDERFLOW_BLOCK = "block"  # sospende la macchina sull'INP, riprendibile quando arriva input
+UNDERFLOW_HALT = "halt"    # ferma la macchina come un HLT
+UNDERFLOW_POLICIES = (UNDERFLOW_RAISE, UNDERFLOW_BLOCK, UNDERFLOW_HALT)
+
+InputSource = Union[Iterable[int], Callable[[], Optional[int]]]
+
+# Motivi di arresto riportati da `LMC.execute`
+HALTED = "halted"
+INPUT_WAIT = "input_wait"
+STEP_LIMIT = "step_limit"
+TIME_LIMIT = "time_limit"
+INPUT_UNDERFLOW = "input_underflow"
+ILLEGAL_INSTRUCTION = "illegal_instruction"
+NON_TERMINATION = "non_termination"
+MEMORY_ERROR = "memory_error"
+BREAKPOINT = "breakpoint"
+
+_ERROR_REASONS = (
+    (InputUnderflowError, INPUT_UNDERFLOW),
+    (IllegalInstructionError, ILLEGAL_INSTRUCTION),
+    (NonTerminationDetected, NON_TERMINATION),
+    (MemoryErrorLMC, MEMORY_ERROR),
+)
+
+# Istruzioni eseguite tra due controlli del limite di tempo in `execute`
+TIME_CHECK_SLICE = 4096
+
+
+class RunResult:
+    """Esito compatto di `LMC.execute`.
+
+    Attributes:
+        reason: motivo di arresto (HALTED, STEP_LIMIT, TIME_LIMIT, INPUT_UNDERFLOW,
+            ILLEGAL_INSTRUCTION, NON_TERMINATION, MEMORY_ERROR, BREAKPOINT)
+        steps: istruzioni eseguite (HLT esclusa)
+        pc, accumulator, flag: stato finale della macchina
+        outputs: output prodotti durante l'esecuzione (vuota con `output_sink`
+            impostato: i valori vanno al sink e non in `output_queue`)
+        wall_ns: durata dell'esecuzione in nanosecondi
+        error: eccezione che ha fermato la macchina, se presente
+    """
+
+    __slots__ = ("reason", "steps", "pc", "accumulator", "flag", "outputs", "wall_ns", "error")
+
+    def __init__(
+        self,
+        reason: str,
+        steps: int,
+        pc: int,
+        accumulator: int,
+        flag: bool,
+        outputs: Tuple[int, ...],
+        wall_ns: int,
+        error: Optional[LMCError] = None,
+    ):
+        self.reason = reason
+        self.steps = steps
+        self.pc = pc
+        self.accumulator = accumulator
+        self.flag = flag
+        self.outputs = outputs
+        self.wall_ns = wall_ns
+        self.error = error
+
+    @property
+    def halted(self) -> bool:
+        """True se la macchina ha raggiunto HLT."""
+        return self.reason == HALTED
+
+    def __repr__(self) -> str:
+        return (
+            f"RunResult(reason={self.reason!r}, steps={self.steps}, pc={self.pc}, "
+            f"accumulator={self.accumulator}, flag={self.flag}, outputs={self.outputs!r}, "
+            f"wall_ns={self.wall_ns})"
+        )
+
+
+@dataclass(frozen=True)
+class MachineSnapshot:
+    """Copia immutabile e serializzabile (pickle) dello stato di una macchina.
+
+    Non include `input_source` e `output_sink`, che in generale non sono serializzabili.
+    """
+
+    memory: Tuple[int, ...]
+    pc: int
+    accumulator: int
+    flag: bool
+    inputs: Tuple[int, ...]
+    outputs: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class TrustedImage:
+    """Immagine di memoria già validata, caricabile da `reset` senza ricontrollare le celle.
+
+    Le celle vengono validate una volta sola alla creazione (anche con il
+    costruttore, non solo con `TrustedImage.from_memory`); `reset` copia poi le
+    celle nella memoria esistente della macchina (assegnazione a fetta), senza
+    allocare una nuova lista.
+
+    Attributes:
+        cells: contenuto delle celle
+        isa: geometria per cui l'immagine è stata validata
+
+    Raises:
+        MemoryErrorLMC: numero di celle errato o valore fuori range
+    """
+
+    cells: Tuple[int, ...]
+    isa: ISA = CLASSIC
+    _packed: Optional[array] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        isa = self.isa
+        cells = tuple(self.cells)
+        if len(cells) != isa.cells:
+            raise MemoryErrorLMC(f"La memoria deve avere {isa.cells} celle")
+        top = isa.max_value
+        for i, v in enumerate(cells):
+            if type(v) is not int or not (0 <= v <= top):
+                raise MemoryErrorLMC(f"Valore memoria fuori range in cella {i}: {v}")
+        object.__setattr__(self, "cells", cells)
+        # le geometrie non classiche usano memoria `array`: copia già nel formato giusto
+        object.__setattr__(self, "_packed", None if isa is CLASSIC else isa.allocate(cells))
+
+    @classmethod
+    def from_memory(cls, memory: Iterable[int], isa: ISA = CLASSIC) -> "TrustedImage":
+        """Valida `memory` per la geometria `isa` e la congela.
+
+        Raises:
+            MemoryErrorLMC: numero di celle errato o valore fuori range
+        """
+        return cls(tuple(memory), isa)
+
+
+class LoopDetector:
+    """Rilevatore di cicli (algoritmo di Brent) sugli stati ai salti all'indietro.
+
+    Lo stato completo (pc, acc, flag, input residui, memoria) viene confrontato con
+    un unico stato salvato, aggiornato a ogni potenza di due di osservazioni: niente
+    hash né insiemi, e una copia della memoria solo a ogni raddoppio.
+
+    Attributes:
+        offset: passi eseguiti nelle fette precedenti della stessa esecuzione, sommati
+            ai passi (relativi alla fetta) passati a `observe`
+    """
+
+    __slots__ = ("power", "lam", "saved", "saved_steps", "offset")
+
+    def __init__(self):
+        self.power = 1
+        self.lam = 0
+        self.saved = None
+        self.saved_steps = 0
+        self.offset = 0
+
+    def observe(self, pc: int, acc: int, flag: bool, pending: int, mem: List[int], steps: int):
+        """Registra lo stato dopo un salto all'indietro.
+
+        Raises:
+            NonTerminationDetected: se lo stato coincide con quello salvato
+        """
+        steps += self.offset
+        saved = self.saved
+        if (
+            saved is not None
+            and saved[0] == pc
+            and saved[1] == acc
+            and saved[2] == flag
+            and saved[3] == pending
+            and saved[4] == mem
+        ):
+            raise NonTerminationDetected(pc, steps - self.saved_steps, steps)
+        self.lam += 1
+        if self.lam >= self.power:
+            self.saved = (pc, acc, flag, pending, mem[:])
+            self.saved_steps = steps
+            self.power *= 2
+            self.lam = 0
+
+
+class _MemoryField:
+    """Campo `LMC.memory`: ogni assegnazione viene validata e avvolta in `GuardedMemory`.
+
+    Una `GuardedMemory` della stessa geometria viene assegnata così com'è (è già
+    valida: è il caso di `fork`); durante `__init__` la geometria non è ancora nota
+    e la validazione avviene in `__post_init__`.
+    """
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return None  # default del campo: memoria azzerata della geometria
+        return obj._memory
+
+    def __set__(self, obj, value):
+        isa = obj.__dict__.get("isa")
+        if isa is None or (type(value) is GuardedMemory and value.isa is isa):
+            obj._memory = value
+        else:
+            obj._memory = GuardedMemory.validated(value, isa)
 
 
 @dataclass
 class LMC:
-    """Simulatore di Little Man Computer (LMC)."""
+    """Simulatore di Little Man Computer (LMC).
+
+    La geometria (celle, modulo dei valori, codici delle istruzioni) è descritta da
+    `isa`; il profilo classico `lmc.isa.CLASSIC` è quello predefinito e l'unico
+    supportato da profilazione, traccia e motore compilato.
 
-    memory: List[int] = field(default_factory=lambda: [0] * 100)
+    `memory` è una `GuardedMemory`: assegnare una nuova memoria o scrivere una cella
+    con un valore non valido solleva subito `MemoryErrorLMC`, così gli interpreti non
+    ricontrollano le celle a ogni lettura né prima di ogni `run()`.
+    """
+
+    # assegnabile con una sequenza di `isa.cells` interi, validata (vedi `_MemoryField`)
+    memory: GuardedMemory = _MemoryField()
     accumulator: int = 0
     pc: int = 0
     flag: bool = False  # negativo: True se l'ultimo risultato aritmetico è negativo
     input_queue: Deque[int] = field(default_factory=deque)
     output_queue: Deque[int] = field(default_factory=deque)
+    # sorgente di input letta quando input_queue è vuota: iterabile oppure callable (None = nessun dato)
+    input_source: Optional[InputSource] = None
+    # se impostato, riceve ogni valore di OUT al posto di output_queue
+    output_sink: Optional[Callable[[int], None]] = None
+    on_underflow: str = UNDERFLOW_RAISE
+    # valori letti da input_source e stato di attesa input dell'ultima esecuzione
+    _pulled: int = field(default=0, init=False, repr=False, compare=False)
+    _waiting: bool = field(default=False, init=False, repr=False, compare=False)
+    # se impostato (lmc.profiler.Profile), run/execute usano l'interprete strumentato
+    profile: Optional[object] = field(default=None, repr=False, compare=False)
+    # se impostato (lmc.trace.TraceRecorder), run/execute registrano ogni istruzione
+    trace: Optional[object] = field(default=None, repr=False, compare=False)
+    # geometria e set di istruzioni (con un profilo non classico la memoria è un `array`)
+    isa: ISA = field(default=CLASSIC, repr=False)
+    # se impostato (lmc.debugger.Debugger) con breakpoint attivi, run/execute si fermano sugli eventi
+    debugger: Optional[Debugger] = field(default=None, repr=False, compare=False)
+    # se impostato (lmc.coverage.EdgeCoverage), run/execute registrano gli archi percorsi
+    coverage: Optional[EdgeCoverage] = field(default=None, repr=False, compare=False)
+    # istruzioni eseguite dall'ultima chiamata interna di esecuzione (anche se interrotta da un errore)
+    _steps: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        mem = self._memory
+        if mem is None:
+            self._memory = GuardedMemory(self.isa.allocate(), self.isa)
+        elif type(mem) is not GuardedMemory or mem.isa is not self.isa:
+            self._memory = GuardedMemory.validated(mem, self.isa)
 
-    def reset(self, memory: Optional[List[int]] = None, inputs: Optional[List[int]] = None):
+    @property
+    def _cow(self) -> bool:
+        """True se `memory` è condivisa con un'altra macchina (fork copy-on-write)."""
+        return self._memory.shared
+
+    @_cow.setter
+    def _cow(self, value: bool):
+        self._memory.shared = value
+
+    def reset(self, memory: Union[List[int], TrustedImage, None] = None, inputs: Optional[List[int]] = None):
         """Reinizializza lo stato della macchina.
 
         Args:
-            memory: opzionale, lista di 100 interi (0..999). Se None, mantiene la corrente.
+            memory: opzionale, lista di `isa.cells` interi (0..`isa.max_value`; 100 interi 0..999
+                nel profilo classico) oppure una `TrustedImage`, copiata senza ricontrollare
+                le celle dentro la memoria corrente (che quindi non va condivisa con altro
+                codice, salvo tramite `fork`). Se None, mantiene la corrente.
             inputs: opzionale, lista di interi da caricare come coda di input.
+
+        Raises:
+            MemoryErrorLMC: memoria non valida o `TrustedImage` di un'altra geometria
+            ValueError: input fuori range
         """
-        if memory is not None:
-            if len(memory) != 100:
-                raise MemoryErrorLMC("La memoria deve avere 100 celle")
-            for i, v in enumerate(memory):
-                if not (0 <= v <= 999):
-                    raise MemoryErrorLMC(f"Valore memoria fuori range in cella {i}: {v}")
-            self.memory = list(memory)
+        if type(memory) is TrustedImage:
+            if memory.isa is not self.isa:
+                raise MemoryErrorLMC(f"Immagine per il profilo '{memory.isa.name}', macchina '{self.isa.name}'")
+            packed = memory._packed
+            mem = self._memory
+            if self._cow or mem.isa is not self.isa:
+                source = memory.cells if packed is None else packed
+                self._memory = GuardedMemory(self.isa.allocate(source), self.isa)
+            else:
+                # copia nella memoria esistente: nessuna allocazione
+                mem.cells[:] = memory.cells if packed is None else packed
+        elif memory is not None:
+            self._memory = GuardedMemory.validated(memory, self.isa)
         self.accumulator = 0
         self.pc = 0
         self.flag = False
         self.input_queue.clear()
         self.output_queue.clear()
+        self._pulled = 0
+        self._waiting = False
         if inputs:
-            for v in inputs:
-                self.push_input(v)
+            if not isinstance(inputs, (list, tuple)):
+                inputs = list(inputs)
+            # controllo in blocco; il ciclo con push_input solo per segnalare il valore errato
+            if min(inputs) >= 0 and max(inputs) <= self.isa.max_value:
+                self.input_queue.extend(inputs)
+            else:
+                for v in inputs:
+                    self.push_input(v)
+
+    def load_image(self, data, inputs: Optional[List[int]] = None):
+        """Reinizializza la macchina da un'immagine binaria (vedi `lmc.image`).
+
+        La validazione avviene una volta sola sull'intera immagine (checksum e
+        valore massimo), senza il controllo cella per cella di `reset`.
+
+        Args:
+            data: bytes, memoryview, mmap oppure un `ProgramImage` già decodificato
+            inputs: opzionale, lista di interi da caricare come coda di input
+
+        Raises:
+            ImageError: se l'immagine non è valida o la macchina non usa il profilo classico
+            MemoryErrorLMC: celle fuori range in un `ProgramImage` passato già decodificato
+        """
+        if self.isa is not CLASSIC:
+            raise ImageError(f"Le immagini binarie richiedono il profilo classico, non '{self.isa.name}'")
+        if isinstance(data, ProgramImage):
+            # può venire da `decode_image(..., verify=False)` o essere costruito a mano
+            self._memory = GuardedMemory.validated(list(data.cells))
+        else:
+            self._memory = GuardedMemory(decode_image(data).cells.tolist())
+        self.reset(inputs=inputs)
+
+    def snapshot(self) -> MachineSnapshot:
+        """Cattura lo stato corrente (memoria, registri, code) in un `MachineSnapshot`."""
+        return MachineSnapshot(
+            tuple(self._memory.cells),
+            self.pc,
+            self.accumulator,
+            self.flag,
+            tuple(self.input_queue),
+            tuple(self.output_queue),
+        )
+
+    def restore(self, snap: MachineSnapshot):
+        """Ripristina lo stato catturato da `snapshot()`.
+
+        Raises:
+            MemoryErrorLMC: memoria dello snapshot non valida per la geometria
+        """
+        self._memory = GuardedMemory.validated(snap.memory, self.isa)
+        self.pc = snap.pc
+        self.accumulator = snap.accumulator
+        self.flag = snap.flag
+        self.input_queue = deque(snap.inputs)
+        self.output_queue = deque(snap.outputs)
+        self._pulled = 0
+        self._waiting = False
+
+    def fork(self) -> "LMC":
+        """Crea una copia indipendente della macchina che condivide la memoria copy-on-write.
+
+        Le due macchine condividono il buffer delle celle finché una delle due non ci
+        scrive (con una STA o assegnando una cella di `memory`): a quel punto chi
+        scrive si fa la propria copia. Le code di input/output vengono copiate;
+        `input_source` e `output_sink` restano condivisi. Profilo, traccia,
+        debugger e copertura invece non passano al figlio (che parte senza
+        strumentazione): accumulano stato per una sola esecuzione e condividerli
+        mescolerebbe i conteggi delle due macchine.
+
+        Returns:
+            Nuova macchina della stessa classe, nello stesso stato
+        """
+        child = replace(
+            self,
+            input_queue=deque(self.input_queue),
+            output_queue=deque(self.output_queue),
+            profile=None,
+            trace=None,
+            debugger=None,
+            coverage=None,
+        )
+        # viste distinte sullo stesso buffer: ciascuna sa di doverlo copiare alla prima scrittura
+        child._memory = GuardedMemory(self._memory.cells, self.isa, shared=True)
+        self._memory.shared = True
+        return child
+
+    def _unshare(self) -> Memory:
+        """Copia la memoria condivisa prima della prima scrittura dopo un fork.
+
+        Returns:
+            Il nuovo buffer delle celle (`memory.cells`)
+        """
+        return self._memory.unshare()
 
     def push_input(self, value: int):
-        """Inserisce un valore nella coda di input (0..999)."""
-        if not (0 <= value <= 999):
+        """Inserisce un valore nella coda di input (0..999 nel profilo classico)."""
+        if not (0 <= value <= self.isa.max_value):
             raise ValueError(f"Input fuori range: {value}")
         self.input_queue.append(value)
 
+    def iter_outputs(self, inputs: Optional[InputSource] = None, max_steps: int = 10000, slice_steps: int = 1024):
+        """Esegue la macchina come generatore di output.
+
+        Gli output vengono prodotti a blocchi di al più `slice_steps` istruzioni, senza
+        accumularsi in `output_queue`, quindi la memoria resta costante anche con molto I/O.
+
+        Args:
+            inputs: opzionale, nuova `input_source` (iterabile o callable)
+            max_steps: numero massimo di istruzioni da eseguire
+            slice_steps: istruzioni eseguite tra due consegne di output
+
+        Yields:
+            I valori emessi da OUT, in ordine
+
+        Raises:
+            InputUnderflowError: con on_underflow="raise" e input esaurito
+        """
+        if inputs is not None:
+            self.input_source = inputs
+        buf: List[int] = []
+        previous_sink = self.output_sink
+        self.output_sink = buf.append
+        try:
+            remaining = max_steps
+            while remaining > 0:
+                chunk = min(slice_steps, remaining)
+                n = self._execute_slice(chunk, None)
+                remaining -= n
+                if buf:
+                    out = buf[:]
+                    buf.clear()
+                    yield from out
+                if n < chunk or self.last_break is not None:
+                    break
+        finally:
+            self.output_sink = previous_sink
+
     def pop_output(self) -> Optional[int]:
         """Estrae un valore dalla coda di output se presente."""
         return self.output_queue.popleft() if self.output_queue else None
 
+    def _debug(self) -> Debugger:
+        if self.debugger is None:
+            self.debugger = Debugger()
+        return self.debugger
+
+    def break_at(self, address: int, condition: Optional[Condition] = None):
+        """Breakpoint: `run()` si ferma prima di eseguire l'istruzione in `address`.
+
+        Args:
+            address: indirizzo dell'istruzione
+            condition: opzionale, `condition(acc, memory)`; il breakpoint scatta solo se vera
+        """
+        self._debug().break_at(address, condition)
+
+    def watch(self, address: int, read: bool = False, write: bool = True):
+        """Watchpoint: `run()` si ferma dopo una lettura e/o scrittura della cella `address`."""
+        self._debug().watch(address, read, write)
+
+    def watch_accumulator(self, predicate: Callable[[int], bool]):
+        """`run()` si ferma dopo un'istruzione che porta l'accumulatore a soddisfare `predicate`."""
+        self._debug().watch_accumulator(predicate)
+
+    def clear_breakpoints(self, address: Optional[int] = None):
+        """Rimuove breakpoint e watchpoint di `address`, oppure tutti se None."""
+        if self.debugger is not None:
+            self.debugger.clear(address)
+
+    @property
+    def last_break(self) -> Optional[Hit]:
+        """Evento che ha fermato l'ultima esecuzione (None se non si è fermata su un breakpoint)."""
+        debug = self.debugger
+        return None if debug is None else debug.hit
+
     def step(self) -> bool:
         """Esegue una singola istruzione. Ritorna False se HALT, True altrimenti.
 
@@ -68,77 +511,473 @@ class LMC:
         - 6xx: BRA xx (branch always)
         - 7xx: BRZ xx (branch if zero: dipende solo da ACC==0)
         - 8xx: BRP xx (branch if positive/zero: dipende da flag negativo assente)
-        - 901: INP
-        - 902: OUT
+        - 901: INP (da input_queue, poi da input_source; vedi on_underflow)
+        - 902: OUT (su output_sink se presente, altrimenti su output_queue)
         - 000: HLT
         Tutti i valori 400..499 e altri non mappati: illegal instruction.
+        Con un profilo `isa` diverso i codici seguono la sua tabella (istruzione =
+        codice * celle + indirizzo), con in più LDI/STI se previste.
         """
         opcode = self._read_mem(self.pc)
-        next_pc = (self.pc + 1) % 100
+        next_pc = (self.pc + 1) % self.isa.cells
+        op, arg = self.isa.decode[opcode]
 
-        hundred = opcode // 100
-        arg = opcode % 100
-
-        if hundred == 0:
-            # HLT
+        if op == _HLT:
             return False
 
-    
-
-        if opcode == 901:
+        if op == _INP:
             # INP: non modifica il flag
-            if not self.input_queue:
-                raise InputUnderflowError("Coda di input vuota durante INP")
-            self.accumulator = self.input_queue.popleft()
+            if self.input_queue:
+                self.accumulator = self.input_queue.popleft()
+            else:
+                value = self._pull_input()
+                if value is None:
+                    return False
+                self.accumulator = value
             self.pc = next_pc
             return True
-        if opcode == 902:
-            # OUT
+        if op == _OUT:
             v = self._clamp(self.accumulator)
-            self.output_queue.append(v)
+            if self.output_sink is not None:
+                self.output_sink(v)
+            else:
+                self.output_queue.append(v)
             self.pc = next_pc
             return True
 
-        if hundred == 1:  # ADD
+        if op == _ADD:
             self._arith(self.accumulator + self._read_mem(arg))
             self.pc = next_pc
             return True
-        if hundred == 2:  # SUB
+        if op == _SUB:
             self._arith(self.accumulator - self._read_mem(arg))
             self.pc = next_pc
             return True
-        if hundred == 3:  # STA
+        if op == _STA:
             self._write_mem(arg, self._clamp(self.accumulator))
             self.pc = next_pc
             return True
-        if hundred == 5:  # LDA: non modifica il flag
+        if op == _LDA:  # non modifica il flag
             self.accumulator = self._read_mem(arg)
             self.pc = next_pc
             return True
-        if hundred == 6:  # BRA
+        if op == _BRA:
             self._jump(arg)
             return True
-        if hundred == 7:  # BRZ: salta se ACC==0 (ignora il flag)
+        if op == _BRZ:  # salta se ACC==0 (ignora il flag)
             if self._clamp(self.accumulator) == 0:
                 self._jump(arg)
             else:
                 self.pc = next_pc
             return True
-        if hundred == 8:  # BRP: salta se l'ultimo risultato non è negativo (flag==False)
+        if op == _BRP:  # salta se l'ultimo risultato non è negativo (flag==False)
             if not self.flag:
                 self._jump(arg)
             else:
                 self.pc = next_pc
             return True
+        if op == _LDI:  # indiretto: la cella arg contiene l'indirizzo da leggere
+            self.accumulator = self._read_mem(self._read_mem(arg))
+            self.pc = next_pc
+            return True
+        if op == _STI:
+            self._write_mem(self._read_mem(arg), self._clamp(self.accumulator))
+            self.pc = next_pc
+            return True
 
         # Se arriviamo qui: illegal instruction
         raise IllegalInstructionError(self.pc, opcode)
 
-    def run(self, max_steps: int = 10000):
-        """Esegue fino a HALT o fino a max_steps per evitare loop infiniti."""
+    def run(self, max_steps: int = 10000, detect_loops: bool = False):
+        """Esegue fino a HALT o fino a max_steps per evitare loop infiniti.
+
+        Se lo stato della macchina è valido (memoria di 100 interi 0..999 e pc 0..99)
+        usa l'interprete veloce `_run_fast` (`_run_isa` con un profilo non classico),
+        altrimenti ricade su `step()` in modo
+        che eventuali errori vengano sollevati esattamente come in esecuzione passo-passo.
+
+        Args:
+            max_steps: numero massimo di istruzioni da eseguire
+            detect_loops: se True, a ogni salto all'indietro lo stato completo viene
+                confrontato con quelli precedenti (Brent); se si ripete l'esecuzione si
+                ferma sul salto con `NonTerminationDetected`
+
+        Returns:
+            Numero di istruzioni eseguite (HLT esclusa)
+
+        Raises:
+            NonTerminationDetected: (solo con detect_loops) stato ripetuto
+        """
+        return self._execute_slice(max_steps, LoopDetector() if detect_loops else None)
+
+    def execute(
+        self,
+        max_steps: int = 10000,
+        time_limit: Optional[float] = None,
+        detect_loops: bool = False,
+    ) -> RunResult:
+        """Esegue come `run()` ma restituisce un `RunResult` invece di sollevare eccezioni.
+
+        Gli errori di esecuzione (input esaurito, istruzione illegale, ciclo infinito,
+        memoria non valida) diventano il motivo di arresto del risultato.
+
+        Args:
+            max_steps: numero massimo di istruzioni da eseguire
+            time_limit: opzionale, tempo massimo in secondi; controllato ogni
+                `TIME_CHECK_SLICE` istruzioni
+            detect_loops: come in `run()`
+
+        Returns:
+            RunResult con motivo di arresto, passi, stato finale e output (solo quelli
+            finiti in `output_queue`: con `output_sink` impostato `outputs` è vuota)
+        """
+        detector = LoopDetector() if detect_loops else None
+        start = time.perf_counter_ns()
+        deadline = None if time_limit is None else start + int(time_limit * 1e9)
+        out_start = len(self.output_queue)
         steps = 0
-        while steps < max_steps and self.step():
-            steps += 1
+        error = None
+        try:
+            if deadline is None:
+                steps = self._execute_slice(max_steps, detector)
+                reason = self._stop_reason(steps < max_steps)
+            else:
+                while True:
+                    chunk = min(max_steps - steps, TIME_CHECK_SLICE)
+                    n = self._execute_slice(chunk, detector)
+                    steps += n
+                    if detector is not None:
+                        # ogni fetta conta i passi da 0: il rilevatore vede passi cumulativi
+                        detector.offset = steps
+                    if n < chunk or self.last_break is not None:
+                        reason = self._stop_reason()
+                        break
+                    if steps >= max_steps:
+                        reason = STEP_LIMIT
+                        break
+                    if time.perf_counter_ns() >= deadline:
+                        reason = TIME_LIMIT
+                        break
+        except LMCError as e:
+            steps += self._steps
+            error = e
+            reason = next((r for cls, r in _ERROR_REASONS if isinstance(e, cls)), None)
+            if reason is None:
+                raise
+        wall = time.perf_counter_ns() - start
+        outq = self.output_queue
+        # una sola copia: islice salta gli output precedenti senza materializzarli
+        outputs = tuple(outq) if out_start == 0 else tuple(islice(outq, out_start, None))
+        return RunResult(reason, steps, self.pc, self.accumulator, self.flag, outputs, wall, error)
+
+    def _stop_reason(self, stopped_early: bool = True) -> str:
+        """Motivo di un arresto: breakpoint, budget esaurito, HLT oppure attesa di input."""
+        if self.last_break is not None:
+            return BREAKPOINT
+        if not stopped_early:
+            return STEP_LIMIT
+        if self._waiting and self.on_underflow == UNDERFLOW_BLOCK:
+            return INPUT_WAIT
+        return HALTED
+
+    def _pull_input(self) -> Optional[int]:
+        """Legge il prossimo valore da input_source quando input_queue è vuota.
+
+        Gli iterabili vengono convertiti in iteratore al primo utilizzo; un callable
+        che restituisce None indica che al momento non ci sono dati.
+
+        Returns:
+            Il valore letto, oppure None se la macchina deve fermarsi sull'INP
+            (on_underflow "block" o "halt")
+
+        Raises:
+            InputUnderflowError: se non c'è input e on_underflow è "raise"
+            ValueError: per un valore fuori range o una politica sconosciuta
+        """
+        src = self.input_source
+        value = None
+        if src is not None:
+            if callable(src):
+                value = src()
+            else:
+                if iter(src) is not src:
+                    src = self.input_source = iter(src)
+                value = next(src, None)
+        if value is None:
+            policy = self.on_underflow
+            if policy == UNDERFLOW_RAISE:
+                raise InputUnderflowError("Coda di input vuota durante INP")
+            if policy not in UNDERFLOW_POLICIES:
+                raise ValueError(f"Politica di underflow sconosciuta: {policy}")
+            self._waiting = True
+            return None
+        if not (0 <= value <= self.isa.max_value):
+            raise ValueError(f"Input fuori range: {value}")
+        self._pulled += 1
+        return value
+
+    def _input_position(self) -> int:
+        """Posizione nello stream di input, decrescente a ogni INP durante un'esecuzione."""
+        return len(self.input_queue) - self._pulled
+
+    def _execute_slice(self, max_steps: int, detector: Optional[LoopDetector]) -> int:
+        """Esegue al più max_steps istruzioni con il motore più veloce applicabile."""
+        self._waiting = False
+        debug = self.debugger
+        if debug is not None:
+            debug.hit = None
+            if debug.active and (self._fast_path_ok() or (self.isa is not CLASSIC and self._isa_path_ok())):
+                if self.profile is not None or self.trace is not None or self.coverage is not None:
+                    raise ValueError("debugger, profile, trace e coverage non possono essere attivi insieme")
+                return debug.run(self, max_steps, detector)
+        if self.coverage is not None and (self._fast_path_ok() or (self.isa is not CLASSIC and self._isa_path_ok())):
+            if self.profile is not None or self.trace is not None:
+                raise ValueError("coverage, profile e trace non possono essere attivi insieme")
+            return self.coverage.run(self, max_steps, detector)
+        if self._fast_path_ok():
+            if self.profile is not None:
+                if self.trace is not None:
+                    raise ValueError("profile e trace non possono essere attivi insieme")
+                return self.profile.run(self, max_steps, detector)
+            if self.trace is not None:
+                return self.trace.run(self, max_steps, detector)
+            return self._run_fast(max_steps, detector)
+        if self.isa is not CLASSIC and self._isa_path_ok():
+            if self.profile is not None or self.trace is not None:
+                raise ValueError("profile e trace richiedono il profilo ISA classico")
+            return self._run_isa(max_steps, detector)
+        return self._run_steps(max_steps, detector)
+
+    def _run_steps(self, max_steps: int, detector: Optional[LoopDetector] = None) -> int:
+        """Ciclo di riferimento: una chiamata a `step()` per istruzione."""
+        steps = 0
+        try:
+            while steps < max_steps:
+                if detector is not None:
+                    target = self._taken_backward_branch()
+                    if target is not None:
+                        detector.observe(target, self.accumulator, self.flag, self._input_position(), self._memory.cells, steps)
+                if not self.step():
+                    break
+                steps += 1
+        finally:
+            self._steps = steps
+        return steps
+
+    def _taken_backward_branch(self) -> Optional[int]:
+        """Destinazione dell'istruzione corrente se è un salto all'indietro che verrà preso."""
+        pc = self.pc
+        isa = self.isa
+        if type(pc) is not int or not (0 <= pc < isa.cells):
+            return None
+        word = self._memory.cells[pc]
+        if type(word) is not int or not (0 <= word < isa.modulus):
+            return None
+        op, arg = isa.decode[word]
+        if op not in (_BRA, _BRZ, _BRP) or arg > pc:
+            return None
+        if op == _BRA or (op == _BRZ and self._clamp(self.accumulator) == 0) or (op == _BRP and not self.flag):
+            return arg
+        return None
+
+    def _fast_path_ok(self) -> bool:
+        """Precondizioni dell'interprete veloce, verificate una volta prima del ciclo.
+
+        La memoria è valida per costruzione (`GuardedMemory`): basta controllarne la
+        geometria e il pc, senza scandire le celle.
+        """
+        pc = self.pc
+        return self.isa is CLASSIC and self._memory.isa is CLASSIC and type(pc) is int and 0 <= pc <= 99
+
+    def _run_fast(self, max_steps: int, detector: Optional[LoopDetector] = None) -> int:
+        """Interprete veloce equivalente a `step()` ripetuto.
+
+        Mantiene pc/acc/flag in variabili locali, decodifica tramite la tabella
+        precalcolata `_DECODE` e riscrive lo stato nei campi della dataclass
+        all'uscita (HLT, max_steps o eccezione). Le celle scritte da STA sono
+        sempre clampate, quindi la memoria resta valida senza ulteriori controlli.
+        Il rilevatore di cicli, se presente, viene consultato solo sui salti
+        all'indietro effettivamente presi, prima di eseguirli.
+        """
+        mem = self._memory.cells
+        decode = _DECODE
+        next_pc = _NEXT_PC
+        inq = self.input_queue
+        emit = self.output_sink or self.output_queue.append
+        pull = self._pull_input
+        cow = self._cow
+        pc = self.pc
+        acc = self.accumulator
+        flag = self.flag
+        steps = 0
+        try:
+            while steps < max_steps:
+                op, arg = decode[mem[pc]]
+                if op == _LDA:
+                    acc = mem[arg]
+                    pc = next_pc[pc]
+                elif op == _ADD:
+                    acc += mem[arg]
+                    flag = acc < 0
+                    acc %= 1000
+                    pc = next_pc[pc]
+                elif op == _STA:
+                    if cow:
+                        mem = self._unshare()
+                        cow = False
+                    mem[arg] = acc % 1000
+                    pc = next_pc[pc]
+                elif op == _SUB:
+                    acc -= mem[arg]
+                    flag = acc < 0
+                    acc %= 1000
+                    pc = next_pc[pc]
+                elif op == _BRZ:
+                    if acc % 1000 == 0:
+                        if detector is not None and arg <= pc:
+                            detector.observe(arg, acc, flag, len(inq) - self._pulled, mem, steps)
+                        pc = arg
+                    else:
+                        pc = next_pc[pc]
+                elif op == _BRP:
+                    if flag:
+                        pc = next_pc[pc]
+                    else:
+                        if detector is not None and arg <= pc:
+                            detector.observe(arg, acc, flag, len(inq) - self._pulled, mem, steps)
+                        pc = arg
+                elif op == _BRA:
+                    if detector is not None and arg <= pc:
+                        detector.observe(arg, acc, flag, len(inq) - self._pulled, mem, steps)
+                    pc = arg
+                elif op == _INP:
+                    if inq:
+                        acc = inq.popleft()
+                    else:
+                        value = pull()
+                        if value is None:
+                            break
+                        acc = value
+                    pc = next_pc[pc]
+                elif op == _OUT:
+                    emit(acc % 1000)
+                    pc = next_pc[pc]
+                elif op == _HLT:
+                    break
+                else:
+                    raise IllegalInstructionError(pc, mem[pc])
+                steps += 1
+        finally:
+            self.pc = pc
+            self.accumulator = acc
+            self.flag = flag
+            self._steps = steps
+        return steps
+
+    def _isa_path_ok(self) -> bool:
+        """Precondizioni di `_run_isa`: memoria della geometria e pc valido."""
+        pc = self.pc
+        isa = self.isa
+        return self._memory.isa is isa and type(pc) is int and 0 <= pc < isa.cells
+
+    def _run_isa(self, max_steps: int, detector: Optional[LoopDetector] = None) -> int:
+        """Interprete veloce per i profili non classici (memoria `array`).
+
+        Stessa struttura di `_run_fast`, con tabella di decodifica, successori del
+        pc e modulo presi da `isa`, più LDI/STI. Un puntatore indiretto fuori dalla
+        memoria solleva `MemoryErrorLMC` come in `step()`.
+        """
+        isa = self.isa
+        mod = isa.modulus
+        cells = isa.cells
+        mem = self._memory.cells
+        decode = isa.decode
+        next_pc = isa.next_pc
+        inq = self.input_queue
+        emit = self.output_sink or self.output_queue.append
+        pull = self._pull_input
+        cow = self._cow
+        pc = self.pc
+        acc = self.accumulator
+        flag = self.flag
+        steps = 0
+        try:
+            while steps < max_steps:
+                op, arg = decode[mem[pc]]
+                if op == _LDA:
+                    acc = mem[arg]
+                    pc = next_pc[pc]
+                elif op == _ADD:
+                    acc += mem[arg]
+                    flag = acc < 0
+                    acc %= mod
+                    pc = next_pc[pc]
+                elif op == _STA:
+                    if cow:
+                        mem = self._unshare()
+                        cow = False
+                    mem[arg] = acc % mod
+                    pc = next_pc[pc]
+                elif op == _SUB:
+                    acc -= mem[arg]
+                    flag = acc < 0
+                    acc %= mod
+                    pc = next_pc[pc]
+                elif op == _BRZ:
+                    if acc % mod == 0:
+                        if detector is not None and arg <= pc:
+                            detector.observe(arg, acc, flag, len(inq) - self._pulled, mem, steps)
+                        pc = arg
+                    else:
+                        pc = next_pc[pc]
+                elif op == _BRP:
+                    if flag:
+                        pc = next_pc[pc]
+                    else:
+                        if detector is not None and arg <= pc:
+                            detector.observe(arg, acc, flag, len(inq) - self._pulled, mem, steps)
+                        pc = arg
+                elif op == _BRA:
+                    if detector is not None and arg <= pc:
+                        detector.observe(arg, acc, flag, len(inq) - self._pulled, mem, steps)
+                    pc = arg
+                elif op == _LDI:
+                    ptr = mem[arg]
+                    if ptr >= cells:
+                        raise MemoryErrorLMC(f"Accesso memoria fuori range: {ptr}")
+                    acc = mem[ptr]
+                    pc = next_pc[pc]
+                elif op == _STI:
+                    ptr = mem[arg]
+                    if ptr >= cells:
+                        raise MemoryErrorLMC(f"Accesso memoria fuori range: {ptr}")
+                    if cow:
+                        mem = self._unshare()
+                        cow = False
+                    mem[ptr] = acc % mod
+                    pc = next_pc[pc]
+                elif op == _INP:
+                    if inq:
+                        acc = inq.popleft()
+                    else:
+                        value = pull()
+                        if value is None:
+                            break
+                        acc = value
+                    pc = next_pc[pc]
+                elif op == _OUT:
+                    emit(acc % mod)
+                    pc = next_pc[pc]
+                elif op == _HLT:
+                    break
+                else:
+                    raise IllegalInstructionError(pc, mem[pc])
+                steps += 1
+        finally:
+            self.pc = pc
+            self.accumulator = acc
+            self.flag = flag
+            self._steps = steps
         return steps
 
     # Helpers
@@ -159,17 +998,16 @@ class LMC:
         self.flag = value < 0
         self.accumulator = self._clamp(value)
 
-    @staticmethod
-    def _clamp(value: int) -> int:
-        """Applica modulo 1000 per mantenere valori nel range LMC.
+    def _clamp(self, value: int) -> int:
+        """Applica modulo 1000 (`isa.modulus`) per mantenere valori nel range LMC.
         
         Args:
             value: valore intero qualsiasi
             
         Returns:
-            Valore modulo 1000 (range 0-999)
+            Valore modulo 1000 (range 0-999 nel profilo classico)
         """
-        return value % 1000
+        return value % self.isa.modulus
 
     def _jump(self, addr: int):
         """Esegue un salto incondizionato del program counter.
@@ -183,28 +1021,27 @@ class LMC:
         Raises:
             MemoryErrorLMC: se addr fuori range 0-99
         """
-        if not (0 <= addr <= 99):
+        if not (0 <= addr < self.isa.cells):
             raise MemoryErrorLMC(f"Indirizzo di salto fuori range: {addr}")
         self.pc = addr
 
     def _read_mem(self, addr: int) -> int:
-        """Legge un valore dalla memoria con controlli di validità.
-        
+        """Legge un valore dalla memoria controllando solo l'indirizzo.
+
+        Il contenuto è già valido (`GuardedMemory` controlla le scritture).
+
         Args:
             addr: indirizzo memoria da leggere (0-99)
-            
+
         Returns:
             Valore contenuto nella cella di memoria (0-999)
-            
+
         Raises:
-            MemoryErrorLMC: se addr fuori range o contenuto memoria non valido
+            MemoryErrorLMC: se addr fuori range
         """
-        if not (0 <= addr <= 99):
+        if not (0 <= addr < self.isa.cells):
             raise MemoryErrorLMC(f"Accesso memoria fuori range: {addr}")
-        v = self.memory[addr]
-        if not (0 <= v <= 999):
-            raise MemoryErrorLMC(f"Valore in memoria fuori range in {addr}: {v}")
-        return v
+        return self._memory.cells[addr]
 
     def _write_mem(self, addr: int, value: int):
         """Scrive un valore in memoria con controlli di validità.
@@ -219,8 +1056,10 @@ class LMC:
         Raises:
             MemoryErrorLMC: se addr o value fuori range
         """
-        if not (0 <= addr <= 99):
+        if not (0 <= addr < self.isa.cells):
             raise MemoryErrorLMC(f"Accesso memoria fuori range: {addr}")
-        if not (0 <= value <= 999):
+        if not (0 <= value <= self.isa.max_value):
             raise MemoryErrorLMC(f"Scrittura fuori range: {value}")
-        self.memory[addr] = value
+        if self._cow:
+            self._unshare()
+        self._memory.cells[addr] = value
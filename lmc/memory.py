@@ -0,0 +1,126 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+from array import array
+from operator import eq
+from typing import Iterable, Iterator, List, Union
+
+from .exceptions import MemoryErrorLMC
+from .isa import CLASSIC, ISA, Memory
+
+
+def _check(values: List[int], isa: ISA):
+    """Solleva MemoryErrorLMC se `values` non è una memoria valida per `isa`."""
+    if len(values) != isa.cells:
+        raise MemoryErrorLMC(f"La memoria deve avere {isa.cells} celle")
+    # controllo in blocco; il ciclo solo per segnalare la cella errata
+    if values and set(map(type, values)) <= {int} and min(values) >= 0 and max(values) <= isa.max_value:
+        return
+    top = isa.max_value
+    for i, v in enumerate(values):
+        if type(v) is not int or not (0 <= v <= top):
+            raise MemoryErrorLMC(f"Valore memoria fuori range in cella {i}: {v}")
+
+
+class GuardedMemory:
+    """Memoria di una macchina: buffer delle celle con le scritture esterne validate.
+
+    Le celle stanno in `cells` (lista nel profilo classico, `array` tipizzato negli
+    altri, come restituito da `ISA.allocate`). Il contenuto è sempre valido, perché
+    le sole vie di scrittura sono controllate: `LMC.reset`, le istruzioni della
+    macchina (che scrivono valori già ridotti al modulo), l'assegnazione a
+    `machine.memory` e l'assegnazione di celle o fette attraverso questo oggetto.
+    Gli interpreti leggono quindi `cells` senza controlli per lettura né scansioni
+    della memoria prima di ogni `run()`.
+
+    Si comporta come una sequenza di lunghezza fissa: indicizzazione, fette (liste),
+    iterazione, `len` e confronto con liste, tuple e `array`.
+
+    Dopo `LMC.fork` ogni macchina ha la propria vista sullo stesso buffer, con
+    `shared` impostato: la prima scrittura (dall'esecuzione o da questa vista) copia
+    il buffer, così l'altra macchina non vede la modifica.
+
+    Attributes:
+        cells: buffer grezzo; va scritto solo da codice che ne mantiene la validità
+        isa: geometria per cui le celle sono state validate
+        shared: True se `cells` è condiviso con un'altra macchina (copy-on-write)
+    """
+
+    __slots__ = ("cells", "isa", "shared")
+
+    def __init__(self, cells: Memory, isa: ISA = CLASSIC, shared: bool = False):
+        self.cells = cells
+        self.isa = isa
+        self.shared = shared
+
+    @classmethod
+    def validated(cls, values: Iterable[int], isa: ISA = CLASSIC) -> "GuardedMemory":
+        """Copia e valida `values` per la geometria `isa`.
+
+        Raises:
+            MemoryErrorLMC: numero di celle errato o valore non intero o fuori range
+        """
+        values = values if type(values) is list else list(values)
+        _check(values, isa)
+        return cls(isa.allocate(values), isa)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.cells)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if type(index) is slice:
+            return list(self.cells[index])
+        return self.cells[index]
+
+    def __setitem__(self, index: Union[int, slice], value):
+        """Scrive una cella (o una fetta della stessa lunghezza) dopo averla validata.
+
+        Raises:
+            MemoryErrorLMC: valore non intero o fuori range, fetta di lunghezza diversa
+        """
+        cells = self.cells
+        top = self.isa.max_value
+        if self.shared:
+            cells = self.unshare()
+        if type(index) is slice:
+            targets = range(*index.indices(len(cells)))
+            values = list(value)
+            if len(values) != len(targets):
+                raise MemoryErrorLMC(f"La memoria ha {len(cells)} celle: la fetta deve avere {len(targets)} valori")
+            for i, v in zip(targets, values):
+                if type(v) is not int or not (0 <= v <= top):
+                    raise MemoryErrorLMC(f"Valore memoria fuori range in cella {i}: {v}")
+            for i, v in zip(targets, values):
+                cells[i] = v
+            return
+        if type(value) is not int or not (0 <= value <= top):
+            raise MemoryErrorLMC(f"Valore memoria fuori range in cella {index}: {value}")
+        cells[index] = value
+
+    def __eq__(self, other) -> bool:
+        cells = self.cells
+        if isinstance(other, GuardedMemory):
+            other = other.cells
+        if type(other) is type(cells):
+            return cells == other
+        if isinstance(other, (list, tuple, array)):
+            return len(cells) == len(other) and all(map(eq, cells, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self.cells))
+
+    def unshare(self) -> Memory:
+        """Copia il buffer condiviso dopo un fork (prima scrittura) e lo restituisce."""
+        cells = self.cells = self.cells[:]
+        self.shared = False
+        return cells
+
+    def tolist(self) -> List[int]:
+        """Copia delle celle come lista."""
+        return list(self.cells)
@@ -0,0 +1,240 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from .analysis import Analysis, analyze
+from .machine import LMC, STEP_LIMIT, RunResult, _DECODE, _NEXT_PC, _LDA, _ADD, _STA, _SUB, _BRZ, _BRP, _BRA, _INP, _OUT
+
+# Centinaia delle istruzioni con un indirizzo come argomento
+_ADDRESSED = {_ADD: 1, _SUB: 2, _STA: 3, _LDA: 5, _BRA: 6, _BRZ: 7, _BRP: 8}
+
+
+@dataclass(frozen=True)
+class OptimizationResult:
+    """Esito di `optimize`.
+
+    Attributes:
+        memory: nuova immagine di memoria (100 celle)
+        removed: celle originali eliminate perché ridondanti
+        retargeted: salti ridiretti saltando catene di salti
+        address_map: nuovo indirizzo di ogni cella originale (identità se nulla è stato spostato)
+    """
+
+    memory: List[int]
+    removed: Tuple[int, ...]
+    retargeted: int
+    address_map: Tuple[int, ...]
+
+    @property
+    def changed(self) -> bool:
+        """True se l'immagine è diversa dall'originale."""
+        return bool(self.removed or self.retargeted)
+
+
+def _read_cells(memory: Sequence[int], code: FrozenSet[int]) -> Set[int]:
+    """Celle usate come operando da istruzioni raggiungibili."""
+    cells = set()
+    for pc in code:
+        op, arg = _DECODE[memory[pc]]
+        if op in (_LDA, _ADD, _SUB, _STA):
+            cells.add(arg)
+    return cells
+
+
+def _thread_jumps(memory: List[int], info: Analysis, frozen: Set[int]) -> int:
+    """Ridirige i salti che arrivano su un BRA (o su un salto condizionato uguale).
+
+    Un salto condizionato preso arriva con accumulatore e flag invariati, quindi un
+    BRZ/BRP sullo stesso tipo di salto viene preso anch'esso.
+    """
+    count = 0
+    for pc in sorted(info.reachable - frozen):
+        op, arg = _DECODE[memory[pc]]
+        if op not in (_BRA, _BRZ, _BRP):
+            continue
+        target = arg
+        seen = {pc}
+        while target in info.reachable and target not in frozen and target not in seen:
+            seen.add(target)
+            t_op, t_arg = _DECODE[memory[target]]
+            if t_op == _BRA or (t_op == op and op != _BRA):
+                target = t_arg
+            else:
+                break
+        if target != arg:
+            memory[pc] = _ADDRESSED[op] * 100 + target
+            count += 1
+    return count
+
+
+def _redundant_cells(memory: Sequence[int], info: Analysis, entry: int) -> Set[int]:
+    """Istruzioni eliminabili nelle sequenze lineari del programma.
+
+    - `LDA X` quando l'accumulatore contiene già il valore di X (dopo `STA X` o un
+      `LDA X` precedente, con in mezzo solo OUT o STA);
+    - `LDA X` seguito da un altro `LDA` o da `INP` (valore mai usato);
+    - `BRA` alla cella successiva.
+
+    ADD/SUB non vengono mai eliminati: aggiornano il flag, che LDA lascia invariato.
+    """
+    succ = info.successors
+    preds: Dict[int, Set[int]] = {pc: set() for pc in info.reachable}
+    for pc, targets in succ.items():
+        for t in targets:
+            preds[t].add(pc)
+
+    def continues(pc: int) -> bool:
+        nxt = _NEXT_PC[pc]
+        return succ[pc] == {nxt} and preds[nxt] == {pc} and nxt != entry
+
+    heads = [pc for pc in sorted(info.reachable) if pc == entry or not any(continues(p) for p in preds[pc])]
+    removable = set()
+    for head in heads:
+        known: Set[int] = set()  # celle il cui contenuto è uguale all'accumulatore
+        pending: Optional[int] = None  # ultimo LDA il cui valore non è ancora stato usato
+        pc = head
+        for _ in range(100):
+            op, arg = _DECODE[memory[pc]]
+            if op == _LDA:
+                if arg in known:
+                    removable.add(pc)
+                else:
+                    if pending is not None:
+                        removable.add(pending)
+                    known = {arg}
+                    pending = pc
+            elif op == _INP:
+                if pending is not None:
+                    removable.add(pending)
+                known = set()
+                pending = None
+            elif op == _BRA and arg == _NEXT_PC[pc]:
+                removable.add(pc)
+            else:
+                # STA e OUT leggono l'accumulatore senza cambiarlo
+                pending = None
+                if op == _STA:
+                    known.add(arg)
+                elif op != _OUT:
+                    known = set()
+            if not continues(pc):
+                break
+            pc = _NEXT_PC[pc]
+    return removable
+
+
+def optimize(memory: Sequence[int], entry: int = 0) -> OptimizationResult:
+    """Ottimizzatore peephole per immagini di memoria assemblate.
+
+    Si usa tra `Assembler.assemble_source` e `LMC`. Le celle che possono essere
+    scritte da una STA o lette come dati non vengono mai riscritte. Prima si
+    accorciano le catene di salti; poi, se il programma non legge né modifica il
+    proprio codice e la cella 99 non viene eseguita (nessun wrap del pc), le
+    istruzioni ridondanti vengono eliminate compattando il codice e aggiornando
+    tutti gli indirizzi. Programmi non analizzabili (`unknown_code`) restano invariati.
+
+    Args:
+        memory: 100 celle 0..999
+        entry: cella di partenza
+
+    Returns:
+        OptimizationResult con la nuova immagine
+    """
+    mem = list(memory)
+    identity = tuple(range(100))
+    info = analyze(mem, entry)
+    if info.unknown_code:
+        return OptimizationResult(mem, (), 0, identity)
+    frozen = set(info.dynamic) | _read_cells(mem, info.reachable)
+    retargeted = _thread_jumps(mem, info, frozen)
+    if retargeted:
+        info = analyze(mem, entry)
+
+    code = info.reachable
+    if code & frozen or 99 in code:
+        return OptimizationResult(mem, (), retargeted, identity)
+    removed = _redundant_cells(mem, info, entry)
+    if not removed:
+        return OptimizationResult(mem, (), retargeted, identity)
+
+    kept = [c for c in range(100) if c not in removed]
+    address = [0] * 100
+    for new, old in enumerate(kept):
+        address[old] = new
+    # una cella eliminata equivale alla prima cella conservata che la segue
+    following = address[99]
+    for old in range(99, -1, -1):
+        if old in removed:
+            address[old] = following
+        else:
+            following = address[old]
+    out = []
+    for old in kept:
+        word = mem[old]
+        op, arg = _DECODE[word]
+        if old in code and op in _ADDRESSED:
+            word = _ADDRESSED[op] * 100 + address[arg]
+        out.append(word)
+    out.extend([0] * (100 - len(out)))
+    return OptimizationResult(out, tuple(sorted(removed)), retargeted, tuple(address))
+
+
+@dataclass(frozen=True)
+class Mismatch:
+    """Input su cui immagine originale e ottimizzata si comportano diversamente."""
+
+    inputs: Tuple[int, ...]
+    original: RunResult
+    optimized: RunResult
+
+
+def _run(memory: Sequence[int], inputs: Sequence[int], max_steps: int) -> RunResult:
+    machine = LMC()
+    machine.reset(memory=list(memory), inputs=list(inputs))
+    return machine.execute(max_steps)
+
+
+def differential_check(
+    original: Sequence[int],
+    optimized: Sequence[int],
+    samples: int = 200,
+    max_inputs: int = 8,
+    max_steps: int = 10000,
+    seed: int = 0,
+    inputs: Optional[Sequence[Sequence[int]]] = None,
+) -> List[Mismatch]:
+    """Confronta le due immagini su input campionati (verifica limitata, non una prova).
+
+    Per ogni sequenza di input entrambe le immagini vengono eseguite con lo stesso
+    budget; se l'originale termina (HLT o errore) l'ottimizzata deve terminare con
+    lo stesso motivo e gli stessi output. I casi in cui l'originale esaurisce il
+    budget non vengono confrontati, perché l'ottimizzata esegue meno istruzioni.
+
+    Args:
+        original: immagine di partenza
+        optimized: immagine prodotta da `optimize`
+        samples: sequenze di input casuali da provare
+        max_inputs: lunghezza massima di ogni sequenza casuale
+        max_steps: budget di istruzioni per esecuzione
+        seed: seme del generatore casuale (risultati riproducibili)
+        inputs: opzionale, sequenze di input da provare oltre a quelle casuali
+
+    Returns:
+        Lista delle discrepanze trovate (vuota se nessuna)
+    """
+    rng = random.Random(seed)
+    cases = [tuple(seq) for seq in inputs or ()]
+    for _ in range(samples):
+        cases.append(tuple(rng.randrange(1000) for _ in range(rng.randint(0, max_inputs))))
+    mismatches = []
+    for case in cases:
+        before = _run(original, case, max_steps)
+        if before.reason == STEP_LIMIT:
+            continue
+        after = _run(optimized, case, max_steps)
+        if after.reason != before.reason or after.outputs != before.outputs:
+            mismatches.append(Mismatch(case, before, after))
+    return mismatches
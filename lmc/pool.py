@@ -0,0 +1,157 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Sequence, Union
+
+from .machine import LMC, UNDERFLOW_RAISE, RunResult, TrustedImage
+
+Image = Union[TrustedImage, Sequence[int]]
+
+
+class LMCPool:
+    """Pool thread-safe di macchine LMC riutilizzabili.
+
+    Le macchine vengono create al bisogno fino a `size` e poi riciclate: al prelievo
+    vengono reinizializzate sul posto (memoria copiata a fetta da una `TrustedImage`,
+    code svuotate), quindi una richiesta non alloca né ricontrolla la memoria. Se
+    tutte le macchine sono in uso `acquire` attende che una venga restituita.
+    Le macchine libere sono riusate in ordine LIFO, così restano "calde" in cache.
+
+    Args:
+        size: numero massimo di macchine
+        factory: costruttore delle macchine (es. `CompiledLMC` o `lambda: LMC(isa=WIDE)`)
+
+    Attributes:
+        created: macchine create finora
+    """
+
+    def __init__(self, size: int = 8, factory: Callable[[], LMC] = LMC):
+        if size < 1:
+            raise ValueError("La dimensione del pool deve essere almeno 1")
+        self.size = size
+        self.factory = factory
+        self.created = 0
+        self._free: List[LMC] = []
+        self._busy: set = set()
+        # Lock semplice per i percorsi senza attesa, Condition sullo stesso lock solo per chi aspetta
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._waiters = 0
+
+    @property
+    def available(self) -> int:
+        """Macchine prelevabili senza attesa (libere o ancora da creare)."""
+        with self._lock:
+            return len(self._free) + self.size - self.created
+
+    def acquire(self, image: Optional[Image] = None, inputs: Optional[Sequence[int]] = None, timeout: Optional[float] = None) -> LMC:
+        """Preleva una macchina e la reinizializza.
+
+        Args:
+            image: opzionale, memoria da caricare (`TrustedImage` per saltare la validazione);
+                se None la memoria viene azzerata, mai lasciata al prestito precedente
+            inputs: opzionale, coda di input
+            timeout: attesa massima in secondi se il pool è esaurito (None = senza limite)
+
+        Returns:
+            Macchina pronta all'esecuzione, da restituire con `release`
+
+        Raises:
+            TimeoutError: nessuna macchina disponibile entro `timeout`
+            MemoryErrorLMC, ValueError: immagine o input non validi (la macchina torna nel pool)
+        """
+        with self._lock:
+            while not self._free and self.created >= self.size:
+                self._waiters += 1
+                try:
+                    ready = self._cond.wait(timeout)
+                finally:
+                    self._waiters -= 1
+                if not ready:
+                    raise TimeoutError(f"Nessuna macchina libera nel pool entro {timeout} s")
+            if self._free:
+                machine = self._free.pop()
+                self._busy.add(id(machine))
+            else:
+                # posto riservato: la macchina viene creata fuori dal lock
+                self.created += 1
+                machine = None
+        if machine is None:
+            try:
+                machine = self.factory()
+            except BaseException:
+                with self._lock:
+                    self.created -= 1
+                    if self._waiters:
+                        self._cond.notify()
+                raise
+            with self._lock:
+                self._busy.add(id(machine))
+        try:
+            if image is None:
+                machine.memory = machine.isa.allocate()
+            machine.reset(memory=image, inputs=inputs)
+        except BaseException:
+            self.release(machine)
+            raise
+        return machine
+
+    def release(self, machine: LMC):
+        """Restituisce una macchina prelevata con `acquire`.
+
+        Sorgenti e destinazioni di I/O, profilazione, traccia, debugger e copertura vengono scollegati,
+        così il pool non trattiene riferimenti della richiesta precedente.
+
+        Raises:
+            ValueError: se la macchina non è in prestito da questo pool
+        """
+        with self._lock:
+            key = id(machine)
+            if key not in self._busy:
+                # una macchina estranea (o già restituita) non va toccata
+                raise ValueError("Macchina non prelevata da questo pool")
+            machine.input_source = None
+            machine.output_sink = None
+            machine.profile = None
+            machine.trace = None
+            machine.debugger = None
+            machine.coverage = None
+            machine.on_underflow = UNDERFLOW_RAISE
+            self._busy.discard(key)
+            self._free.append(machine)
+            if self._waiters:
+                self._cond.notify()
+
+    @contextmanager
+    def machine(self, image: Optional[Image] = None, inputs: Optional[Sequence[int]] = None, timeout: Optional[float] = None) -> Iterator[LMC]:
+        """Context manager: `acquire` all'ingresso, `release` all'uscita (anche in caso di errore)."""
+        m = self.acquire(image, inputs, timeout)
+        try:
+            yield m
+        finally:
+            self.release(m)
+
+    def execute(
+        self,
+        image: Image,
+        inputs: Optional[Sequence[int]] = None,
+        max_steps: int = 10000,
+        time_limit: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> RunResult:
+        """Esegue un programma su una macchina del pool (vedi `LMC.execute`).
+
+        Args:
+            image: memoria del programma (meglio una `TrustedImage` riusata tra le richieste)
+            inputs: opzionale, coda di input
+            max_steps: budget di istruzioni
+            time_limit: opzionale, tempo massimo di esecuzione in secondi
+            timeout: attesa massima per una macchina libera
+
+        Returns:
+            RunResult dell'esecuzione
+        """
+        with self.machine(image, inputs, timeout) as m:
+            return m.execute(max_steps, time_limit)
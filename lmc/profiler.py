@@ -0,0 +1,237 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence
+
+from .exceptions import IllegalInstructionError
+from .machine import (
+    LMC,
+    LoopDetector,
+    _DECODE,
+    _NEXT_PC,
+    _LDA,
+    _ADD,
+    _STA,
+    _SUB,
+    _BRZ,
+    _BRP,
+    _BRA,
+    _INP,
+    _OUT,
+    _HLT,
+)
+
+# Nomi delle classi di opcode, indicizzati dai codici interni di `lmc.machine`
+OPCODE_NAMES = {
+    _LDA: "LDA",
+    _ADD: "ADD",
+    _STA: "STA",
+    _SUB: "SUB",
+    _BRZ: "BRZ",
+    _BRP: "BRP",
+    _BRA: "BRA",
+    _INP: "INP",
+    _OUT: "OUT",
+}
+
+
+class Profile:
+    """Contatori di profilazione di una o più esecuzioni.
+
+    Tutti i contatori sono liste preallocate: durante l'esecuzione si fanno solo
+    incrementi. Si attiva assegnando l'istanza a `LMC.profile`; con `profile=None`
+    `run()` usa l'interprete normale e non paga nulla.
+
+    Attributes:
+        hits: esecuzioni per indirizzo
+        opcodes: esecuzioni per classe di opcode (indice = codice interno)
+        taken, not_taken: esiti dei salti condizionati BRZ/BRP per indirizzo
+        reads, writes: letture (ADD/SUB/LDA) e scritture (STA) per cella
+        steps: istruzioni totali profilate
+    """
+
+    __slots__ = ("hits", "opcodes", "taken", "not_taken", "reads", "writes", "steps")
+
+    def __init__(self):
+        self.hits = [0] * 100
+        self.opcodes = [0] * _HLT
+        self.taken = [0] * 100
+        self.not_taken = [0] * 100
+        self.reads = [0] * 100
+        self.writes = [0] * 100
+        self.steps = 0
+
+    def reset(self):
+        """Azzera tutti i contatori senza riallocarli."""
+        for counters in (self.hits, self.opcodes, self.taken, self.not_taken, self.reads, self.writes):
+            counters[:] = [0] * len(counters)
+        self.steps = 0
+
+    def opcode_histogram(self) -> Dict[str, int]:
+        """Esecuzioni per mnemonico (solo quelli eseguiti almeno una volta)."""
+        return {name: self.opcodes[code] for code, name in OPCODE_NAMES.items() if self.opcodes[code]}
+
+    def hot_loops(self, memory: Sequence[int]) -> List[dict]:
+        """Cicli individuati dai salti all'indietro presi, ordinati per istruzioni eseguite.
+
+        Il corpo di un ciclo è l'intervallo [destinazione, salto].
+
+        Returns:
+            Lista di dict con start, end, iterations e steps (istruzioni nel corpo)
+        """
+        loops = []
+        for addr in range(100):
+            word = memory[addr]
+            op, target = _DECODE[word] if 0 <= word <= 999 else (None, 0)
+            if op not in (_BRA, _BRZ, _BRP) or target > addr:
+                continue
+            iterations = self.hits[addr] if op == _BRA else self.taken[addr]
+            if iterations:
+                body = sum(self.hits[target:addr + 1])
+                loops.append({"start": target, "end": addr, "iterations": iterations, "steps": body})
+        loops.sort(key=lambda loop: loop["steps"], reverse=True)
+        return loops
+
+    def report(
+        self,
+        memory: Sequence[int],
+        labels: Optional[Dict[str, int]] = None,
+        lines: Optional[Sequence[int]] = None,
+        source: Optional[str] = None,
+        top: int = 10,
+    ) -> str:
+        """Report testuale riportato alle etichette e alle righe del sorgente.
+
+        Args:
+            memory: immagine di memoria usata per decodificare le istruzioni
+            labels: opzionale, etichette -> indirizzo (da `Assembler.assemble_program`)
+            lines: opzionale, riga sorgente per cella
+            source: opzionale, testo sorgente per mostrare le righe
+            top: numero di celle più eseguite da mostrare
+
+        Returns:
+            Report multi-riga
+        """
+        names = {addr: name for name, addr in (labels or {}).items()}
+        src_lines = source.splitlines() if source is not None else []
+
+        def where(addr: int) -> str:
+            label = names.get(addr, "")
+            line = lines[addr] if lines else 0
+            text = src_lines[line - 1].split("//", 1)[0].strip() if 0 < line <= len(src_lines) else ""
+            loc = f"L{line}" if line else ""
+            return f"{addr:02d} {label:<10} {loc:<5} {text}".rstrip()
+
+        total = self.steps or 1
+        out = [f"Istruzioni eseguite: {self.steps}", "", "Per opcode:"]
+        for name, count in sorted(self.opcode_histogram().items(), key=lambda kv: -kv[1]):
+            out.append(f"  {name:<4} {count:>10} {100 * count / total:6.1f}%")
+
+        out += ["", f"Celle più eseguite (top {top}):"]
+        ranked = sorted((a for a in range(100) if self.hits[a]), key=lambda a: -self.hits[a])[:top]
+        for addr in ranked:
+            out.append(f"  {self.hits[addr]:>10} {100 * self.hits[addr] / total:6.1f}%  {where(addr)}")
+
+        branches = [a for a in range(100) if self.taken[a] or self.not_taken[a]]
+        if branches:
+            out += ["", "Salti condizionati (preso / non preso):"]
+            for addr in branches:
+                out.append(f"  {self.taken[addr]:>10} / {self.not_taken[addr]:<10} {where(addr)}")
+
+        cells = [a for a in range(100) if self.reads[a] or self.writes[a]]
+        if cells:
+            out += ["", "Accessi ai dati (letture / scritture):"]
+            for addr in cells:
+                out.append(f"  {self.reads[addr]:>10} / {self.writes[addr]:<10} {where(addr)}")
+
+        loops = self.hot_loops(memory)
+        if loops:
+            out += ["", "Cicli caldi:"]
+            for loop in loops[:top]:
+                head = names.get(loop["start"], "")
+                out.append(
+                    f"  {loop['start']:02d}-{loop['end']:02d} {head:<10} iterazioni {loop['iterations']:>8}  "
+                    f"istruzioni {loop['steps']:>10} ({100 * loop['steps'] / total:.1f}%)"
+                )
+        return "\n".join(out)
+
+    def run(self, machine: LMC, max_steps: int, detector: Optional[LoopDetector] = None) -> int:
+        """Interprete strumentato: come `LMC._run_fast` ma aggiorna i contatori.
+
+        Viene chiamato da `LMC._execute_slice` quando `machine.profile` è impostato.
+        """
+        mem = machine._memory.cells
+        decode = _DECODE
+        next_pc = _NEXT_PC
+        inq = machine.input_queue
+        emit = machine.output_sink or machine.output_queue.append
+        pull = machine._pull_input
+        cow = machine._cow
+        hits = self.hits
+        opcodes = self.opcodes
+        taken = self.taken
+        not_taken = self.not_taken
+        reads = self.reads
+        writes = self.writes
+        pc = machine.pc
+        acc = machine.accumulator
+        flag = machine.flag
+        steps = 0
+        try:
+            while steps < max_steps:
+                op, arg = decode[mem[pc]]
+                if op == _HLT:
+                    break
+                if op == _LDA:
+                    acc = mem[arg]
+                    reads[arg] += 1
+                    new_pc = next_pc[pc]
+                elif op == _ADD or op == _SUB:
+                    acc = acc + mem[arg] if op == _ADD else acc - mem[arg]
+                    flag = acc < 0
+                    acc %= 1000
+                    reads[arg] += 1
+                    new_pc = next_pc[pc]
+                elif op == _STA:
+                    if cow:
+                        mem = machine._unshare()
+                        cow = False
+                    mem[arg] = acc % 1000
+                    writes[arg] += 1
+                    new_pc = next_pc[pc]
+                elif op == _BRA or op == _BRZ or op == _BRP:
+                    if op == _BRA or (acc % 1000 == 0 if op == _BRZ else not flag):
+                        if detector is not None and arg <= pc:
+                            detector.observe(arg, acc, flag, len(inq) - machine._pulled, mem, steps)
+                        if op != _BRA:
+                            taken[pc] += 1
+                        new_pc = arg
+                    else:
+                        not_taken[pc] += 1
+                        new_pc = next_pc[pc]
+                elif op == _INP:
+                    if inq:
+                        acc = inq.popleft()
+                    else:
+                        value = pull()
+                        if value is None:
+                            break
+                        acc = value
+                    new_pc = next_pc[pc]
+                elif op == _OUT:
+                    emit(acc % 1000)
+                    new_pc = next_pc[pc]
+                else:
+                    raise IllegalInstructionError(pc, mem[pc])
+                hits[pc] += 1
+                opcodes[op] += 1
+                pc = new_pc
+                steps += 1
+        finally:
+            machine.pc = pc
+            machine.accumulator = acc
+            machine.flag = flag
+            machine._steps = steps
+            self.steps += steps
+        return steps
+
@@ -0,0 +1,175 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import struct
+import sys
+from array import array
+from typing import List, NamedTuple, Sequence, Tuple, Union
+
+# Protocollo binario del server di sessione (`lmc.server`). Solo libreria standard:
+# il client non importa assembler e simulatore.
+#
+# Trama: <I> lunghezza del corpo, poi il corpo (interi little-endian).
+# Richiesta: <B> operazione, poi i suoi campi:
+#   ASSEMBLE    <B> len profilo, profilo ascii, sorgente utf-8
+#   RUN         chiave (32 byte), <II> passi, limite di tempo in ms, input uint32
+#   RUN_SOURCE  <II> passi, ms, <B> len profilo, profilo, <I> len sorgente, sorgente, input uint32
+#   OPEN        chiave, input uint32
+#   STEP        <III> sessione, passi, ms, input uint32 da accodare prima di eseguire
+#   INSPECT     <I> sessione
+#   CLOSE       <I> sessione
+#   STATS       nessun campo
+# Passi e ms a 0 = limiti predefiniti del server (valori più alti vengono ridotti ai limiti).
+# Risposta: <B> stato, poi i dati dell'operazione (OK) o un messaggio utf-8 (gli altri stati):
+#   ASSEMBLE    chiave del programma (SHA-256 di profilo e sorgente normalizzato)
+#   RUN, RUN_SOURCE, STEP  esito (vedi `_RESULT`), motivo ascii, <H> len errore, errore, output uint32
+#   OPEN        <I> sessione
+#   INSPECT     stato (vedi `_STATE`), poi le celle di memoria uint32
+#   STATS       contatori (vedi `_STATS`)
+OP_ASSEMBLE = 1
+OP_RUN = 2
+OP_RUN_SOURCE = 3
+OP_OPEN = 4
+OP_STEP = 5
+OP_INSPECT = 6
+OP_CLOSE = 7
+OP_STATS = 8
+
+STATUS_OK = 0
+STATUS_ERROR = 1    # richiesta non valida o programma/sessione sconosciuti
+STATUS_BUSY = 2     # coda piena: la richiesta non è stata eseguita
+STATUS_INVALID = 3  # sorgente con errori di assemblaggio
+
+DEFAULT_PORT = 47100
+KEY_SIZE = 32
+
+LENGTH = struct.Struct("<I")
+_RUN = struct.Struct("<32sII")
+_RUN_SOURCE = struct.Struct("<IIB")
+_STEP = struct.Struct("<III")
+_SESSION = struct.Struct("<I")
+# passi, pc, accumulatore, flag, durata in ns, len motivo
+_RESULT = struct.Struct("<QIIBQB")
+_ERROR_LEN = struct.Struct("<H")
+# pc, accumulatore, flag, passi eseguiti nella sessione, input in coda
+_STATE = struct.Struct("<IIBQI")
+# richieste, rifiutate per coda piena, cache: hit, miss, programmi; sessioni aperte
+_STATS = struct.Struct("<QQQQII")
+
+_LITTLE = sys.byteorder == "little"
+
+
+class RunReply(NamedTuple):
+    """Esito di RUN, RUN_SOURCE o STEP (i campi di `lmc.machine.RunResult`).
+
+    Attributes:
+        error: messaggio dell'errore che ha fermato la macchina ("" se nessuno)
+    """
+
+    reason: str
+    steps: int
+    pc: int
+    accumulator: int
+    flag: bool
+    outputs: Tuple[int, ...]
+    wall_ns: int
+    error: str
+
+    @property
+    def halted(self) -> bool:
+        """True se la macchina ha raggiunto HLT."""
+        return self.reason == "halted"
+
+
+class SessionState(NamedTuple):
+    """Stato di una sessione restituito da INSPECT."""
+
+    pc: int
+    accumulator: int
+    flag: bool
+    steps: int
+    pending_inputs: int
+    memory: List[int]
+
+
+def pack_words(values: Sequence[int]) -> bytes:
+    """Interi 0..2**32-1 come uint32 little-endian.
+
+    Raises:
+        ValueError: valore negativo o troppo grande
+    """
+    try:
+        words = array("I", values)
+    except OverflowError:
+        raise ValueError("Valori fuori range per il protocollo (0..4294967295)") from None
+    if not _LITTLE:
+        words.byteswap()
+    return words.tobytes()
+
+
+def unpack_words(data: Union[bytes, memoryview]) -> List[int]:
+    """Inverso di `pack_words`.
+
+    Raises:
+        ValueError: lunghezza non multipla di 4
+    """
+    if len(data) % 4:
+        raise ValueError("Lista di interi troncata")
+    words = array("I")
+    words.frombytes(data)
+    if not _LITTLE:
+        words.byteswap()
+    return words.tolist()
+
+
+def frame(body: bytes) -> bytes:
+    """Trama con il prefisso di lunghezza."""
+    return LENGTH.pack(len(body)) + body
+
+
+def encode_result(reason: str, steps: int, pc: int, acc: int, flag: bool, wall_ns: int, error: str, outputs: Sequence[int]) -> bytes:
+    """Corpo di una risposta OK a RUN, RUN_SOURCE o STEP (senza il byte di stato)."""
+    raw_reason = reason.encode("ascii")
+    raw_error = error.encode("utf-8")[:0xFFFF]
+    return b"".join([
+        _RESULT.pack(steps, pc, acc, flag, wall_ns, len(raw_reason)),
+        raw_reason,
+        _ERROR_LEN.pack(len(raw_error)),
+        raw_error,
+        pack_words(outputs),
+    ])
+
+
+def decode_result(data: memoryview) -> RunReply:
+    """Inverso di `encode_result`."""
+    steps, pc, acc, flag, wall_ns, n = _RESULT.unpack_from(data)
+    pos = _RESULT.size
+    reason = bytes(data[pos:pos + n]).decode("ascii")
+    pos += n
+    (n,) = _ERROR_LEN.unpack_from(data, pos)
+    pos += _ERROR_LEN.size
+    error = bytes(data[pos:pos + n]).decode("utf-8")
+    outputs = tuple(unpack_words(data[pos + n:]))
+    return RunReply(reason, steps, pc, acc, bool(flag), outputs, wall_ns, error)
+
+
+def encode_state(pc: int, acc: int, flag: bool, steps: int, pending: int, memory: Sequence[int]) -> bytes:
+    """Corpo di una risposta OK a INSPECT."""
+    return _STATE.pack(pc, acc, flag, steps, pending) + pack_words(memory)
+
+
+def decode_state(data: memoryview) -> SessionState:
+    """Inverso di `encode_state`."""
+    pc, acc, flag, steps, pending = _STATE.unpack_from(data)
+    return SessionState(pc, acc, bool(flag), steps, pending, unpack_words(data[_STATE.size:]))
+
+
+def encode_stats(requests: int, busy: int, hits: int, misses: int, programs: int, sessions: int) -> bytes:
+    """Corpo di una risposta OK a STATS."""
+    return _STATS.pack(requests, busy, hits, misses, programs, sessions)
+
+
+def decode_stats(data: memoryview) -> dict:
+    """Inverso di `encode_stats`, come dizionario."""
+    names = ("requests", "busy", "hits", "misses", "programs", "sessions")
+    return dict(zip(names, _STATS.unpack_from(data)))
@@ -0,0 +1,417 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import asyncio
+import os
+import socket
+import stat
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from .assembler import Assembler
+from .cache import source_key
+from .exceptions import AssemblerError, LMCError, ServerError
+from .isa import ISA, PROFILES
+from .machine import LMC, UNDERFLOW_BLOCK, RunResult, TrustedImage
+from .pool import LMCPool
+from .protocol import (
+    KEY_SIZE,
+    LENGTH,
+    OP_ASSEMBLE,
+    OP_CLOSE,
+    OP_INSPECT,
+    OP_OPEN,
+    OP_RUN,
+    OP_RUN_SOURCE,
+    OP_STATS,
+    OP_STEP,
+    STATUS_BUSY,
+    STATUS_ERROR,
+    STATUS_INVALID,
+    STATUS_OK,
+    _RUN,
+    _RUN_SOURCE,
+    _SESSION,
+    _STEP,
+    encode_result,
+    encode_state,
+    encode_stats,
+    frame,
+    unpack_words,
+)
+
+Address = Union[str, Tuple[str, int]]
+
+
+def program_key(source: str, isa: ISA) -> bytes:
+    """Chiave di un programma: `lmc.cache.source_key` (profilo e sorgente) in binario."""
+    return bytes.fromhex(source_key(source, isa))
+
+
+class _Busy(Exception):
+    """Coda dei worker piena (diventa una risposta BUSY)."""
+
+
+class _Session:
+    """Macchina di una sessione interattiva: INP senza input sospende invece di fallire."""
+
+    __slots__ = ("machine", "steps")
+
+    def __init__(self, image: TrustedImage, inputs: Sequence[int]):
+        self.machine = LMC(isa=image.isa, on_underflow=UNDERFLOW_BLOCK)
+        self.machine.reset(memory=image, inputs=inputs)
+        self.steps = 0
+
+
+def _assemble(source: str, isa: ISA) -> TrustedImage:
+    return TrustedImage.from_memory(Assembler(isa).assemble_source(source), isa)
+
+
+def _result_body(res: RunResult) -> bytes:
+    error = "" if res.error is None else str(res.error)
+    return encode_result(res.reason, res.steps, res.pc, res.accumulator, res.flag, res.wall_ns, error, res.outputs)
+
+
+class LMCServer:
+    """Server di sessione locale: assembla ed esegue programmi per client che restano connessi.
+
+    Parla il protocollo binario a trame di `lmc.protocol` su un socket Unix (`path`)
+    o TCP su localhost. Il processo resta attivo, quindi un'esecuzione costa un giro
+    sul socket invece dell'avvio di Python e di `import lmc`. Le connessioni sono
+    servite da un loop asyncio; assemblaggi, esecuzioni e passi di sessione girano su
+    `workers` thread con macchine riciclate da un `LMCPool` per profilo. Le richieste
+    in esecuzione o in coda sono al massimo `workers + queue_size`: oltre, il server
+    risponde subito BUSY (backpressure) invece di accodare senza limite. Ogni
+    connessione invia la risposta prima di leggere la richiesta successiva, quindi un
+    client troppo veloce viene rallentato dal socket stesso.
+
+    I programmi assemblati restano in una LRU indicizzata per `program_key`, come
+    `TrustedImage` già validate; le sessioni (OPEN/STEP/INSPECT/CLOSE) appartengono
+    alla connessione e vengono chiuse con essa.
+
+    Args:
+        path: opzionale, percorso del socket Unix (se None, TCP su `host:port`)
+        host: indirizzo TCP
+        port: porta TCP (0 = scelta dal sistema, vedi `address`)
+        workers: thread di esecuzione
+        queue_size: richieste in attesa di un worker oltre a quelle in esecuzione
+        max_steps: limite (e valore predefinito) di istruzioni per richiesta
+        time_limit: limite (e valore predefinito) di tempo di esecuzione per richiesta, in secondi
+        cache_size: programmi assemblati tenuti in memoria
+        max_sessions: sessioni aperte per connessione
+        max_frame: dimensione massima di una richiesta in byte
+
+    Attributes:
+        address: indirizzo in ascolto (percorso o (host, porta)), noto dopo l'avvio
+        requests, busy, hits, misses: contatori (vedi `stats`)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        workers: int = 4,
+        queue_size: int = 64,
+        max_steps: int = 1_000_000,
+        time_limit: float = 1.0,
+        cache_size: int = 1024,
+        max_sessions: int = 64,
+        max_frame: int = 1 << 20,
+    ):
+        if workers < 1 or queue_size < 0:
+            raise ValueError("Servono almeno un worker e una coda non negativa")
+        self.path = path
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_steps = max_steps
+        self.time_limit = time_limit
+        self.cache_size = cache_size
+        self.max_sessions = max_sessions
+        self.max_frame = max_frame
+        self.address: Optional[Address] = None
+        self.requests = 0
+        self.busy = 0
+        self.hits = 0
+        self.misses = 0
+        self._programs: "OrderedDict[bytes, TrustedImage]" = OrderedDict()
+        self._pools: Dict[str, LMCPool] = {}
+        self._sessions = 0
+        self._inflight = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._writers: set = set()
+
+    # avvio e arresto
+    def serve_forever(self):
+        """Avvia il server nel thread corrente e lo serve fino a `close` (o KeyboardInterrupt)."""
+        asyncio.run(self._serve())
+
+    def start(self) -> "LMCServer":
+        """Avvia il server in un thread in background e ritorna quando è in ascolto."""
+        ready = threading.Event()
+        errors = []
+
+        def main():
+            try:
+                asyncio.run(self._serve(ready))
+            except BaseException as e:
+                errors.append(e)
+                ready.set()
+
+        self._thread = threading.Thread(target=main, name="lmc-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def close(self):
+        """Ferma il server (le connessioni aperte vengono chiuse) e attende il thread di `start`."""
+        loop, stop = self._loop, self._stop
+        if loop is not None and stop is not None:
+            try:
+                loop.call_soon_threadsafe(stop.set)
+            except RuntimeError:
+                pass  # loop già chiuso
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "LMCServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def _serve(self, ready: Optional[threading.Event] = None):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="lmc-worker")
+        try:
+            if self.path is not None:
+                _remove_stale_socket(self.path)
+                server = await asyncio.start_unix_server(self._handle, path=self.path)
+                self.address = self.path
+            else:
+                server = await asyncio.start_server(self._handle, self.host, self.port)
+                self.address = server.sockets[0].getsockname()[:2]
+            async with server:
+                if ready is not None:
+                    ready.set()
+                await self._stop.wait()
+                for writer in list(self._writers):
+                    writer.close()
+        finally:
+            self._executor.shutdown(wait=True)
+            if self.path is not None and self.address is not None:
+                try:
+                    os.unlink(self.path)
+                except OSError:
+                    pass
+
+    # connessioni
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        sessions: Dict[int, _Session] = {}
+        next_id = [1]
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(LENGTH.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (size,) = LENGTH.unpack(header)
+                if not 0 < size <= self.max_frame:
+                    writer.write(frame(bytes([STATUS_ERROR]) + f"Trama di {size} byte non valida".encode("utf-8")))
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(size)
+                self.requests += 1
+                writer.write(frame(await self._reply(memoryview(body), sessions, next_id)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._sessions -= len(sessions)
+            sessions.clear()
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _reply(self, body: memoryview, sessions: Dict[int, _Session], next_id: list) -> bytes:
+        """Esegue una richiesta e restituisce il corpo della risposta (stato incluso)."""
+        try:
+            return bytes([STATUS_OK]) + await self._dispatch(body, sessions, next_id)
+        except _Busy:
+            self.busy += 1
+            message = "Server occupato: coda delle richieste piena"
+            status = STATUS_BUSY
+        except AssemblerError as e:
+            message = str(e)
+            status = STATUS_INVALID
+        except (ServerError, LMCError, ValueError) as e:
+            message = str(e)
+            status = STATUS_ERROR
+        except (struct.error, UnicodeDecodeError, IndexError):
+            message = "Richiesta malformata"
+            status = STATUS_ERROR
+        return bytes([status]) + message.encode("utf-8")
+
+    async def _dispatch(self, body: memoryview, sessions: Dict[int, _Session], next_id: list) -> bytes:
+        op = body[0]
+        data = body[1:]
+        if op == OP_RUN:
+            key, steps, ms = _RUN.unpack_from(data)
+            image = self._program(key)
+            inputs = unpack_words(data[_RUN.size:])
+            return await self._offload(self._run, image, inputs, steps, ms)
+        if op == OP_RUN_SOURCE:
+            steps, ms, n = _RUN_SOURCE.unpack_from(data)
+            pos = _RUN_SOURCE.size
+            isa = _profile(bytes(data[pos:pos + n]))
+            (length,) = LENGTH.unpack_from(data, pos + n)
+            pos += n + LENGTH.size
+            source = bytes(data[pos:pos + length]).decode("utf-8")
+            inputs = unpack_words(data[pos + length:])
+            key = program_key(source, isa)
+            image = self._cached(key)
+            if image is None:
+                image = await self._offload(_assemble, source, isa)
+                self._remember(key, image)
+            return await self._offload(self._run, image, inputs, steps, ms)
+        if op == OP_ASSEMBLE:
+            n = data[0]
+            isa = _profile(bytes(data[1:1 + n]))
+            source = bytes(data[1 + n:]).decode("utf-8")
+            key = program_key(source, isa)
+            if self._cached(key) is None:
+                self._remember(key, await self._offload(_assemble, source, isa))
+            return key
+        if op == OP_OPEN:
+            if len(sessions) >= self.max_sessions:
+                raise ServerError(f"Troppe sessioni aperte su questa connessione (massimo {self.max_sessions})")
+            image = self._program(bytes(data[:KEY_SIZE]))
+            session = _Session(image, unpack_words(data[KEY_SIZE:]))
+            sid = next_id[0]
+            next_id[0] += 1
+            sessions[sid] = session
+            self._sessions += 1
+            return _SESSION.pack(sid)
+        if op == OP_STEP:
+            sid, steps, ms = _STEP.unpack_from(data)
+            session = _session(sessions, sid)
+            return await self._offload(self._step, session, unpack_words(data[_STEP.size:]), steps, ms)
+        if op == OP_INSPECT:
+            (sid,) = _SESSION.unpack_from(data)
+            session = _session(sessions, sid)
+            m = session.machine
+            return encode_state(m.pc, m.accumulator, m.flag, session.steps, len(m.input_queue), m.memory.cells)
+        if op == OP_CLOSE:
+            (sid,) = _SESSION.unpack_from(data)
+            _session(sessions, sid)
+            del sessions[sid]
+            self._sessions -= 1
+            return b""
+        if op == OP_STATS:
+            return encode_stats(self.requests, self.busy, self.hits, self.misses, len(self._programs), self._sessions)
+        raise ServerError(f"Operazione sconosciuta: {op}")
+
+    async def _offload(self, fn, *args):
+        """Esegue `fn` su un worker, o solleva `_Busy` se worker e coda sono pieni."""
+        if self._inflight >= self.workers + self.queue_size:
+            raise _Busy()
+        self._inflight += 1
+        try:
+            return await self._loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._inflight -= 1
+
+    # cache dei programmi: usata solo dal thread del loop, niente lock
+    def _cached(self, key: bytes) -> Optional[TrustedImage]:
+        image = self._programs.get(key)
+        if image is not None:
+            self._programs.move_to_end(key)
+            self.hits += 1
+        return image
+
+    def _program(self, key: bytes) -> TrustedImage:
+        image = self._cached(key)
+        if image is None:
+            raise ServerError(f"Programma sconosciuto: {key.hex()} (da assemblare di nuovo)")
+        return image
+
+    def _remember(self, key: bytes, image: TrustedImage):
+        self.misses += 1
+        programs = self._programs
+        programs[key] = image
+        programs.move_to_end(key)
+        while len(programs) > self.cache_size:
+            programs.popitem(last=False)
+
+    # lavoro sui worker
+    def _limits(self, steps: int, ms: int) -> Tuple[int, float]:
+        steps = self.max_steps if steps == 0 else min(steps, self.max_steps)
+        seconds = self.time_limit if ms == 0 else min(ms / 1000, self.time_limit)
+        return steps, seconds
+
+    def _pool(self, isa: ISA) -> LMCPool:
+        pool = self._pools.get(isa.name)
+        if pool is None:
+            pool = self._pools.setdefault(isa.name, LMCPool(self.workers, lambda: LMC(isa=isa)))
+        return pool
+
+    def _run(self, image: TrustedImage, inputs: Sequence[int], steps: int, ms: int) -> bytes:
+        steps, seconds = self._limits(steps, ms)
+        return _result_body(self._pool(image.isa).execute(image, inputs, steps, seconds))
+
+    def _step(self, session: _Session, inputs: Sequence[int], steps: int, ms: int) -> bytes:
+        steps, seconds = self._limits(steps, ms)
+        m = session.machine
+        if inputs:
+            # tutti i valori controllati prima di accodarne uno: un errore non lascia la sessione a metà
+            top = m.isa.max_value
+            if min(inputs) < 0 or max(inputs) > top:
+                bad = next(v for v in inputs if not 0 <= v <= top)
+                raise ValueError(f"Input fuori range: {bad}")
+            m.input_queue.extend(inputs)
+        res = m.execute(steps, seconds)
+        session.steps += res.steps
+        m.output_queue.clear()
+        return _result_body(res)
+
+
+def _profile(name: bytes) -> ISA:
+    isa = PROFILES.get(name.decode("ascii"))
+    if isa is None:
+        raise ServerError(f"Profilo sconosciuto: {name.decode('ascii', 'replace')!r}")
+    return isa
+
+
+def _session(sessions: Dict[int, _Session], sid: int) -> _Session:
+    session = sessions.get(sid)
+    if session is None:
+        raise ServerError(f"Sessione sconosciuta: {sid}")
+    return session
+
+
+def _remove_stale_socket(path: str):
+    """Rimuove un socket Unix rimasto da un server terminato (nessuno in ascolto)."""
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+    except FileNotFoundError:
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+    finally:
+        probe.close()
@@ -0,0 +1,639 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .exceptions import LMCError, NonTerminationDetected
+from .isa import CLASSIC, ISA
+from .machine import HALTED, STEP_LIMIT, NON_TERMINATION, _ERROR_REASONS, LMC, LoopDetector, TrustedImage
+
+# Esito di un ramo abbandonato perché il budget di stati (`max_paths`) è esaurito
+UNKNOWN = "unknown"
+
+# Sotto questa ampiezza un simbolo di un'espressione a più simboli si divide nei singoli valori
+POINT_SPLIT = 16
+
+Affine = Tuple[int, Tuple[Tuple[int, int], ...]]  # (costante, ((simbolo, coefficiente), ...))
+Box = Tuple[Tuple[int, int], ...]  # intervallo [lo, hi] di ogni input, per posizione
+InputSpec = Union[int, Tuple[int, int]]
+
+# Dominio (Box) del ramo in esecuzione: i confronti dei valori simbolici vengono decisi su questo
+_ctx = threading.local()
+
+
+class _Split(Exception):
+    """Decisione che dipende dagli input: il dominio va diviso in `boxes`."""
+
+    def __init__(self, boxes: List[Box]):
+        super().__init__(len(boxes))
+        self.boxes = boxes
+
+
+def _active_box() -> Box:
+    box = getattr(_ctx, "box", None)
+    if box is None:
+        raise TypeError("Valore simbolico usato fuori da explore(): usare evaluate() o bounds()")
+    return box
+
+
+def _affine_add(a: Affine, b: Affine, sign: int = 1) -> Affine:
+    if not b[1]:
+        return a[0] + sign * b[0], a[1]
+    if not a[1] and sign > 0:
+        return a[0] + b[0], b[1]
+    coeffs = dict(a[1])
+    for s, c in b[1]:
+        coeffs[s] = coeffs.get(s, 0) + sign * c
+    return a[0] + sign * b[0], tuple(sorted((s, c) for s, c in coeffs.items() if c))
+
+
+def _affine_fold(a: Affine, box: Box) -> Affine:
+    """Sostituisce con una costante i simboli il cui intervallo ha un solo valore."""
+    const, terms = a
+    if all(box[s][0] != box[s][1] for s, _ in terms):
+        return a
+    kept = []
+    for s, c in terms:
+        lo, hi = box[s]
+        if lo == hi:
+            const += c * lo
+        else:
+            kept.append((s, c))
+    return const, tuple(kept)
+
+
+def _affine_bounds(a: Affine, box: Box) -> Tuple[int, int]:
+    lo = hi = a[0]
+    for s, c in a[1]:
+        slo, shi = box[s]
+        if c > 0:
+            lo += c * slo
+            hi += c * shi
+        else:
+            lo += c * shi
+            hi += c * slo
+    return lo, hi
+
+
+def _affine_eval(a: Affine, values: Sequence[int]) -> int:
+    return a[0] + sum(c * values[s] for s, c in a[1])
+
+
+def _affine_str(a: Affine) -> str:
+    parts = []
+    for s, c in a[1]:
+        sign = "-" if c < 0 else "+"
+        mag = abs(c)
+        parts.append(f"{sign} {'' if mag == 1 else f'{mag}*'}x{s}")
+    if a[0] or not parts:
+        parts.append(f"{'-' if a[0] < 0 else '+'} {abs(a[0])}")
+    text = " ".join(parts)
+    return text[2:] if text.startswith("+ ") else "-" + text[2:]
+
+
+def _with(box: Box, sym: int, interval: Tuple[int, int]) -> Box:
+    return box[:sym] + (interval,) + box[sym + 1:]
+
+
+def _partition(a: Affine, box: Box, category: Callable[[int], object]) -> List[Box]:
+    """Divide `box` in parti su cui `category(a)` è costante.
+
+    `category` deve essere monotona nel valore (segno, finestra modulo, valore stesso).
+    Con un solo simbolo la divisione è esatta (ricerca binaria dei punti di cambio);
+    con più simboli si divide un simbolo (nei singoli valori se stretto, a metà
+    altrimenti) e la decisione viene ritentata sulle parti.
+    """
+    const, terms = _affine_fold(a, box)
+    if len(terms) == 1:
+        (sym, coef), = terms
+        lo, hi = box[sym]
+        pieces = []
+        start = lo
+        while start <= hi:
+            cat = category(const + coef * start)
+            a_, b_ = start, hi
+            while a_ < b_:
+                mid = (a_ + b_ + 1) // 2
+                if category(const + coef * mid) == cat:
+                    a_ = mid
+                else:
+                    b_ = mid - 1
+            pieces.append(_with(box, sym, (start, a_)))
+            start = a_ + 1
+        return pieces
+    widths = [(box[s][1] - box[s][0], s, c) for s, c in terms]
+    width, sym, _ = min(widths)
+    lo, hi = box[sym]
+    if width < POINT_SPLIT:
+        return [_with(box, sym, (v, v)) for v in range(lo, hi + 1)]
+    width, sym, _ = max(widths, key=lambda w: abs(w[2]) * w[0])
+    lo, hi = box[sym]
+    mid = (lo + hi) // 2
+    return [_with(box, sym, (lo, mid)), _with(box, sym, (mid + 1, hi))]
+
+
+def _make(inner: Optional[Affine], outer: Affine, modulus: int) -> Value:
+    """Valore normalizzato sul dominio attivo: intero se costante, riduzione risolta se possibile."""
+    box = _active_box()
+    outer = _affine_fold(outer, box)
+    if inner is not None:
+        inner = _affine_fold(inner, box)
+        lo, hi = _affine_bounds(inner, box)
+        k = lo // modulus
+        if hi // modulus == k:
+            outer = _affine_add(outer, (inner[0] - k * modulus, inner[1]))
+            inner = None
+    if inner is None and not outer[1]:
+        return outer[0]
+    return SymValue(inner, outer, modulus)
+
+
+def _parts(v: Value) -> Tuple[Optional[Affine], Affine, int]:
+    if type(v) is SymValue:
+        return v.inner, v.outer, v.modulus
+    return None, (v, ()), 0
+
+
+def _exact(v: Value) -> Affine:
+    """Forma affine esatta di `v`; se la riduzione modulo non è risolta divide il dominio."""
+    if type(v) is not SymValue:
+        return v, ()
+    if v.inner is None:
+        return v.outer
+    v = _make(v.inner, v.outer, v.modulus)
+    if type(v) is not SymValue:
+        return v, ()
+    if v.inner is None:
+        return v.outer
+    m = v.modulus
+    raise _Split(_partition(v.inner, _active_box(), lambda x: x // m))
+
+
+def _combine(a: Value, b: Value, sign: int) -> Value:
+    ai, ao, am = _parts(a)
+    bi, bo, bm = _parts(b)
+    if bi is not None:
+        if sign > 0 and ai is None:
+            ai, ao, bi, bo = bi, bo, ai, ao
+        else:
+            bo = _exact(b)
+    return _make(ai, _affine_add(ao, bo, sign), am or bm)
+
+
+def _sign(x: int) -> int:
+    return (x > 0) - (x < 0)
+
+
+def _decide(v: Value, category: Callable[[int], object]) -> object:
+    """Valore di `category(v)` se costante sul dominio attivo, altrimenti divide il dominio."""
+    if type(v) is not SymValue:
+        return category(v)
+    box = _active_box()
+    lo, hi = v.bounds(box)
+    first = category(lo)
+    if category(hi) == first:
+        return first
+    if v.inner is not None:
+        _exact(v)  # divide sulle finestre della riduzione modulo (o la risolve)
+        v = _make(v.inner, v.outer, v.modulus)
+        return _decide(v, category)
+    raise _Split(_partition(v.outer, box, category))
+
+
+class SymValue:
+    """Valore che dipende dagli input: `(inner mod modulus) + outer`, con inner e outer affini.
+
+    Il simbolo `xi` è l'i-esimo input. `inner` è None per i valori esatti; altrimenti
+    è una riduzione modulo non ancora risolta (una somma che può superare il modulo),
+    risolta dividendo il dominio solo quando una decisione ne ha bisogno.
+
+    I valori simbolici girano dentro `LMC.step` come normali interi: aritmetica,
+    `% modulus`, confronti e indicizzazione sono decisi sul dominio del ramo in
+    esecuzione, e una decisione che dipende dagli input interrompe l'istruzione
+    (prima di modificare lo stato) chiedendo a `explore` di dividere il dominio.
+    """
+
+    __slots__ = ("inner", "outer", "modulus")
+
+    def __init__(self, inner: Optional[Affine], outer: Affine, modulus: int):
+        self.inner = inner
+        self.outer = outer
+        self.modulus = modulus
+
+    @property
+    def key(self) -> tuple:
+        """Chiave strutturale (hashable) per confrontare stati."""
+        return ("sym", self.inner, self.outer, self.modulus)
+
+    def bounds(self, box: Optional[Box] = None) -> Tuple[int, int]:
+        """Minimo e massimo (sovrastimati per le riduzioni non risolte) sul dominio `box`."""
+        box = _active_box() if box is None else box
+        lo, hi = _affine_bounds(self.outer, box)
+        if self.inner is not None:
+            ilo, ihi = _affine_bounds(self.inner, box)
+            if ihi - ilo < self.modulus and ilo // self.modulus == ihi // self.modulus:
+                k = ilo // self.modulus * self.modulus
+                return lo + ilo - k, hi + ihi - k
+            hi += self.modulus - 1
+        return lo, hi
+
+    def evaluate(self, values: Sequence[int]) -> int:
+        """Valore concreto per gli input `values`."""
+        out = _affine_eval(self.outer, values)
+        if self.inner is not None:
+            out += _affine_eval(self.inner, values) % self.modulus
+        return out
+
+    def __add__(self, other):
+        return _combine(self, other, 1) if isinstance(other, (int, SymValue)) else NotImplemented
+
+    def __radd__(self, other):
+        return _combine(other, self, 1) if isinstance(other, int) else NotImplemented
+
+    def __sub__(self, other):
+        return _combine(self, other, -1) if isinstance(other, (int, SymValue)) else NotImplemented
+
+    def __rsub__(self, other):
+        return _combine(other, self, -1) if isinstance(other, int) else NotImplemented
+
+    def __mod__(self, m):
+        if not isinstance(m, int):
+            return NotImplemented
+        if self.inner is not None and m == self.modulus:
+            return _make(_affine_add(self.inner, self.outer), (0, ()), m)
+        return _make(_exact(self), (0, ()), m)
+
+    def _cmp(self, other, category):
+        if type(other) is int:
+            # caso comune (controlli di range, BRZ): basta spostare gli estremi
+            lo, hi = self.bounds()
+            first = category(lo - other)
+            if category(hi - other) == first:
+                return first
+        elif not isinstance(other, (int, SymValue)):
+            return NotImplemented
+        return _decide(self - other, category)
+
+    def __lt__(self, other):
+        return self._cmp(other, lambda d: d < 0)
+
+    def __le__(self, other):
+        return self._cmp(other, lambda d: d <= 0)
+
+    def __gt__(self, other):
+        return self._cmp(other, lambda d: d > 0)
+
+    def __ge__(self, other):
+        return self._cmp(other, lambda d: d >= 0)
+
+    def __eq__(self, other):
+        result = self._cmp(other, _sign)
+        return result if result is NotImplemented else result == 0
+
+    def __ne__(self, other):
+        result = self._cmp(other, _sign)
+        return result if result is NotImplemented else result != 0
+
+    __hash__ = None
+
+    def __bool__(self):
+        return self != 0
+
+    def __index__(self):
+        a = _exact(self)
+        box = _active_box()
+        const, terms = _affine_fold(a, box)
+        if not terms:
+            return const
+        raise _Split(_partition(a, box, lambda x: x))
+
+    __int__ = __index__
+
+    def __repr__(self) -> str:
+        if self.inner is None:
+            return _affine_str(self.outer)
+        text = f"({_affine_str(self.inner)}) mod {self.modulus}"
+        if self.outer != (0, ()):
+            text += f" + {_affine_str(self.outer)}" if self.outer[0] >= 0 or self.outer[1] else f" - {-self.outer[0]}"
+        return text
+
+
+Value = Union[int, SymValue]
+
+
+def _key(v: Value):
+    return v if type(v) is not SymValue else v.key
+
+
+def _keys(values) -> tuple:
+    """Chiavi strutturali di una sequenza di valori (gli interi restano tali)."""
+    values = tuple(values)
+    if SymValue not in map(type, values):
+        return values
+    return tuple(map(_key, values))
+
+
+def _union(a: Box, b: Box) -> Optional[Box]:
+    """Unione di due domini se è ancora un Box (diversi in una sola posizione, contigui)."""
+    diff = [i for i in range(len(a)) if a[i] != b[i]]
+    if not diff:
+        return a
+    if len(diff) != 1:
+        return None
+    i = diff[0]
+    (alo, ahi), (blo, bhi) = a[i], b[i]
+    if blo > ahi + 1 or alo > bhi + 1:
+        return None
+    return _with(a, i, (min(alo, blo), max(ahi, bhi)))
+
+
+@dataclass(frozen=True, eq=False)
+class PathResult:
+    """Esito comune a tutti gli input di un dominio.
+
+    Attributes:
+        inputs: intervallo [lo, hi] di ogni input
+        reason: HALTED, STEP_LIMIT, NON_TERMINATION (divergenza dimostrata: stato
+            ripetuto), INPUT_UNDERFLOW, ILLEGAL_INSTRUCTION, MEMORY_ERROR oppure
+            UNKNOWN (budget di stati esaurito: il dominio va verificato in concreto)
+        outputs: output prodotti, interi o `SymValue` negli input
+        steps: istruzioni eseguite (il massimo sul dominio)
+    """
+
+    inputs: Box
+    reason: str
+    outputs: Tuple[Value, ...]
+    steps: int
+
+    @property
+    def size(self) -> int:
+        """Numero di combinazioni di input coperte."""
+        n = 1
+        for lo, hi in self.inputs:
+            n *= hi - lo + 1
+        return n
+
+    def covers(self, values: Sequence[int]) -> bool:
+        """True se gli input `values` ricadono nel dominio."""
+        return len(values) == len(self.inputs) and all(lo <= v <= hi for v, (lo, hi) in zip(values, self.inputs))
+
+    def evaluate(self, values: Sequence[int]) -> Tuple[int, ...]:
+        """Output concreti per gli input `values` (senza eseguire il programma)."""
+        return tuple(v if type(v) is int else v.evaluate(values) for v in self.outputs)
+
+    def output_bounds(self) -> Tuple[Tuple[int, int], ...]:
+        """Intervallo di ogni output su tutto il dominio."""
+        return tuple((v, v) if type(v) is int else v.bounds(self.inputs) for v in self.outputs)
+
+    def points(self) -> Iterator[Tuple[int, ...]]:
+        """Tutte le combinazioni di input del dominio, in ordine."""
+        return itertools.product(*(range(lo, hi + 1) for lo, hi in self.inputs))
+
+
+@dataclass(frozen=True, eq=False)
+class SymbolicResult:
+    """Risultato di `explore`: i domini di input, disgiunti, con il loro esito.
+
+    Attributes:
+        paths: esiti per dominio, ordinati per intervallo di input
+        explored: stati simbolici creati durante l'esplorazione
+    """
+
+    paths: Tuple[PathResult, ...]
+    explored: int
+
+    @property
+    def complete(self) -> bool:
+        """True se ogni dominio ha un esito (nessun UNKNOWN)."""
+        return all(p.reason != UNKNOWN for p in self.paths)
+
+    @property
+    def terminates(self) -> bool:
+        """True se il programma raggiunge HLT per ogni input del dominio esplorato."""
+        return all(p.reason == HALTED for p in self.paths)
+
+    @property
+    def diverging(self) -> Tuple[PathResult, ...]:
+        """Domini su cui la non terminazione è dimostrata."""
+        return tuple(p for p in self.paths if p.reason == NON_TERMINATION)
+
+    def lookup(self, values: Sequence[int]) -> Optional[PathResult]:
+        """Dominio che contiene gli input `values` (None se fuori dagli intervalli esplorati)."""
+        return next((p for p in self.paths if p.covers(values)), None)
+
+    def check(self, expected: Callable[[Tuple[int, ...]], Sequence[int]]) -> Optional[Tuple[int, ...]]:
+        """Cerca un controesempio: primo input che non termina o il cui output differisce da `expected`.
+
+        Gli output di ogni dominio sono valutati dalle espressioni simboliche, senza
+        rieseguire il programma.
+
+        Returns:
+            Gli input del controesempio, oppure None se tutti gli input sono corretti
+        """
+        for path in self.paths:
+            for values in path.points():
+                if path.reason != HALTED or path.evaluate(values) != tuple(expected(values)):
+                    return values
+        return None
+
+
+class _Path:
+    """Ramo in esplorazione: macchina con valori simbolici più il suo dominio."""
+
+    __slots__ = ("machine", "box", "steps", "detector", "slot", "sig")
+
+    def __init__(self, machine: LMC, box: Box, steps: int, detector: LoopDetector):
+        self.machine = machine
+        self.box = box
+        self.steps = steps
+        self.detector = detector
+        self.slot = None  # (pc, passi) se in attesa e unibile ad altri rami
+        self.sig = None   # chiave dello stato, calcolata solo se serve un confronto
+
+    def state_key(self) -> tuple:
+        if self.sig is None:
+            m = self.machine
+            self.sig = (m.flag, _key(m.accumulator), len(m.input_queue), _keys(m.output_queue), _keys(m.memory))
+        return self.sig
+
+
+def _clone_detector(d: LoopDetector) -> LoopDetector:
+    c = LoopDetector()
+    c.power, c.lam, c.saved, c.saved_steps, c.offset = d.power, d.lam, d.saved, d.saved_steps, d.offset
+    return c
+
+
+class _Explorer:
+    def __init__(self, isa: ISA, max_steps: int, max_paths: int):
+        self.isa = isa
+        self.max_steps = max_steps
+        self.max_paths = max_paths
+        self.paths = 1
+        self.heap: List[tuple] = []
+        self.pending: Dict[Tuple[int, int], List[_Path]] = {}
+        self.leaves: List[PathResult] = []
+        self.seq = itertools.count()
+
+    def run(self, cells: Sequence[int], box: Box) -> SymbolicResult:
+        previous = getattr(_ctx, "box", None)
+        try:
+            _ctx.box = box
+            machine = LMC(isa=self.isa)
+            machine.memory = list(cells)
+            machine.input_queue.extend(_make(None, (0, ((i, 1),)), self.isa.modulus) for i in range(len(box)))
+            self._push(_Path(machine, box, 0, LoopDetector()))
+            while self.heap:
+                path = heapq.heappop(self.heap)[-1]
+                if path.slot is not None:
+                    bucket = self.pending[path.slot]
+                    bucket.remove(path)
+                    if not bucket:
+                        del self.pending[path.slot]
+                    path.slot = None
+                self._advance(path)
+        finally:
+            _ctx.box = previous
+        return SymbolicResult(_compact(self.leaves), self.paths)
+
+    def _push(self, path: _Path, merge: bool = True):
+        """Rimette in coda un ramo, unendolo a uno in attesa con lo stesso stato se i domini sono contigui.
+
+        Con `merge=False` (parti appena divise, che devono ancora eseguire l'istruzione
+        che le distingue) il ramo va in coda senza unioni.
+        """
+        m = path.machine
+        path.sig = None
+        if merge:
+            slot = (m.pc, path.steps)
+            bucket = self.pending.get(slot)
+            if bucket:
+                for other in bucket:
+                    merged = _union(other.box, path.box)
+                    if merged is not None and other.state_key() == path.state_key():
+                        other.box = merged
+                        # la storia dei due rami è diversa: il rilevatore riparte da qui
+                        other.detector = LoopDetector()
+                        return
+                bucket.append(path)
+            else:
+                self.pending[slot] = [path]
+            path.slot = slot
+        heapq.heappush(self.heap, (m.pc, path.steps, next(self.seq), path))
+
+    def _leaf(self, path: _Path, reason: str):
+        self.leaves.append(PathResult(path.box, reason, tuple(path.machine.output_queue), path.steps))
+
+    def _advance(self, path: _Path):
+        """Esegue il ramo con `LMC.step` finché termina, si divide o cede il turno.
+
+        I rami avanzano in ordine di (pc, passi), così quelli che si ricongiungono
+        nello stesso punto con lo stesso stato si incontrano in coda e vengono uniti.
+        """
+        m = path.machine
+        _ctx.box = path.box
+        heap = self.heap
+        while True:
+            if path.steps >= self.max_steps:
+                return self._leaf(path, STEP_LIMIT)
+            try:
+                seen = None
+                target = m._taken_backward_branch()
+                if target is not None:
+                    seen = (target, _key(m.accumulator), m.flag, len(m.input_queue), [_key(v) for v in m.memory])
+                running = m.step()
+            except _Split as split:
+                return self._split(path, split.boxes)
+            except LMCError as e:
+                reason = next((r for cls, r in _ERROR_REASONS if isinstance(e, cls)), None)
+                if reason is None:
+                    raise
+                return self._leaf(path, reason)
+            if not running:
+                return self._leaf(path, HALTED)
+            if seen is not None:
+                try:
+                    path.detector.observe(*seen, path.steps)
+                except NonTerminationDetected:
+                    return self._leaf(path, NON_TERMINATION)
+            path.steps += 1
+            if heap and (m.pc, path.steps) > heap[0][:2]:
+                return self._push(path)
+
+    def _split(self, path: _Path, boxes: List[Box]):
+        if self.paths + len(boxes) - 1 > self.max_paths:
+            return self._leaf(path, UNKNOWN)
+        self.paths += len(boxes) - 1
+        m = path.machine
+        children = [path] + [_Path(m.fork(), box, path.steps, _clone_detector(path.detector)) for box in boxes[1:]]
+        path.box = boxes[0]
+        for child in children:
+            self._push(child, merge=False)
+
+
+def _compact(leaves: List[PathResult]) -> Tuple[PathResult, ...]:
+    """Unisce i domini contigui (in ordine di input) con lo stesso esito e gli stessi output."""
+    groups: Dict[str, List[PathResult]] = {}
+    for leaf in leaves:
+        groups.setdefault(leaf.reason, []).append(leaf)
+    out = []
+    for group in groups.values():
+        group.sort(key=lambda p: p.inputs)
+        merged = [group[0]]
+        for p in group[1:]:
+            last = merged[-1]
+            box = _union(last.inputs, p.inputs)
+            if box is None or len(last.outputs) != len(p.outputs) or _keys(last.outputs) != _keys(p.outputs):
+                merged.append(p)
+            else:
+                merged[-1] = replace(last, inputs=box, steps=max(last.steps, p.steps))
+        out.extend(merged)
+    return tuple(sorted(out, key=lambda p: p.inputs))
+
+
+def explore(
+    memory: Union[Sequence[int], TrustedImage],
+    inputs: Sequence[InputSpec] = (),
+    isa: ISA = CLASSIC,
+    max_steps: int = 10000,
+    max_paths: int = 10000,
+) -> SymbolicResult:
+    """Esegue il programma per tutti gli input di un dominio in una sola esplorazione.
+
+    Ogni input è un intero oppure un intervallo (lo, hi); gli intervalli diventano
+    simboli `x0, x1, ...` e l'accumulatore e le celle contengono espressioni in
+    questi simboli. Le istruzioni vengono eseguite da `LMC.step` stesso, quindi la
+    semantica è quella dell'interprete di riferimento; quando un salto (o un
+    confronto, una riduzione modulo, un indirizzo) dipende dagli input il dominio
+    viene diviso nelle parti su cui la decisione è costante e ogni parte prosegue
+    separatamente. I rami che tornano nello stesso stato con domini contigui
+    vengono riuniti. Uno stato ripetuto a un salto all'indietro (Brent, come con
+    `detect_loops`) dimostra la non terminazione per tutto il dominio del ramo.
+
+    Args:
+        memory: immagine del programma (`isa.cells` celle)
+        inputs: per ogni INP, un valore fisso oppure un intervallo (lo, hi) inclusivo;
+            un INP oltre l'ultimo input dà INPUT_UNDERFLOW come in esecuzione
+        isa: geometria (ignorata se `memory` è una `TrustedImage`)
+        max_steps: budget di istruzioni per input, come in `LMC.execute`
+        max_paths: massimo numero di stati simbolici; oltre, i domini restanti sono UNKNOWN
+
+    Returns:
+        SymbolicResult con un esito per ogni dominio di input
+
+    Raises:
+        MemoryErrorLMC: immagine non valida
+        ValueError: intervallo di input non valido
+    """
+    image = memory if isinstance(memory, TrustedImage) else TrustedImage.from_memory(memory, isa)
+    isa = image.isa
+    box = []
+    for spec in inputs:
+        lo, hi = (spec, spec) if isinstance(spec, int) else spec
+        if not (0 <= lo <= hi <= isa.max_value):
+            raise ValueError(f"Intervallo di input non valido: {spec}")
+        box.append((lo, hi))
+    return _Explorer(isa, max_steps, max_paths).run(image.cells, tuple(box))
@@ -0,0 +1,451 @@
+# Francesco Falcon SM3201408
+
+from __future__ import annotations
+import bisect
+import struct
+from array import array
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+
+from .exceptions import IllegalInstructionError, LMCError
+from .machine import (
+    LMC,
+    LoopDetector,
+    MachineSnapshot,
+    _DECODE,
+    _NEXT_PC,
+    _LDA,
+    _ADD,
+    _STA,
+    _SUB,
+    _BRZ,
+    _BRP,
+    _BRA,
+    _INP,
+    _OUT,
+    _HLT,
+)
+
+# Record di traccia: un uint32 per istruzione eseguita, con lo stato *prima* dell'istruzione
+#   bit  0-6   pc
+#   bit  7-16  accumulatore (mod 1000)
+#   bit 17-26  parola eseguita (mem[pc])
+#   bit 27     flag
+# La scrittura di una STA non va memorizzata: indirizzo e valore si ricavano da parola e accumulatore.
+_PC_MASK = 0x7F
+_ACC_SHIFT = 7
+_WORD_SHIFT = 17
+_FLAG_SHIFT = 27
+_VALUE_MASK = 0x3FF
+_RECORD_TYPE = "I" if array("I").itemsize == 4 else "L"
+# bit della parola (0..999) e di accumulatore e flag (per flag False/True, acc 0..999) del record
+_WORD_BITS = [word << _WORD_SHIFT for word in range(1000)]
+_ACC_BITS = tuple([acc << _ACC_SHIFT | flag << _FLAG_SHIFT for acc in range(1000)] for flag in (0, 1))
+
+# File di traccia:
+#   header  <4s H H>  magic, versione, riservato
+#   blocchi <c Q I>   tipo, passo, lunghezza, seguiti dal contenuto
+#     b"R": lunghezza x uint32, record a partire dal passo indicato
+#     b"C"/b"T": checkpoint / stato finale (vedi `_encode_state`)
+TRACE_MAGIC = b"LMCT"
+TRACE_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sHH")
+_CHUNK = struct.Struct("<cQI")
+_STATE = struct.Struct("<BqBHI")  # pc, accumulatore, flag, input residui, output
+
+
+class TraceRecord(NamedTuple):
+    """Stato della macchina prima dell'istruzione numero `step`."""
+
+    step: int
+    pc: int
+    word: int
+    accumulator: int
+    flag: bool
+
+
+def _unpack(step: int, rec: int) -> TraceRecord:
+    return TraceRecord(
+        step,
+        rec & _PC_MASK,
+        (rec >> _WORD_SHIFT) & _VALUE_MASK,
+        (rec >> _ACC_SHIFT) & _VALUE_MASK,
+        bool(rec >> _FLAG_SHIFT),
+    )
+
+
+def _encode_state(snap: MachineSnapshot) -> bytes:
+    head = _STATE.pack(snap.pc, snap.accumulator, snap.flag, len(snap.inputs), len(snap.outputs))
+    return head + array("H", snap.memory + snap.inputs + snap.outputs).tobytes()
+
+
+def _decode_state(data: bytes) -> MachineSnapshot:
+    pc, acc, flag, n_in, n_out = _STATE.unpack_from(data, 0)
+    values = array("H", data[_STATE.size:]).tolist()
+    return MachineSnapshot(
+        tuple(values[:100]),
+        pc,
+        acc,
+        bool(flag),
+        tuple(values[100:100 + n_in]),
+        tuple(values[100 + n_in:100 + n_in + n_out]),
+    )
+
+
+class Trace:
+    """Traccia di esecuzione con checkpoint periodici, navigabile in entrambe le direzioni.
+
+    Lo stato prima di un passo qualsiasi si ricostruisce partendo dal checkpoint
+    precedente più vicino e riapplicando i record successivi (scritture STA,
+    consumo di input, OUT), quindi il costo è limitato dalla distanza tra checkpoint.
+
+    Attributes:
+        first: passo del primo record conservato
+        records: record impacchettati (vedi formato sopra)
+        checkpoints: coppie (passo, MachineSnapshot) in ordine crescente
+        tail: stato dopo l'ultimo record
+    """
+
+    def __init__(
+        self,
+        first: int,
+        records: array,
+        checkpoints: List[Tuple[int, MachineSnapshot]],
+        tail: Optional[MachineSnapshot],
+    ):
+        self.first = first
+        self.records = records
+        self.checkpoints = checkpoints
+        self.tail = tail
+        self._steps = [step for step, _ in checkpoints]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def end(self) -> int:
+        """Passo successivo all'ultimo record (lo stato `tail`)."""
+        return self.first + len(self.records)
+
+    @property
+    def start(self) -> int:
+        """Primo passo di cui si può ricostruire lo stato."""
+        if not self._steps:
+            return self.end
+        return self._steps[0]
+
+    def record(self, step: int) -> TraceRecord:
+        """Record dell'istruzione numero `step`.
+
+        Raises:
+            IndexError: se il passo non è nella traccia
+        """
+        if not (self.first <= step < self.end):
+            raise IndexError(f"Passo {step} non presente nella traccia")
+        return _unpack(step, self.records[step - self.first])
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        for i, rec in enumerate(self.records):
+            yield _unpack(self.first + i, rec)
+
+    def state_at(self, step: int) -> MachineSnapshot:
+        """Ricostruisce lo stato della macchina prima dell'istruzione numero `step`.
+
+        `outputs` contiene gli output in `output_queue` al checkpoint più quelli
+        prodotti da lì in poi; `inputs` gli input ancora in coda.
+
+        Raises:
+            IndexError: se il passo è fuori da [start, end]
+        """
+        if step == self.end and self.tail is not None:
+            return self.tail
+        if not (self.start <= step < self.end):
+            raise IndexError(f"Passo {step} fuori dalla traccia [{self.start}, {self.end}]")
+        k = bisect.bisect_right(self._steps, step) - 1
+        base_step, base = self.checkpoints[k]
+        if base_step == step:
+            return base
+        mem = list(base.memory)
+        inputs = list(base.inputs)
+        outputs = list(base.outputs)
+        records = self.records
+        taken = 0
+        for i in range(base_step - self.first, step - self.first):
+            rec = records[i]
+            op, arg = _DECODE[(rec >> _WORD_SHIFT) & _VALUE_MASK]
+            if op == _STA:
+                mem[arg] = (rec >> _ACC_SHIFT) & _VALUE_MASK
+            elif op == _INP:
+                if taken < len(inputs):
+                    taken += 1
+            elif op == _OUT:
+                outputs.append((rec >> _ACC_SHIFT) & _VALUE_MASK)
+        # step < end: pc, accumulatore e flag sono nel record stesso
+        rec = _unpack(step, records[step - self.first])
+        return MachineSnapshot(tuple(mem), rec.pc, rec.accumulator, rec.flag, tuple(inputs[taken:]), tuple(outputs))
+
+
+class TraceRecorder:
+    """Registratore di traccia su buffer circolare, opzionalmente anche su file.
+
+    Si attiva assegnando l'istanza a `LMC.trace`: `run()`/`execute()` usano allora un
+    interprete che scrive un record di 4 byte per istruzione in un `array` di
+    capacità fissa e salva un checkpoint completo ogni `checkpoint_every` record
+    (o un multiplo, quando gli output in coda sono più di `checkpoint_every`).
+    Quando il buffer si riempie i record più vecchi vengono sovrascritti; con `path`
+    tutti i record e i checkpoint vengono anche accodati a un file binario
+    (rileggibile con `load_trace`) prima di essere sovrascritti.
+
+    Args:
+        capacity: numero di record conservati in memoria (multiplo di checkpoint_every)
+        checkpoint_every: distanza in istruzioni tra due checkpoint
+        path: opzionale, file su cui scrivere la traccia completa
+
+    Attributes:
+        total: istruzioni registrate dall'inizio
+    """
+
+    def __init__(self, capacity: int = 65536, checkpoint_every: int = 1024, path: Optional[str] = None):
+        if checkpoint_every <= 0 or capacity <= 0 or capacity % checkpoint_every:
+            raise ValueError("capacity deve essere un multiplo positivo di checkpoint_every")
+        self.capacity = capacity
+        self.checkpoint_every = checkpoint_every
+        self.total = 0
+        self._buf = array(_RECORD_TYPE, bytes(4 * capacity))
+        self._pos = 0
+        self._flushed = 0
+        self._checkpoints: List[Tuple[int, MachineSnapshot]] = []
+        self._tail: Optional[MachineSnapshot] = None
+        self._file: Optional[BinaryIO] = None
+        if path is not None:
+            self._file = open(path, "wb")
+            self._file.write(_FILE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 0))
+
+    def trace(self) -> Trace:
+        """Copia dei record conservati come `Trace` navigabile."""
+        n = min(self.total, self.capacity)
+        pos = self._pos
+        buf = self._buf
+        records = buf[pos:] + buf[:pos] if self.total > self.capacity else buf[:n]
+        first = self.total - n
+        checkpoints = [c for c in self._checkpoints if c[0] >= first]
+        return Trace(first, records, checkpoints, self._tail)
+
+    def close(self):
+        """Completa e chiude il file di traccia, se presente."""
+        if self._file is not None:
+            self._flush()
+            if self._tail is not None:
+                self._write_chunk(b"T", self.total, _encode_state(self._tail))
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # internals
+    def _write_chunk(self, kind: bytes, step: int, payload: bytes):
+        self._file.write(_CHUNK.pack(kind, step, len(payload)))
+        self._file.write(payload)
+
+    def _flush(self):
+        """Scrive su file i record del buffer non ancora scritti (fino a `_pos`)."""
+        end = self._pos
+        if self._file is not None and end > self._flushed:
+            first = self.total - (end - self._flushed)
+            self._write_chunk(b"R", first, self._buf[self._flushed:end].tobytes())
+        self._flushed = end % self.capacity
+
+    def _checkpoint(self, step: int, snap: MachineSnapshot):
+        checkpoints = self._checkpoints
+        checkpoints.append((step, snap))
+        # scarta i checkpoint i cui record sono già stati sovrascritti
+        oldest = step - self.capacity
+        while checkpoints and checkpoints[0][0] < oldest:
+            checkpoints.pop(0)
+        if self._file is not None:
+            self._write_chunk(b"C", step, _encode_state(snap))
+
+    def run(self, machine: LMC, max_steps: int, detector: Optional[LoopDetector] = None) -> int:
+        """Interprete registrante: come `LMC._run_fast` ma scrive un record per istruzione.
+
+        Viene chiamato da `LMC._execute_slice` quando `machine.trace` è impostato. Se
+        lo stato della macchina è cambiato dall'esterno dopo l'ultima esecuzione
+        (reset, input aggiunti, memoria modificata) viene salvato un nuovo checkpoint.
+        """
+        current = machine.snapshot()
+        if current != self._tail or not self._checkpoints:
+            self._checkpoint(self.total, current)
+        mem = machine._memory.cells
+        # il record si compone con due tabelle precalcolate: bit della parola e bit di
+        # accumulatore e flag (una tabella per valore del flag, scelta da ADD/SUB)
+        wordbits = _WORD_BITS
+        tables = _ACC_BITS
+        decode = _DECODE
+        next_pc = _NEXT_PC
+        inq = machine.input_queue
+        outq = machine.output_queue
+        emit = machine.output_sink or outq.append
+        pull = machine._pull_input
+        cow = machine._cow
+        buf = self._buf
+        cap = self.capacity
+        every = self.checkpoint_every
+        pos = self._pos
+        mark = (pos // every + 1) * every
+        first = self.total
+        base = first - pos
+        limit = first + max_steps
+        pc = machine.pc
+        acc = machine.accumulator
+        flag = bool(machine.flag)
+        if not -1000 <= acc < 1000:
+            # accumulatore assegnato a mano fuori range: la traccia conserva comunque acc % 1000
+            acc %= 1000
+        accbits = tables[flag]
+        try:
+            while True:
+                # il ciclo interno conta solo `pos`: passi e checkpoint si ricavano
+                # al prossimo checkpoint o alla fine del budget
+                stop = min(mark, limit - base)
+                while pos < stop:
+                    # indici negativi: acc in -1000..-1 corrisponde ad acc % 1000
+                    word = mem[pc]
+                    buf[pos] = pc | wordbits[word] | accbits[acc]
+                    op, arg = decode[word]
+                    if op == _LDA:
+                        acc = mem[arg]
+                        pc = next_pc[pc]
+                    elif op == _ADD:
+                        acc += mem[arg]
+                        flag = acc < 0
+                        acc %= 1000
+                        accbits = tables[flag]
+                        pc = next_pc[pc]
+                    elif op == _STA:
+                        if cow:
+                            mem = machine._unshare()
+                            cow = False
+                        mem[arg] = acc % 1000
+                        pc = next_pc[pc]
+                    elif op == _SUB:
+                        acc -= mem[arg]
+                        flag = acc < 0
+                        acc %= 1000
+                        accbits = tables[flag]
+                        pc = next_pc[pc]
+                    elif op == _BRZ:
+                        if acc % 1000 == 0:
+                            if detector is not None and arg <= pc:
+                                detector.observe(arg, acc, flag, len(inq) - machine._pulled, mem, base + pos - first)
+                            pc = arg
+                        else:
+                            pc = next_pc[pc]
+                    elif op == _BRP:
+                        if flag:
+                            pc = next_pc[pc]
+                        else:
+                            if detector is not None and arg <= pc:
+                                detector.observe(arg, acc, flag, len(inq) - machine._pulled, mem, base + pos - first)
+                            pc = arg
+                    elif op == _BRA:
+                        if detector is not None and arg <= pc:
+                            detector.observe(arg, acc, flag, len(inq) - machine._pulled, mem, base + pos - first)
+                        pc = arg
+                    elif op == _INP:
+                        if inq:
+                            acc = inq.popleft()
+                        else:
+                            value = pull()
+                            if value is None:
+                                break
+                            acc = value
+                        pc = next_pc[pc]
+                    elif op == _OUT:
+                        emit(acc % 1000)
+                        pc = next_pc[pc]
+                    elif op == _HLT:
+                        break
+                    else:
+                        raise IllegalInstructionError(pc, word)
+                    pos += 1
+                else:
+                    if pos == mark:
+                        # lo stato locale va riscritto prima di fotografare la macchina
+                        self.total = base + pos
+                        self._pos = pos
+                        if pos == cap:
+                            self._flush()
+                            pos = 0
+                            base += cap
+                            self._pos = 0
+                        self._checkpoint(
+                            self.total,
+                            MachineSnapshot(tuple(mem), pc, acc, flag, tuple(inq), tuple(outq)),
+                        )
+                        # il checkpoint copia anche gli output: la distanza cresce con loro
+                        # (a multipli di `every`, fino alla fine del buffer) così il costo
+                        # resta costante per istruzione anche sui programmi che stampano molto
+                        mark = min(cap, pos + every * max(1, len(outq) // every))
+                    if base + pos < limit:
+                        continue
+                # HLT, INP senza input o budget esaurito
+                break
+        finally:
+            machine.pc = pc
+            machine.accumulator = acc
+            machine.flag = flag
+            steps = machine._steps = base + pos - first
+            self.total = base + pos
+            self._pos = pos
+            self._flush()
+            self._tail = machine.snapshot()
+        return steps
+
+
+def load_trace(path: str) -> Trace:
+    """Legge un file scritto da `TraceRecorder(path=...)`.
+
+    Raises:
+        LMCError: se il file non è una traccia valida
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _FILE_HEADER.size:
+        raise LMCError("File di traccia troncato")
+    magic, version, _ = _FILE_HEADER.unpack_from(data, 0)
+    if magic != TRACE_MAGIC:
+        raise LMCError("Magic del file di traccia non valido")
+    if version != TRACE_VERSION:
+        raise LMCError(f"Versione di traccia non supportata: {version}")
+    records = array(_RECORD_TYPE)
+    first = None
+    checkpoints: List[Tuple[int, MachineSnapshot]] = []
+    tail = None
+    p = _FILE_HEADER.size
+    while p < len(data):
+        if p + _CHUNK.size > len(data):
+            raise LMCError("File di traccia troncato")
+        kind, step, length = _CHUNK.unpack_from(data, p)
+        p += _CHUNK.size
+        payload = data[p:p + length]
+        if len(payload) != length:
+            raise LMCError("File di traccia troncato")
+        p += length
+        if kind == b"R":
+            if first is None:
+                first = step
+            elif step != first + len(records):
+                raise LMCError("Record di traccia non contigui")
+            records.frombytes(payload)
+        elif kind == b"C":
+            checkpoints.append((step, _decode_state(payload)))
+        elif kind == b"T":
+            tail = _decode_state(payload)
+        else:
+            raise LMCError(f"Blocco di traccia sconosciuto: {kind!r}")
+    if first is None:
+        first = checkpoints[0][0] if checkpoints else 0
+    return Trace(first, records, checkpoints, tail)
@@ -0,0 +1,85 @@
+# Francesco Falcon SM3201408
+
+import asyncio
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lmc import Assembler
+from lmc import machine as m_
+from lmc.aio import AsyncLMC
+
+SUM2 = Assembler().assemble_file(str(ROOT / "examples" / "sum2.asm"))
+LOOP = Assembler().assemble_source("L BRA L")
+
+
+def test_inp_awaits_queue_and_out_publishes():
+    async def scenario():
+        m = AsyncLMC()
+        m.reset(memory=SUM2)
+        task = asyncio.create_task(m.run_async())
+        await asyncio.sleep(0)
+        assert not task.done()  # in attesa del primo INP
+        await m.inputs.put(7)
+        await m.inputs.put(8)
+        res = await task
+        return res, await m.outputs.get()
+
+    res, value = asyncio.run(scenario())
+    assert res.reason == m_.HALTED and res.steps == 5
+    assert value == 15
+
+
+def test_long_run_yields_to_event_loop():
+    async def scenario():
+        ticks = 0
+        stop = False
+
+        async def ticker():
+            nonlocal ticks
+            while not stop:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        t = asyncio.create_task(ticker())
+        m = AsyncLMC(slice_steps=100)
+        m.reset(memory=LOOP)
+        res = await m.run_async(max_steps=10000)
+        stop = True
+        await t
+        return res, ticks
+
+    res, ticks = asyncio.run(scenario())
+    assert res.reason == m_.STEP_LIMIT and res.steps == 10000
+    assert ticks >= 90
+
+
+def test_many_machines_multiplexed():
+    async def scenario():
+        machines = []
+        for i in range(200):
+            m = AsyncLMC(slice_steps=50)
+            m.reset(memory=SUM2, inputs=[i, 1])
+            machines.append(m)
+        results = await asyncio.gather(*(m.run_async() for m in machines))
+        return [r.reason for r in results], [m.outputs.get_nowait() for m in machines]
+
+    reasons, outs = asyncio.run(scenario())
+    assert set(reasons) == {m_.HALTED}
+    assert outs == [i + 1 for i in range(200)]
+
+
+def test_memory_from_constructor_without_reset():
+    assert AsyncLMC().memory[0] == 0
+
+    async def scenario():
+        m = AsyncLMC(memory=SUM2)
+        await m.inputs.put(20)
+        await m.inputs.put(22)
+        res = await m.run_async()
+        return res, await m.outputs.get()
+
+    res, value = asyncio.run(scenario())
+    assert res.reason == m_.HALTED and value == 42
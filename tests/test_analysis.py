@@ -0,0 +1,118 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, CompiledLMC, ProgramRejected
+from lmc.analysis import analyze, check_program
+from lmc.grading import Case, Program, grade
+
+ASM = Assembler()
+
+
+def analyze_src(src):
+    return analyze(ASM.assemble_source(src))
+
+
+def test_counter_cfg():
+    memory, labels, _ = ASM.assemble_program((ROOT / "examples" / "counter.asm").read_text(encoding="utf-8"))
+    a = analyze(memory)
+    assert not a.unknown_code
+    assert a.reachable == frozenset(range(13))
+    assert a.data == {labels["ZERO"], labels["ONE"], labels["N"], labels["I"]}
+    assert a.dynamic == {labels["N"], labels["I"]}
+    assert a.halts == {12}
+    assert not a.illegal and not a.infinite_loops
+    assert labels["PRINT"] in a.leaders
+    loop = a.blocks[labels["PRINT"] + 2]
+    assert set(loop.successors) == {labels["PRINT"], 12}
+
+
+def test_unreachable_code_after_halt():
+    a = analyze_src("HLT\nLDA 5\nOUT")
+    assert a.reachable == {0}
+    assert {1, 2} <= a.unreachable
+
+
+def test_branch_with_constant_condition_is_pruned():
+    # LDA ZERO rende l'accumulatore costante: BRZ salta sempre e OUT non è raggiungibile
+    a = analyze_src("LDA ZERO\nBRZ END\nOUT\nEND HLT\nZERO DAT 0")
+    assert 2 not in a.reachable
+    assert a.halts == {3}
+
+
+def test_guaranteed_infinite_loop():
+    a = analyze_src("L LDA ONE\nBRP L\nHLT\nONE DAT 1")
+    assert [loop.cells for loop in a.infinite_loops] == [(0, 1)]
+    assert a.infinite_loops[0].entry == 0
+    assert not a.can_halt
+
+
+def test_loop_with_input_is_not_reported():
+    a = analyze_src("L INP\nBRZ END\nBRA L\nEND HLT")
+    assert not a.infinite_loops
+    assert a.can_halt
+
+
+def test_loop_whose_exit_depends_on_sta_is_not_reported():
+    a = analyze_src("L LDA X\nSUB ONE\nSTA X\nBRP L\nHLT\nONE DAT 1\nX DAT 3")
+    assert not a.infinite_loops
+    assert a.halts == {4}
+
+
+def test_illegal_landing_by_fall_through():
+    a = analyze_src("INP\nOUT\nDAT 450")
+    assert a.illegal == {2}
+    assert not a.can_halt
+
+
+def test_self_modifying_with_constant_store():
+    # la STA scrive un HLT costante nella cella successiva
+    a = analyze_src("LDA H\nSTA NEXT\nNEXT OUT\nBRA NEXT\nH DAT 0")
+    assert not a.unknown_code
+    assert 2 in a.dynamic
+    assert 2 in a.halts
+
+
+def test_self_modifying_with_unknown_store():
+    a = analyze_src("INP\nSTA NEXT\nNEXT DAT 0")
+    assert a.unknown_code
+    assert a.can_halt
+
+
+def test_check_program():
+    check_program(ASM.assemble_source("INP\nOUT\nHLT"))
+    with pytest.raises(ProgramRejected):
+        check_program(ASM.assemble_source("L BRA L"))
+    with pytest.raises(ProgramRejected):
+        check_program(ASM.assemble_source("INP\nDAT 450"))
+
+
+def test_precompile_leaders():
+    memory = ASM.assemble_file(str(ROOT / "examples" / "multiplication.lmc"))
+    m = CompiledLMC()
+    m.reset(memory=memory, inputs=[6, 7])
+    m.precompile(analyze(memory).leaders)
+    compiled = set(m._blocks)
+    m.run()
+    assert list(m.output_queue) == [42]
+    assert set(m._blocks) == compiled
+
+
+def test_grade_precheck_rejects_without_running():
+    programs = [
+        Program("loop", "L BRA L", [Case([], [])]),
+        Program("ok", "INP\nOUT\nHLT", [Case([4], [4])]),
+    ]
+    results = {r.program: r for r in grade(programs, workers=0, precheck=True)}
+    assert results["loop"].error == "ProgramRejected"
+    assert results["loop"].steps == 0 and not results["loop"].passed
+    assert results["ok"].passed
+    # senza precheck lo stesso programma viene eseguito fino al limite di passi
+    results = {r.program: r for r in grade(programs, workers=0, max_steps=50)}
+    assert results["loop"].steps == 50 and results["loop"].error is None
@@ -0,0 +1,68 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, AssemblerError
+from lmc.assembler import Diagnostic
+
+
+def test_all_errors_collected_with_columns():
+    src = "start: LDA x\n  l: FOO 3\nADD 120\n  BRA nowhere // fine\nx DAT"
+    with pytest.raises(AssemblerError) as info:
+        Assembler().assemble_source(src)
+    errors = info.value.errors
+    assert [(d.line, d.column, d.end_column) for d in errors] == [(2, 6, 9), (3, 5, 8), (4, 7, 14)]
+    assert "istruzione sconosciuta 'FOO'" in errors[0].message
+    assert "indirizzo fuori range 120" in errors[1].message
+    assert "etichetta sconosciuta 'nowhere'" in errors[2].message
+    assert str(info.value).startswith("Linea 2, colonna 6:")
+    assert "altri 2 errori" in str(info.value)
+
+
+def test_label_and_argument_spans():
+    asm = Assembler()
+    (d,) = asm.check("loop: ADD 1 2")
+    assert (d.column, d.end_column, d.message) == (13, 14, "troppi argomenti")
+    dup = asm.check("a DAT\na DAT")
+    assert [(x.line, x.column, x.end_column) for x in dup] == [(2, 1, 2)]
+    (d,) = asm.check("  x: DAT 1000")
+    assert (d.column, d.end_column) == (10, 14)
+
+
+def test_check_valid_source_is_empty():
+    assert Assembler().check("INP\nOUT\nHLT") == []
+
+
+def test_program_too_long_reported_once():
+    src = "\n".join(["OUT"] * 105 + ["BAD"])
+    errors = Assembler().check(src)
+    assert [d.line for d in errors] == [101]
+    assert "troppo lungo" in errors[0].message
+
+
+def test_assemble_many_matches_single():
+    asm = Assembler()
+    sources = ["INP\nSTA 9\nOUT\nHLT", "LDA 1\nq: FOO", "b: BRA b", "LDA k\nk DAT 7"]
+    results = list(asm.assemble_many(sources))
+    assert results[0] == asm.assemble_source(sources[0])
+    assert isinstance(results[1], AssemblerError)
+    assert results[1].errors == [Diagnostic(2, 4, 7, "istruzione sconosciuta 'FOO'")]
+    assert results[2] == asm.assemble_source(sources[2])
+    assert results[3] == asm.assemble_source(sources[3])
+    # i buffer riusati non contaminano i risultati precedenti
+    assert results[0] != results[3]
+
+
+def test_examples_unchanged():
+    asm = Assembler()
+    for path in sorted((ROOT / "examples").iterdir()):
+        if path.stem.endswith("_wide"):
+            continue
+        mem, labels, lines = asm.assemble_program(path.read_text(encoding="utf-8"))
+        assert len(mem) == 100 and len(lines) == 100
+        assert all(0 <= v <= 999 for v in mem)
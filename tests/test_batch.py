@@ -0,0 +1,74 @@
+# Francesco Falcon SM3201408
+
+import random
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lmc import Assembler, LMC, IllegalInstructionError, InputUnderflowError
+from lmc.batch import BatchLMC
+
+
+def scalar(mem, inputs, max_steps):
+    m = LMC()
+    m.reset(memory=mem, inputs=inputs)
+    try:
+        steps = m.run(max_steps)
+        reason = "step_limit" if steps == max_steps else "halted"
+    except InputUnderflowError:
+        steps, reason = None, "input_underflow"
+    except IllegalInstructionError:
+        steps, reason = None, "illegal_instruction"
+    return m, steps, reason
+
+
+def assert_lanes_match(mem, inputs, max_steps):
+    batch = BatchLMC(mem, inputs)
+    batch.run(max_steps)
+    for lane, inp in enumerate(inputs):
+        m, steps, reason = scalar(mem, inp, max_steps)
+        assert batch.reason(lane) == reason
+        if steps is not None:
+            assert batch.steps[lane] == steps
+        assert batch.outputs(lane) == list(m.output_queue)
+        assert batch.pc[lane] == m.pc
+        assert batch.accumulator[lane] == m.accumulator
+        assert bool(batch.flag[lane]) == m.flag
+        assert batch.memory[lane].tolist() == m.memory
+
+
+def test_batch_matches_scalar_on_examples():
+    asm = Assembler()
+    rng = random.Random(0)
+    mul = asm.assemble_file(str(ROOT / "examples" / "multiplication.lmc"))
+    assert_lanes_match(mul, [[rng.randrange(40), rng.randrange(40)] for _ in range(50)] + [[3]], 2000)
+    counter = asm.assemble_file(str(ROOT / "examples" / "counter.asm"))
+    assert_lanes_match(counter, [[n] for n in range(0, 1000, 37)], 500)
+    quine = asm.assemble_file(str(ROOT / "examples" / "quine.lmc"))
+    assert_lanes_match(quine, [[]] * 3, 1000)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_matches_scalar_on_random_programs(seed):
+    rng = random.Random(seed)
+    mem = [rng.choice([1, 2, 3, 5, 6, 7, 8]) * 100 + rng.randrange(100) if rng.random() < 0.8
+           else rng.choice([0, 901, 902, 450, 903]) for _ in range(100)]
+    inputs = [[rng.randrange(1000) for _ in range(rng.randrange(5))] for _ in range(30)]
+    assert_lanes_match(mem, inputs, rng.choice([1, 20, 300]))
+
+
+def test_batch_resumes_after_step_limit():
+    mem = Assembler().assemble_file(str(ROOT / "examples" / "counter.asm"))
+    batch = BatchLMC(mem, [[2], [5]])
+    batch.run(10)
+    assert batch.reason(0) == "step_limit"
+    batch.run(1000)
+    assert batch.outputs(0) == [0, 1, 2]
+    assert batch.outputs(1) == [0, 1, 2, 3, 4, 5]
+    assert batch.reason(1) == "halted"
@@ -0,0 +1,83 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.runner import BenchResult, compare, load, measure, percentile, recheck, save
+from benchmarks.workloads import Workload, assembly_corpus, multiply_kernel, standard_workloads
+from lmc import Assembler, LMC
+
+
+def _result(name="w", rate=1000.0, peak=10.0, work=100):
+    return BenchResult(name, "istruzioni", work, rate, 1.0, 2.0, peak, 5)
+
+
+def test_percentile_nearest_rank():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 0.5) == 50.0
+    assert percentile(samples, 0.99) == 99.0
+    assert percentile([3.0], 0.99) == 3.0
+
+
+def test_compare_flags_only_changes_beyond_tolerance():
+    baseline = {"a": _result("a"), "b": _result("b"), "c": _result("c")}
+    current = [
+        _result("a", rate=850.0),               # -15%: entro la tolleranza
+        _result("b", rate=700.0, peak=13.0),    # -30% e +30%
+        _result("c", work=200),                 # carico diverso
+        _result("nuovo", rate=1.0),             # assente dal riferimento
+    ]
+    regs = compare(current, baseline, tolerance=0.2)
+    assert [(r.name, r.metric) for r in regs] == [("b", "rate"), ("b", "peak_kib"), ("c", "work")]
+
+
+def test_save_load_roundtrip(tmp_path):
+    path = tmp_path / "bench.json"
+    save([_result("x"), _result("y", rate=5.0)], str(path))
+    loaded = load(str(path))
+    assert loaded["y"] == _result("y", rate=5.0)
+    assert not compare([_result("x")], loaded)
+
+
+def test_measure_counts_work_and_latency():
+    calls = []
+    result = measure(Workload("conta", "casi", lambda: calls.append(1) or 7), repeat=4, warmup=1)
+    assert len(calls) == 6  # riscaldamento + 4 misure + tracemalloc
+    assert result.work == 7 and result.runs == 4
+    assert result.p50_ms <= result.p99_ms and result.rate > 0
+
+
+def test_measure_repeats_short_workloads_up_to_min_sample():
+    calls = []
+    result = measure(Workload("breve", "casi", lambda: calls.append(1) or 3), repeat=4, warmup=1, min_sample_ms=1.0)
+    assert result.loops > 1
+    # riscaldamento + calibrazione + 4 campioni da `loops` esecuzioni + tracemalloc
+    assert len(calls) == 3 + 4 * result.loops
+    assert result.work == 3 and result.runs == 4
+
+
+def test_recheck_confirms_only_repeated_regressions(monkeypatch):
+    # nuove misure in ordine di nome: lento 400, rumore 950, poi lento 300
+    rates = iter([400.0, 950.0, 300.0])
+    monkeypatch.setattr("benchmarks.runner.measure", lambda w, *args: _result(w.name, rate=next(rates)))
+    baseline = {"lento": _result("lento"), "rumore": _result("rumore")}
+    workloads = [Workload("rumore", "istruzioni", lambda: 100), Workload("lento", "istruzioni", lambda: 100)]
+    first = [_result("rumore", rate=500.0), _result("lento", rate=500.0)]
+    current, regs = recheck(workloads, first, baseline, tolerance=0.2, rounds=2)
+    # "lento" resta sotto la tolleranza a ogni tentativo, "rumore" no
+    assert [(r.name, r.metric) for r in regs] == [("lento", "rate")]
+    assert [r.rate for r in current] == [950.0, 400.0]
+
+
+def test_generated_workloads_are_deterministic():
+    m = LMC()
+    m.reset(memory=Assembler().assemble_source(multiply_kernel(7, 6, 3)))
+    m.run(100000)
+    assert list(m.output_queue) == [42]
+    assert assembly_corpus(30, seed=1) == assembly_corpus(30, seed=1)
+    names = [w.name for w in standard_workloads(scale=0.01)]
+    assert "kernel:multiply" in names and "assemble:corpus" in names and "grading:batch" in names
+    baseline = load(str(ROOT / "benchmarks" / "baseline.json"))
+    assert set(names) == set(baseline)
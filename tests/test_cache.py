@@ -0,0 +1,85 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, AssemblerError, CLASSIC, WIDE
+from lmc.cache import AssemblyCache, source_key
+
+SUM2 = (ROOT / "examples" / "sum2.asm").read_text(encoding="utf-8")
+
+
+def test_lru_hits_and_eviction():
+    cache = AssemblyCache(maxsize=2)
+    expected = Assembler().assemble_source(SUM2)
+    assert cache.assemble(SUM2) == expected
+    assert cache.assemble(SUM2.replace("\n", "\r\n") + "   \n") == expected  # stessa chiave normalizzata
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.assemble("HLT")
+    cache.assemble("OUT\nHLT")  # supera maxsize: SUM2 esce dalla LRU
+    cache.assemble(SUM2)
+    assert cache.misses == 4
+
+
+def test_returned_memory_is_a_copy():
+    cache = AssemblyCache()
+    cache.assemble(SUM2)[0] = 0
+    assert cache.assemble(SUM2) == Assembler().assemble_source(SUM2)
+
+
+def test_disk_cache_shared_between_instances(tmp_path):
+    first = AssemblyCache(directory=str(tmp_path))
+    mem = first.assemble(SUM2)
+    files = list(tmp_path.rglob("*.lmci"))
+    assert [f.stem for f in files] == [source_key(SUM2)]
+    assert not list(tmp_path.rglob(".tmp-*"))
+
+    second = AssemblyCache(directory=str(tmp_path))
+    assert second.assemble(SUM2) == mem
+    assert second.stats() == {"hits": 0, "disk_hits": 1, "misses": 0, "size": 1}
+
+
+def test_corrupted_disk_entry_is_a_miss(tmp_path):
+    cache = AssemblyCache(directory=str(tmp_path))
+    cache.assemble(SUM2)
+    next(tmp_path.rglob("*.lmci")).write_bytes(b"garbage")
+    fresh = AssemblyCache(directory=str(tmp_path))
+    assert fresh.assemble(SUM2) == Assembler().assemble_source(SUM2)
+    assert fresh.misses == 1
+
+
+def test_errors_are_not_cached():
+    cache = AssemblyCache()
+    for _ in range(2):
+        with pytest.raises(AssemblerError):
+            cache.assemble("FOO 1")
+    assert cache.stats()["size"] == 0
+
+
+def test_wide_cache_with_directory_shared_with_classic(tmp_path):
+    wide = AssemblyCache(directory=str(tmp_path), assembler=Assembler(WIDE))
+    classic = AssemblyCache(directory=str(tmp_path))
+    assert wide.assemble(SUM2) == Assembler(WIDE).assemble_source(SUM2)
+    assert classic.assemble(SUM2) == Assembler().assemble_source(SUM2)
+    # la cache classica ha scritto su disco: la WIDE non legge quell'immagine
+    fresh = AssemblyCache(directory=str(tmp_path), assembler=Assembler(WIDE))
+    assert len(fresh.assemble(SUM2)) == 1000 and fresh.misses == 1
+    assert len(list(tmp_path.rglob("*.lmci"))) == 1
+
+
+def test_keys_are_profile_aware_across_caches():
+    assert source_key(SUM2) == source_key(SUM2, CLASSIC) != source_key(SUM2, WIDE)
+    assert source_key(SUM2 + "\n\n", WIDE) == source_key(SUM2, WIDE)
+    from lmc.server import program_key
+    assert program_key(SUM2, WIDE).hex() == source_key(SUM2, WIDE)
+    # a parità di sorgente ogni profilo ottiene la propria memoria
+    src = "LDA V\nOUT\nHLT\nV DAT 5000"  # valido solo nel profilo esteso
+    wide = AssemblyCache(assembler=Assembler(WIDE))
+    assert wide.assemble(src)[3] == 5000
+    with pytest.raises(AssemblerError):
+        AssemblyCache().assemble(src)
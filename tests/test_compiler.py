@@ -0,0 +1,78 @@
+# Francesco Falcon SM3201408
+
+import random
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC, IllegalInstructionError, InputUnderflowError
+from lmc.compiler import CompiledLMC, block_cells
+
+
+def random_program(rng: random.Random):
+    mem = []
+    for _ in range(100):
+        r = rng.random()
+        if r < 0.8:
+            mem.append(rng.choice([1, 2, 3, 5, 6, 7, 8]) * 100 + rng.randrange(100))
+        elif r < 0.9:
+            mem.append(rng.choice([901, 902]))
+        else:
+            mem.append(rng.randrange(1000))
+    return mem
+
+
+def final_state(machine, max_steps):
+    try:
+        steps, error = machine.run(max_steps), None
+    except (IllegalInstructionError, InputUnderflowError) as e:
+        steps, error = None, type(e)
+    return (steps, error, machine.pc, machine.accumulator, machine.flag,
+            list(machine.memory), list(machine.output_queue), list(machine.input_queue))
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_compiled_matches_interpreter(seed):
+    rng = random.Random(seed)
+    mem = random_program(rng)
+    inputs = [rng.randrange(1000) for _ in range(rng.randrange(6))]
+    max_steps = rng.choice([0, 3, 50, 2000])
+    ref, comp = LMC(), CompiledLMC()
+    ref.reset(memory=mem, inputs=inputs)
+    comp.reset(memory=mem, inputs=inputs)
+    assert final_state(comp, max_steps) == final_state(ref, max_steps)
+
+
+def test_self_modifying_examples_reuse_cache():
+    asm = Assembler()
+    cases = [
+        ("quine.lmc", []),
+        ("exec.lmc", [901, 902, 705, 600, 0, 4, 5, 6, 7, 8, 9, 0]),
+    ]
+    for name, inputs in cases:
+        mem = asm.assemble_file(str(ROOT / "examples" / name))
+        comp = CompiledLMC()
+        for _ in range(3):  # la cache deve restare coerente tra reset successivi
+            ref = LMC()
+            ref.reset(memory=mem, inputs=inputs)
+            comp.reset(memory=mem, inputs=inputs)
+            assert final_state(comp, 10000) == final_state(ref, 10000)
+
+
+def test_budget_split_inside_block():
+    mem = Assembler().assemble_source("L LDA 9\nADD 9\nADD 9\nBRA L")
+    for budget in range(10):
+        ref, comp = LMC(), CompiledLMC()
+        ref.reset(memory=mem)
+        comp.reset(memory=mem)
+        assert final_state(comp, budget) == final_state(ref, budget)
+
+
+def test_block_cells_stop_at_terminator():
+    mem = Assembler().assemble_source("LDA 5\nADD 5\nOUT\nHLT")
+    assert block_cells(mem, 0) == [0, 1, 2]
+    assert block_cells(mem, 3) == [3]
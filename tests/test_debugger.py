@@ -0,0 +1,117 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, CompiledLMC, LMC, WIDE
+from lmc.debugger import ACCUMULATOR, BREAK, READ, WRITE, Debugger
+from lmc.machine import BREAKPOINT, HALTED, STEP_LIMIT
+from lmc.profiler import Profile
+
+ASM = Assembler()
+COUNTER = ASM.assemble_program((ROOT / "examples" / "counter.asm").read_text(encoding="utf-8"))
+
+
+def _machine(cls=LMC, n=5):
+    memory, labels, _ = COUNTER
+    m = cls()
+    m.reset(memory=memory, inputs=[n])
+    return m, labels
+
+
+def test_breakpoint_stops_before_instruction_and_resumes():
+    m, labels = _machine()
+    loop = labels["PRINT"]
+    m.break_at(loop)
+    steps = m.run()
+    hit = m.last_break
+    assert hit.kind == BREAK and hit.pc == loop == m.pc and hit.step == steps
+    # ripresa: il breakpoint corrente non scatta subito, il successivo sì
+    m.run()
+    assert m.last_break.kind == BREAK and m.pc == loop
+    m.clear_breakpoints()
+    m.run()
+    assert m.last_break is None
+    assert list(m.output_queue) == [0, 1, 2, 3, 4, 5]
+
+
+def test_conditional_breakpoint_matches_reference_run():
+    m, labels = _machine()
+    m.break_at(labels["PRINT"], lambda acc, mem: mem[labels["I"]] == 3)
+    m.run()
+    assert m.memory[labels["I"]] == 3
+    # stato identico a un'esecuzione passo-passo fino allo stesso punto
+    ref, _ = _machine()
+    for _ in range(m.last_break.step):
+        ref.step()
+    assert (ref.pc, ref.accumulator, ref.flag, ref.memory) == (m.pc, m.accumulator, m.flag, m.memory)
+    assert list(ref.output_queue) == list(m.output_queue)
+
+
+def test_memory_watchpoints():
+    m, labels = _machine()
+    i = labels["I"]
+    m.watch(i)
+    m.run()
+    hit = m.last_break
+    assert hit.kind == WRITE and hit.address == i and hit.value == m.memory[i]
+    m.clear_breakpoints()
+    m.watch(labels["N"], read=True, write=False)
+    m.run()
+    assert m.last_break.kind == READ and m.last_break.address == labels["N"]
+
+
+def test_accumulator_watch_and_execute_reason():
+    m, _ = _machine(n=50)
+    m.watch_accumulator(lambda acc: acc >= 20)
+    res = m.execute(10000)
+    assert res.reason == BREAKPOINT and m.last_break.kind == ACCUMULATOR
+    assert m.accumulator >= 20
+    m.clear_breakpoints()
+    res = m.execute(100000)
+    assert res.reason == HALTED and m.last_break is None
+
+
+def test_break_on_last_budgeted_step_is_reported():
+    m, labels = _machine()
+    m.watch(labels["I"])
+    ref, _ = _machine()
+    ref.watch(labels["I"])
+    ref.run()
+    budget = ref.last_break.step
+    assert m.execute(budget).reason == BREAKPOINT
+    m2, _ = _machine()
+    m2.watch(labels["I"])
+    assert m2.execute(budget - 1).reason == STEP_LIMIT
+
+
+def test_inactive_debugger_uses_fast_path_and_compiled_engine():
+    m, _ = _machine(CompiledLMC, n=10)
+    m.debugger = Debugger()
+    m.run()
+    assert m._blocks and list(m.output_queue) == list(range(11))
+    m2, labels = _machine(CompiledLMC, n=10)
+    m2.break_at(labels["PRINT"])
+    m2.run()
+    assert m2.last_break is not None and not m2._blocks
+
+
+def test_debugger_with_profile_rejected():
+    m, labels = _machine()
+    m.break_at(labels["PRINT"])
+    m.profile = Profile()
+    with pytest.raises(ValueError):
+        m.run()
+
+
+def test_wide_indirect_watch():
+    src = "LDA V\nSTI P\nHLT\nP DAT 700\nV DAT 4242"
+    m = LMC(isa=WIDE)
+    m.reset(memory=Assembler(WIDE).assemble_source(src))
+    m.watch(700)
+    m.run()
+    assert m.last_break.kind == WRITE and m.last_break.value == 4242 and m.pc == 2
@@ -0,0 +1,91 @@
+# Francesco Falcon SM3201408
+
+import random
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC, IllegalInstructionError, InputUnderflowError, MemoryErrorLMC
+
+
+def random_program(rng: random.Random):
+    """Genera una memoria casuale con prevalenza di istruzioni valide."""
+    mem = []
+    for _ in range(100):
+        r = rng.random()
+        if r < 0.75:
+            mem.append(rng.choice([1, 2, 3, 5, 6, 7, 8]) * 100 + rng.randrange(100))
+        elif r < 0.85:
+            mem.append(rng.choice([901, 902]))
+        elif r < 0.9:
+            mem.append(rng.randrange(400, 500))
+        else:
+            mem.append(rng.randrange(1000))
+    return mem
+
+
+def outcome(machine: LMC, runner, max_steps):
+    """Esegue e raccoglie stato finale ed eventuale eccezione."""
+    try:
+        steps, error = runner(max_steps), None
+    except (IllegalInstructionError, InputUnderflowError) as e:
+        steps, error = None, (type(e), getattr(e, "pc", None), getattr(e, "opcode", None))
+    return (
+        steps,
+        error,
+        machine.pc,
+        machine.accumulator,
+        machine.flag,
+        list(machine.memory),
+        list(machine.output_queue),
+        list(machine.input_queue),
+    )
+
+
+def reference_run(machine: LMC):
+    def runner(max_steps):
+        steps = 0
+        while steps < max_steps and machine.step():
+            steps += 1
+        return steps
+    return runner
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_fast_run_matches_step(seed):
+    rng = random.Random(seed)
+    mem = random_program(rng)
+    inputs = [rng.randrange(1000) for _ in range(rng.randrange(6))]
+    max_steps = rng.choice([0, 1, 10, 500])
+
+    ref = LMC()
+    ref.reset(memory=mem, inputs=inputs)
+    fast = LMC()
+    fast.reset(memory=mem, inputs=inputs)
+
+    assert outcome(fast, fast.run, max_steps) == outcome(ref, reference_run(ref), max_steps)
+
+
+def test_fast_run_self_modifying_quine():
+    mem = Assembler().assemble_file(str(ROOT / "examples" / "quine.lmc"))
+    m = LMC()
+    m.reset(memory=mem)
+    m.run()
+    assert list(m.output_queue) == mem[:9]
+
+
+def test_invalid_state_falls_back_to_step():
+    m = LMC()
+    with pytest.raises(MemoryErrorLMC):
+        m.memory[5] = 1500  # rifiutato alla scrittura: le letture non ricontrollano
+    m.memory[0] = 600 + 10
+    m.memory[10] = 0
+    assert m.run() == 1
+    assert m.pc == 10
+    m.pc = 100  # pc non valido: run() ricade su step(), che solleva come passo-passo
+    with pytest.raises(MemoryErrorLMC):
+        m.run()
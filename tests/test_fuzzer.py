@@ -0,0 +1,101 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, CompiledLMC, LMC, LMCPool, WIDE
+from lmc.coverage import BUCKETS, EdgeCoverage
+from lmc.fuzzer import Fuzzer
+from lmc.machine import HALTED, ILLEGAL_INSTRUCTION, INPUT_UNDERFLOW, STEP_LIMIT
+from lmc.profiler import Profile
+
+ASM = Assembler()
+
+
+def example(name):
+    return ASM.assemble_file(str(ROOT / "examples" / name))
+
+
+def _covered(cls, memory, inputs, isa=None):
+    m = cls() if isa is None else cls(isa=isa)
+    m.coverage = EdgeCoverage(m.isa.cells)
+    m.reset(memory=memory, inputs=inputs)
+    res = m.execute(10000)
+    return m, res
+
+
+def test_edges_and_counts_match_the_plain_interpreter():
+    memory = example("counter.asm")
+    m, res = _covered(LMC, memory, [3])
+    plain = LMC()
+    plain.reset(memory=memory, inputs=[3])
+    assert (res.reason, res.outputs, res.steps) == (HALTED, (0, 1, 2, 3), plain.execute(10000).steps)
+    cov = m.coverage
+    # un passaggio su un arco per ogni istruzione eseguita (l'HLT finale non conta)
+    assert sum(cov.bitmap) == res.steps
+    assert (0, 1) in cov.edges()
+    assert dict(cov.buckets())[0 * 100 + 1] == BUCKETS[1] == 1
+    cov.reset()
+    assert cov.edges() == [] and not any(cov.bitmap)
+
+
+def test_buckets_classes():
+    assert [BUCKETS[c] for c in (0, 1, 2, 3, 4, 7, 8, 15, 16, 31, 32, 127, 128, 255)] == [
+        0, 1, 2, 4, 8, 8, 16, 16, 32, 32, 64, 64, 128, 128]
+
+
+def test_wide_compiled_and_conflicts():
+    src = "INP\nSTA P\nLDI P\nOUT\nHLT\nP DAT\nT DAT 11"
+    memory = Assembler(WIDE).assemble_source(src)
+    m, res = _covered(LMC, memory, [6], isa=WIDE)
+    assert res.outputs == (11,) and m.coverage.edges() == [(0, 1), (1, 2), (2, 3), (3, 4)]
+    # il motore compilato passa all'interprete strumentato
+    c, res = _covered(CompiledLMC, example("sum2.asm"), [2, 3])
+    assert res.outputs == (5,) and len(c.coverage.edges()) == 5
+    c.profile = Profile()
+    with pytest.raises(ValueError):
+        c.reset(inputs=[1, 1])
+        c.run()
+    m = LMC()
+    m.coverage = EdgeCoverage(WIDE.cells)
+    m.reset(memory=example("sum2.asm"), inputs=[1, 1])
+    with pytest.raises(ValueError):
+        m.run()
+    pool = LMCPool(size=1)
+    m = pool.acquire(example("sum2.asm"), [1, 2])
+    m.coverage = EdgeCoverage()
+    pool.release(m)
+    assert m.coverage is None
+
+
+def test_fuzzer_finds_and_minimizes_crashes():
+    # il secondo input non nullo fa ciclare per sempre: budget esaurito
+    src = "INP\nOUT\nINP\nL BRZ END\nBRA L\nEND HLT"
+    report = Fuzzer(ASM.assemble_source(src), max_steps=200, seed=1).run(2000)
+    found = {(c.reason, c.inputs) for c in report.crashes}
+    # minimizzati: primo input azzerato, il secondo ridotto a 1
+    assert found == {(INPUT_UNDERFLOW, ()), (INPUT_UNDERFLOW, (0,)), (STEP_LIMIT, (0, 1))}
+    loop = next(c for c in report.crashes if c.reason == STEP_LIMIT)
+    assert len(loop.original) >= 2
+    assert report.executions >= 2000 and report.corpus and report.edges
+
+
+def test_fuzzer_explores_branches_and_is_deterministic():
+    # istruzione illegale raggiungibile solo con il primo input uguale a 999
+    src = "INP\nSUB K\nBRZ BAD\nHLT\nBAD DAT 400\nK DAT 999"
+    memory = ASM.assemble_source(src)
+    first = Fuzzer(memory, seeds=[(998,)], seed=5).run(3000)
+    second = Fuzzer(memory, seeds=[(998,)], seed=5).run(3000)
+    assert first.corpus == second.corpus and first.crashes == second.crashes
+    assert any(c.reason == ILLEGAL_INSTRUCTION and c.inputs == (999,) for c in first.crashes)
+
+
+def test_fuzzer_with_workers():
+    report = Fuzzer(example("counter.asm"), max_steps=3000, workers=2, batch=64).run(1000)
+    assert report.executions >= 1000
+    assert {c.reason for c in report.crashes} == {INPUT_UNDERFLOW, STEP_LIMIT}
+    assert len(report.edges) == 13
@@ -0,0 +1,55 @@
+# Francesco Falcon SM3201408
+
+import json
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lmc.grading import Case, Program, grade, load_manifest
+
+SUM2 = (ROOT / "examples" / "sum2.asm").read_text(encoding="utf-8")
+
+
+def test_grade_in_process_reports_each_case():
+    programs = [
+        Program("sum", SUM2, [Case([1, 2], [3]), Case([5, 5], [11]), Case([1])]),
+        Program("broken", "FOO 1", [Case([])]),
+        Program("loop", "L BRA L", [Case([])]),
+    ]
+    results = {(r.program, r.case): r for r in grade(programs, workers=0, chunk_size=2, max_steps=50)}
+    assert results[("sum", 0)].passed and results[("sum", 0)].steps == 5
+    assert not results[("sum", 1)].passed and results[("sum", 1)].outputs == [10]
+    assert results[("sum", 2)].error == "InputUnderflowError"
+    assert results[("broken", 0)].error == "AssemblerError"
+    assert not results[("loop", 0)].halted and results[("loop", 0)].steps == 50
+
+
+def test_grade_with_process_pool(tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    lines = [
+        {"id": "sum", "path": str(ROOT / "examples" / "sum2.asm"),
+         "cases": [{"inputs": [i, i], "expected": [2 * i]} for i in range(20)]},
+        {"id": "mul", "source": (ROOT / "examples" / "multiplication.lmc").read_text(encoding="utf-8"),
+         "cases": [{"inputs": [3, 4], "expected": [12]}]},
+    ]
+    manifest.write_text("\n".join(json.dumps(l) for l in lines), encoding="utf-8")
+    results = list(grade(load_manifest(str(manifest)), workers=2, chunk_size=8))
+    assert len(results) == 21
+    assert all(r.passed for r in results)
+
+
+def test_grade_keeps_a_bounded_window_of_chunks():
+    pulled = []
+
+    def programs():
+        for i in range(40):
+            pulled.append(i)
+            yield Program(f"p{i}", SUM2, [Case([i, 1], [i + 1])])
+
+    results = grade(programs(), workers=2, chunk_size=8)
+    first = next(results)
+    # finestra di 2 chunk per worker, più quelli ripartiti al primo completamento
+    assert first.passed and len(pulled) <= 8
+    assert len(list(results)) == 39 and len(pulled) == 40
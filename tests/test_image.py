@@ -0,0 +1,92 @@
+# Francesco Falcon SM3201408
+
+import mmap
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC, ImageError, MemoryErrorLMC
+from lmc.image import ImageArchive, ProgramImage, decode_image, encode_image, write_archive
+
+COUNTER = (ROOT / "examples" / "counter.asm").read_text(encoding="utf-8")
+
+
+def test_image_roundtrip_with_debug_info():
+    asm = Assembler()
+    memory, labels, lines = asm.assemble_program(COUNTER)
+    image = decode_image(asm.assemble_image(COUNTER))
+    assert image.memory() == memory
+    assert image.symbols == labels and image.symbols["PRINT"] == 4
+    assert image.lines == lines and image.lines[0] == 2
+
+
+def test_load_image_from_bytes_and_mmap(tmp_path):
+    data = Assembler().assemble_image(COUNTER, debug=False)
+    m = LMC()
+    m.load_image(data, inputs=[3])
+    m.run()
+    assert list(m.output_queue) == [0, 1, 2, 3]
+
+    path = tmp_path / "counter.lmci"
+    path.write_bytes(data)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        m.load_image(mm, inputs=[1])
+    m.run()
+    assert list(m.output_queue) == [0, 1]
+
+
+
+def test_load_image_validates_unverified_program_image():
+    # LDA 3, OUT, HLT, cella 3 = 1500: senza controllo stamperebbe 500
+    m = LMC()
+    with pytest.raises(MemoryErrorLMC):
+        m.load_image(ProgramImage([503, 902, 0, 1500] + [0] * 96))
+    image = decode_image(bytearray(Assembler().assemble_image("LDA V\nOUT\nHLT\nV DAT 5", debug=False)), verify=False)
+    image.cells[3] = 1500
+    with pytest.raises(MemoryErrorLMC):
+        m.load_image(image)
+
+@pytest.mark.parametrize("corrupt", [
+    lambda b: b[:-1],                          # troncata
+    lambda b: b"XXXX" + b[4:],                 # magic
+    lambda b: b[:20] + bytes([b[20] ^ 1]) + b[21:],  # payload alterato -> checksum
+])
+def test_invalid_images_rejected(corrupt):
+    data = encode_image([1] * 100)
+    with pytest.raises(ImageError):
+        decode_image(corrupt(data))
+
+
+def test_encode_rejects_out_of_range():
+    with pytest.raises(ImageError):
+        encode_image([1000] + [0] * 99)
+
+
+def test_archive_roundtrip(tmp_path):
+    asm = Assembler()
+    # gli esempi `*_wide` sono per la geometria estesa, senza formato immagine
+    sources = {p.name: p.read_text(encoding="utf-8") for p in (ROOT / "examples").iterdir() if not p.stem.endswith("_wide")}
+    path = tmp_path / "corpus.lmca"
+    write_archive(str(path), ((name, asm.assemble_image(src)) for name, src in sources.items()))
+    with ImageArchive(str(path)) as archive:
+        assert len(archive) == len(sources)
+        assert list(archive.names()) == list(sources)
+        for name, src in sources.items():
+            assert archive[name].memory() == asm.assemble_source(src)
+        m = LMC()
+        m.load_image(archive["sum2.asm"], inputs=[2, 3])
+    m.run()
+    assert list(m.output_queue) == [5]
+
+
+@pytest.mark.parametrize("cut", [1, 5, 12])
+def test_truncated_archive_index_rejected(tmp_path, cut):
+    path = tmp_path / "corpus.lmca"
+    write_archive(str(path), [("sum2.asm", encode_image([1] * 100))])
+    path.write_bytes(path.read_bytes()[:-cut])
+    with pytest.raises(ImageError):
+        ImageArchive(str(path))
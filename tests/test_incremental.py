@@ -0,0 +1,106 @@
+# Francesco Falcon SM3201408
+
+import random
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, AssemblerError, WIDE
+from lmc.incremental import IncrementalAssembler
+
+COUNTER = (ROOT / "examples" / "counter.asm").read_text(encoding="utf-8")
+
+
+def same_as_full(session, isa=None):
+    asm = Assembler() if isa is None else Assembler(isa)
+    memory, labels, line_map = list(asm._zeros), {}, list(asm._zeros)
+    errors = asm._assemble_into(session.source, memory, line_map, labels, [])
+    assert session.memory == memory
+    assert session.labels == labels
+    assert session.line_map == line_map
+    assert session.diagnostics == errors
+
+
+def test_edit_returns_only_changed_cells():
+    s = IncrementalAssembler("INP\nSTA X\nLDA X\nOUT\nHLT\nX DAT 5")
+    assert s.memory[:6] == [901, 305, 505, 902, 0, 5]
+    assert s.replace_lines(5, 6, "X DAT 7") == {5: 7}
+    # inserire un'istruzione sposta X: cambiano le celle che la usano e quelle spostate
+    diff = s.replace_lines(0, 0, "LDA X")
+    assert diff == {0: 506, 1: 901, 2: 306, 3: 506, 4: 902, 5: 0, 6: 7}
+    assert s.labels == {"X": 6}
+    assert s.replace_lines(0, 1, "") == {0: 901, 1: 305, 2: 505, 3: 902, 4: 0, 5: 7, 6: 0}
+    # commenti e righe vuote non cambiano la memoria, solo la mappa delle linee
+    assert s.replace_lines(0, 0, "// intestazione\n") == {}  # una riga
+    assert s.line_map[:6] == [2, 3, 4, 5, 6, 7] and s.address_of(2) == 0 and s.address_of(1) is None
+    same_as_full(s)
+
+
+def test_diagnostics_and_program():
+    s = IncrementalAssembler(COUNTER)
+    assert s.program() == Assembler().assemble_program(COUNTER)
+    s.replace_lines(1, 2, "        BRA NOWHERE")
+    assert [d.message for d in s.diagnostics] == ["etichetta sconosciuta 'NOWHERE'"]
+    with pytest.raises(AssemblerError):
+        s.program()
+    same_as_full(s)
+    s.replace_lines(1, 2, COUNTER.splitlines()[1])
+    assert s.diagnostics == [] and s.source == "\n".join(COUNTER.splitlines())
+    with pytest.raises(IndexError):
+        s.replace_lines(5, 2, "")
+
+
+def test_hover():
+    s = IncrementalAssembler("START INP\n      BRZ END\n      BRA START\nEND:  HLT")
+    assert s.hover(2, 12) == "END = 3 (cella: 0)"
+    assert s.hover(1, 2) == "START = 0 (cella: 901)"
+    assert s.hover(2, 8) == "cella 1: 703"
+    s.replace_lines(3, 4, "")
+    assert s.hover(2, 12) == "etichetta sconosciuta 'END'"
+    assert s.hover(9, 1) is None
+
+
+def _random_line(rng):
+    labels = ["A", "B", "C", "LOOP"]
+    r = rng.random()
+    if r < 0.1:
+        return ""
+    if r < 0.15:
+        return "// commento"
+    label = rng.choice(labels) + (":" if rng.random() < 0.3 else "") + " " if rng.random() < 0.3 else ""
+    if r < 0.2:
+        return label.strip() or "X"
+    op = rng.choice(["ADD", "SUB", "STA", "LDA", "BRA", "BRZ", "BRP", "INP", "OUT", "HLT", "DAT", "FOO"])
+    if op in ("INP", "OUT", "HLT"):
+        arg = ""
+    elif op == "DAT":
+        arg = str(rng.choice([0, 7, 999, 1000]))
+    else:
+        arg = rng.choice(labels + ["Z", "12", "150"])
+    return f"{label}{op} {arg}".rstrip()
+
+
+@pytest.mark.parametrize("isa", [None, WIDE])
+def test_random_edits_match_full_assembly(isa):
+    rng = random.Random(7)
+    s = IncrementalAssembler("", isa) if isa is not None else IncrementalAssembler("")
+    for _ in range(400):
+        n = s.line_count
+        start = rng.randint(0, n)
+        end = rng.randint(start, min(n, start + 3))
+        text = "\n".join(_random_line(rng) for _ in range(rng.randint(0, 4)))
+        before = s.memory[:]
+        diff = s.replace_lines(start, end, text)
+        assert diff == {c: v for c, v in enumerate(s.memory) if before[c] != v}
+        same_as_full(s, isa)
+
+
+def test_program_longer_than_memory():
+    s = IncrementalAssembler("\n".join(["INP"] * 100) + "\nEND HLT\nBRA END")
+    assert [d.message for d in s.diagnostics] == ["programma troppo lungo (oltre 100 istruzioni)"]
+    s.replace_lines(0, 2, "")
+    assert s.diagnostics == [] and s.memory[98:] == [0, 698]
+    same_as_full(s)
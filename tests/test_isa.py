@@ -0,0 +1,125 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pickle
+from array import array
+
+import pytest
+
+from lmc import Assembler, AssemblerError, ImageError, LMC, MemoryErrorLMC
+from lmc.isa import CLASSIC, ISA, WIDE, profile
+from lmc.machine import _DECODE, _HLT, _ILLEGAL, _INP, _OUT, _ADD, _BRP
+
+SORT = (ROOT / "examples" / "sort_wide.asm").read_text(encoding="utf-8")
+
+
+def test_classic_is_default_and_decode_unchanged():
+    m = LMC()
+    assert m.isa is CLASSIC and type(m.memory.cells) is list and len(m.memory) == 100
+    assert _DECODE is CLASSIC.decode and len(_DECODE) == 1000
+    assert _DECODE[42] == (_HLT, 0)
+    assert _DECODE[901] == (_INP, 0) and _DECODE[902] == (_OUT, 0)
+    assert _DECODE[199] == (_ADD, 99) and _DECODE[850] == (_BRP, 50)
+    assert _DECODE[450][0] == _ILLEGAL and _DECODE[950][0] == _ILLEGAL
+
+
+def test_wide_sort_fast_and_step_agree():
+    memory = Assembler(WIDE).assemble_source(SORT)
+    assert len(memory) == 1000
+    values = [70000, 5, 99999, 0, 512, 5, 31337]
+    results = []
+    for engine in ("run", "step"):
+        m = LMC(isa=WIDE)
+        m.reset(memory=memory, inputs=[len(values)] + values)
+        assert isinstance(m.memory.cells, array)
+        if engine == "run":
+            m.run(100000)
+        else:
+            while m.step():
+                pass
+        results.append((list(m.output_queue), list(m.memory), m.pc, m.accumulator))
+    assert results[0] == results[1]
+    assert results[0][0] == sorted(values)
+
+
+def test_wide_arithmetic_wraps_on_modulus():
+    asm = Assembler(WIDE)
+    m = LMC(isa=WIDE)
+    m.reset(memory=asm.assemble_source("INP\nADD X\nOUT\nHLT\nX DAT 99999"), inputs=[2])
+    m.run()
+    assert list(m.output_queue) == [1] and not m.flag
+    with pytest.raises(ValueError):
+        m.push_input(100000)
+
+
+def test_indirect_pointer_out_of_range():
+    src = "LDI P\nHLT\nP DAT 5000"
+    for run in (lambda m: m.run(), lambda m: m.step()):
+        m = LMC(isa=WIDE)
+        m.reset(memory=Assembler(WIDE).assemble_source(src))
+        with pytest.raises(MemoryErrorLMC):
+            run(m)
+
+
+def test_wide_assembler_ranges():
+    asm = Assembler(WIDE)
+    mem = asm.assemble_source("LDA 999\nSTI 10\nINP\nOUT")
+    assert mem[:4] == [5999, 9010, 90001, 90002]
+    (d,) = asm.check("LDA 1000")
+    assert "indirizzo fuori range" in d.message
+    assert "DAT fuori range" in asm.check("DAT 100000")[0].message
+    with pytest.raises(AssemblerError):
+        Assembler().assemble_source("LDI 3")
+    with pytest.raises(ImageError):
+        asm.assemble_image("HLT")
+
+
+def test_reset_validates_geometry():
+    m = LMC(isa=WIDE)
+    with pytest.raises(MemoryErrorLMC):
+        m.reset(memory=[0] * 100)
+    with pytest.raises(MemoryErrorLMC):
+        m.reset(memory=[100000] + [0] * 999)
+    with pytest.raises(ImageError):
+        m.load_image(Assembler().assemble_image("HLT"))
+
+
+def test_wide_snapshot_fork_and_loop_detection():
+    asm = Assembler(WIDE)
+    m = LMC(isa=WIDE)
+    m.reset(memory=asm.assemble_source("L LDA X\nADD ONE\nSTA X\nBRA L\nX DAT\nONE DAT 1"))
+    child = m.fork()
+    child.run(40)
+    assert m.memory[4] == 0 and child.memory[4] == 10
+    snap = child.snapshot()
+    m.restore(snap)
+    assert isinstance(m.memory.cells, array) and m.memory[4] == 10
+    looping = LMC(isa=WIDE)
+    looping.reset(memory=asm.assemble_source("L BRA L"))
+    assert looping.execute(1000, detect_loops=True).reason == "non_termination"
+
+
+def test_custom_isa_and_validation():
+    tiny = ISA("tiny", cells=10, modulus=100, opcodes={"ADD": 1, "LDA": 5, "LDI": 4}, io={"OUT": 92})
+    m = LMC(isa=tiny)
+    assert len(m.memory) == 10
+    m.reset(memory=Assembler(tiny).assemble_source("LDA V\nADD V\nOUT\nHLT\nV DAT 60"))
+    m.run()
+    assert list(m.output_queue) == [20]
+    with pytest.raises(ValueError):
+        ISA("bad", cells=10, modulus=100, opcodes={"ADD": 10}, io={})
+    with pytest.raises(ValueError):
+        ISA("bad", cells=10, modulus=100, opcodes={"ADD": 1}, io={"INP": 15})
+    with pytest.raises(ValueError):
+        profile("missing")
+
+
+def test_profiles_survive_pickle():
+    assert pickle.loads(pickle.dumps(CLASSIC)) is CLASSIC
+    assert pickle.loads(pickle.dumps(WIDE)) is WIDE
+    m = pickle.loads(pickle.dumps(LMC(isa=WIDE)))
+    assert m.isa is WIDE
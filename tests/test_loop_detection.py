@@ -0,0 +1,81 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC, NonTerminationDetected
+from lmc.machine import LoopDetector
+
+
+def machine(src, inputs=None):
+    m = LMC()
+    m.reset(memory=Assembler().assemble_source(src), inputs=inputs or [])
+    return m
+
+
+def test_bra_self_detected_immediately():
+    m = machine("INP\nL BRA L", inputs=[4])
+    with pytest.raises(NonTerminationDetected) as e:
+        m.run(max_steps=1_000_000, detect_loops=True)
+    assert e.value.pc == 1
+    assert e.value.period == 1
+    assert e.value.steps < 10
+    assert m.pc == 1 and m.accumulator == 4
+
+
+def test_pure_state_loop_period():
+    # acc alterna tra 0 e 1: periodo di 4 istruzioni (LDA, BRZ, LDA, BRA)
+    src = """
+    TOP LDA ZERO
+        BRZ ONE_
+    ONE_ LDA ONE
+        BRA TOP
+    ZERO DAT 0
+    ONE DAT 1
+    """
+    m = machine(src)
+    with pytest.raises(NonTerminationDetected) as e:
+        m.run(max_steps=1_000_000, detect_loops=True)
+    assert e.value.pc == 0
+    assert e.value.period == 4
+
+
+def test_counter_overflow_loop_detected_and_terminating_program_unaffected():
+    counter = (ROOT / "examples" / "counter.asm").read_text(encoding="utf-8")
+    m = machine(counter, inputs=[999])  # con n=999 il contatore va in overflow e non termina
+    with pytest.raises(NonTerminationDetected):
+        m.run(max_steps=10_000_000, detect_loops=True)
+
+    m = machine(counter, inputs=[20])
+    steps = m.run(detect_loops=True)
+    assert list(m.output_queue) == list(range(21))
+    assert steps == machine(counter, inputs=[20]).run()
+
+
+def test_loop_consuming_input_is_not_reported():
+    m = machine("L INP\nBRA L", inputs=[1, 2, 3])
+    with pytest.raises(Exception) as e:
+        m.run(detect_loops=True)
+    assert not isinstance(e.value, NonTerminationDetected)
+
+
+def test_step_fallback_detects_too():
+    m = machine("L BRA L\nDAT 0")
+    # la memoria è sempre valida: il ciclo con step() si usa solo con pc non valido
+    with pytest.raises(NonTerminationDetected):
+        m._run_steps(1000, LoopDetector())
+
+
+def test_time_limited_execute_reports_same_period_and_steps():
+    # ciclo lungo (5000 passi per periodo): copre più fette di TIME_CHECK_SLICE istruzioni
+    src = "LOOP ADD ONE\nADD ZERO\nADD ZERO\nADD ZERO\nBRA LOOP\nONE DAT 1\nZERO DAT 0"
+    plain = machine(src).execute(max_steps=1_000_000, detect_loops=True)
+    timed = machine(src).execute(max_steps=1_000_000, time_limit=60.0, detect_loops=True)
+    assert plain.reason == timed.reason == "non_termination"
+    assert (plain.error.period, plain.error.steps) == (5000, 10114)
+    assert (timed.error.period, timed.error.steps, timed.steps) == (plain.error.period, plain.error.steps, plain.steps)
@@ -0,0 +1,88 @@
+# Francesco Falcon SM3201408
+
+import sys
+from array import array
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, CompiledLMC, LMC, MemoryErrorLMC, WIDE
+from lmc.memory import GuardedMemory
+
+SUM2 = Assembler().assemble_source("INP\nSTA A\nINP\nADD A\nOUT\nHLT\nA DAT")
+
+
+def test_item_and_slice_writes_are_validated():
+    m = LMC()
+    m.reset(memory=SUM2, inputs=[2, 3])
+    for bad in (1000, -1, 1.0, True, "5"):
+        with pytest.raises(MemoryErrorLMC):
+            m.memory[6] = bad
+    with pytest.raises(MemoryErrorLMC):
+        m.memory[0:2] = [901, 1000]
+    with pytest.raises(MemoryErrorLMC):
+        m.memory[0:2] = [901]  # la memoria ha dimensione fissa
+    assert m.memory == SUM2  # nessuna scrittura parziale
+    m.memory[4:6] = [902, 0]
+    m.run()
+    assert list(m.output_queue) == [5]
+    assert m.memory[:7] == SUM2[:6] + [2] and len(m.memory) == 100
+
+
+def test_assignment_reset_and_constructor_validate():
+    m = LMC()
+    with pytest.raises(MemoryErrorLMC):
+        m.memory = SUM2[:-1] + [1000]
+    with pytest.raises(MemoryErrorLMC):
+        m.reset(memory=[0.5] + [0] * 99)
+    with pytest.raises(MemoryErrorLMC):
+        LMC(memory=[0] * 99)
+    m.memory = tuple(SUM2)
+    assert type(m.memory) is GuardedMemory and type(m.memory.cells) is list
+    assert m.memory == SUM2 and m.memory == tuple(SUM2) and repr(m.memory) == repr(SUM2)
+    assert LMC(memory=SUM2).memory == SUM2
+
+
+def test_wide_memory_and_fork_sharing():
+    m = LMC(isa=WIDE)
+    assert isinstance(m.memory.cells, array) and m.memory == [0] * 1000
+    m.memory[5] = 99999
+    with pytest.raises(MemoryErrorLMC):
+        m.memory[5] = 100000
+    # la memoria di un'altra geometria viene rivalidata: 1000 celle contro 100
+    with pytest.raises(MemoryErrorLMC):
+        m.memory = LMC().memory
+    child = m.fork()
+    assert child.memory.cells is m.memory.cells
+
+
+@pytest.mark.parametrize("isa", [None, WIDE])
+def test_writes_through_the_view_unshare_after_fork(isa):
+    m = LMC() if isa is None else LMC(isa=isa)
+    m.memory[50] = 3
+    c = m.fork()
+    c.memory[50] = 7
+    assert (m.memory[50], c.memory[50]) == (3, 7)
+    m.memory[51:53] = [1, 2]
+    assert c.memory[51:53] == [0, 0] and m.memory[51:53] == [1, 2]
+    # una vista presa prima del fork resta legata alla propria macchina
+    view = m.memory
+    c2 = m.fork()
+    view[0] = 9
+    assert m.memory[0] == 9 and c2.memory[0] == 0
+
+
+@pytest.mark.parametrize("cls", [LMC, CompiledLMC])
+def test_runs_skip_memory_scans(cls, monkeypatch):
+    m = cls()
+    m.reset(memory=SUM2, inputs=[4, 5])
+    # nessuna lettura passa dalla vista controllata durante l'esecuzione
+    monkeypatch.setattr(GuardedMemory, "__getitem__", lambda self, i: pytest.fail("lettura dalla vista"))
+    monkeypatch.setattr(GuardedMemory, "__iter__", lambda self: pytest.fail("scansione della memoria"))
+    assert m.execute().outputs == (9,)
+    m.reset(inputs=[1, 1])
+    while m.step():
+        pass
+    assert list(m.output_queue) == [2]
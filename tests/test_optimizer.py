@@ -0,0 +1,112 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC
+from lmc.grading import Case, Program, grade
+from lmc.optimizer import differential_check, optimize
+
+ASM = Assembler()
+
+
+def run(memory, inputs):
+    m = LMC()
+    m.reset(memory=memory, inputs=inputs)
+    steps = m.run()
+    return list(m.output_queue), steps
+
+
+def test_sta_then_lda_is_removed():
+    src = "INP\nSTA X\nLDA X\nOUT\nHLT\nX DAT"
+    memory = ASM.assemble_source(src)
+    result = optimize(memory)
+    assert result.removed == (2,)
+    assert result.memory[:4] == [901, 304, 902, 0]
+    assert run(result.memory, [7]) == ([7], 3)
+    assert run(memory, [7]) == ([7], 4)
+
+
+def test_redundant_reload_before_out():
+    memory = ASM.assemble_file(str(ROOT / "examples" / "counter.asm"))
+    result = optimize(memory)
+    assert result.removed == (6,)
+    for n in (0, 3, 9):
+        out, steps = run(result.memory, [n])
+        ref_out, ref_steps = run(memory, [n])
+        assert out == ref_out and steps == ref_steps - (n + 1)
+
+
+def test_dead_load_before_load_or_input():
+    src = "LDA X\nINP\nOUT\nLDA X\nLDA Y\nOUT\nHLT\nX DAT 4\nY DAT 5"
+    memory = ASM.assemble_source(src)
+    result = optimize(memory)
+    assert result.removed == (0, 3)
+    assert run(result.memory, [1]) == ([1, 5], 4)
+
+
+def test_flag_is_preserved():
+    # SUB imposta il flag letto da BRP: né SUB né il successivo LDA vanno toccati
+    src = "INP\nSUB TEN\nLDA ONE\nBRP POS\nOUT\nHLT\nPOS LDA TEN\nOUT\nHLT\nONE DAT 1\nTEN DAT 10"
+    memory = ASM.assemble_source(src)
+    result = optimize(memory)
+    assert result.memory == memory
+    assert not differential_check(memory, result.memory, inputs=[[3], [30]])
+
+
+def test_jump_threading():
+    src = "INP\nBRZ A\nOUT\nHLT\nA BRA B\nB2 HLT\nB OUT\nHLT"
+    memory = ASM.assemble_source(src)
+    result = optimize(memory)
+    assert result.retargeted == 1
+    assert result.memory[1] == 706
+    assert run(result.memory, [0]) == ([0], 3)
+
+
+def test_bra_to_next_cell_is_removed():
+    memory = ASM.assemble_source("INP\nBRA N\nN OUT\nHLT")
+    result = optimize(memory)
+    assert result.removed == (1,)
+    assert run(result.memory, [4]) == ([4], 2)
+
+
+def test_code_read_as_data_is_left_alone():
+    # il programma legge la propria istruzione come dato: nessuno spostamento
+    src = "LDA SELF\nSTA X\nSELF LDA X\nOUT\nHLT\nX DAT"
+    memory = ASM.assemble_source(src)
+    result = optimize(memory)
+    assert result.memory == memory and not result.changed
+
+
+def test_self_modifying_programs_are_untouched():
+    for name in ("quine.lmc", "exec.lmc", "screenshot_prog.asm"):
+        memory = ASM.assemble_file(str(ROOT / "examples" / name))
+        assert optimize(memory).memory == memory
+
+
+@pytest.mark.parametrize("name", ["counter.asm", "multiplication.lmc", "sum2.asm"])
+def test_examples_differential(name):
+    memory = ASM.assemble_file(str(ROOT / "examples" / name))
+    result = optimize(memory)
+    assert differential_check(memory, result.memory, samples=100, max_inputs=3, seed=1) == []
+
+
+def test_differential_check_reports_mismatch():
+    original = ASM.assemble_source("INP\nOUT\nHLT")
+    broken = ASM.assemble_source("INP\nHLT")
+    mismatches = differential_check(original, broken, samples=5)
+    assert mismatches
+    assert mismatches[0].original.outputs != mismatches[0].optimized.outputs
+
+
+def test_grade_with_optimizer_counts_fewer_steps():
+    program = Program("p", "INP\nSTA X\nLDA X\nOUT\nHLT\nX DAT", [Case([5], [5])])
+    plain = next(grade([program], workers=0))
+    optimized = next(grade([program], workers=0, optimize=True))
+    assert plain.passed and optimized.passed
+    assert optimized.steps == plain.steps - 1
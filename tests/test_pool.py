@@ -0,0 +1,134 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import threading
+
+import pytest
+
+from lmc import Assembler, CompiledLMC, LMC, LMCPool, MemoryErrorLMC, TrustedImage, WIDE
+
+SUM2 = Assembler().assemble_file(str(ROOT / "examples" / "sum2.asm"))
+
+
+def test_trusted_image_validates_once():
+    image = TrustedImage.from_memory(SUM2)
+    assert image.cells == tuple(SUM2)
+    with pytest.raises(MemoryErrorLMC):
+        TrustedImage.from_memory([0] * 99)
+    with pytest.raises(MemoryErrorLMC):
+        TrustedImage.from_memory([1000] + [0] * 99)
+    with pytest.raises(MemoryErrorLMC):
+        TrustedImage.from_memory([1.5] + [0] * 99)
+    # anche il costruttore valida: niente immagini "fidate" con celle fuori range
+    with pytest.raises(MemoryErrorLMC):
+        TrustedImage(cells=(1000,) + (0,) * 99)
+    with pytest.raises(MemoryErrorLMC):
+        TrustedImage(cells=(0,) * 100, isa=WIDE)
+    assert TrustedImage(cells=SUM2) == image
+
+
+def test_reset_with_trusted_image_copies_in_place():
+    image = TrustedImage.from_memory(SUM2)
+    m = LMC()
+    m.reset(memory=SUM2, inputs=[1, 1])
+    mem = m.memory
+    m.run()
+    m.reset(memory=image, inputs=[4, 5])
+    assert m.memory is mem and m.memory == SUM2
+    m.run()
+    assert list(m.output_queue) == [9]
+    # dopo un fork la memoria condivisa non va sovrascritta
+    child = m.fork()
+    m.reset(memory=image)
+    assert m.memory is not child.memory
+
+
+def test_trusted_image_geometry_checked():
+    wide = TrustedImage.from_memory(Assembler(WIDE).assemble_source("INP\nOUT\nHLT"), WIDE)
+    with pytest.raises(MemoryErrorLMC):
+        LMC().reset(memory=wide)
+    m = LMC(isa=WIDE)
+    m.reset(memory=wide, inputs=[77777])
+    m.run()
+    assert list(m.output_queue) == [77777]
+
+
+def test_inputs_validated_in_bulk():
+    m = LMC()
+    m.reset(memory=SUM2, inputs=(v for v in [1, 2]))
+    assert list(m.input_queue) == [1, 2]
+    with pytest.raises(ValueError):
+        m.reset(inputs=[1, 1000])
+
+
+def test_pool_reuses_and_resets_machines():
+    pool = LMCPool(size=2)
+    image = TrustedImage.from_memory(SUM2)
+    first = pool.acquire(image, [1, 2])
+    first.output_sink = print
+    first.run()
+    pool.release(first)
+    second = pool.acquire(image, [3, 4])
+    assert second is first and pool.created == 1
+    assert second.output_sink is None and not second.output_queue and second.pc == 0
+    second.run()
+    assert list(second.output_queue) == [7]
+    pool.release(second)
+    with pytest.raises(ValueError):
+        pool.release(second)
+    # una macchina estranea viene rifiutata senza scollegarne l'I/O
+    stranger = LMC(output_sink=print)
+    with pytest.raises(ValueError):
+        pool.release(stranger)
+    assert stranger.output_sink is print
+
+    # senza immagine la macchina riciclata non riparte dal programma precedente
+    third = pool.acquire()
+    assert third is first and third.memory == [0] * 100
+    pool.release(third)
+    wide = LMCPool(size=1, factory=lambda: LMC(isa=WIDE))
+    m = wide.acquire()
+    m.memory[3] = 12345
+    wide.release(m)
+    assert wide.acquire().memory == [0] * 1000
+
+
+def test_pool_is_bounded():
+    pool = LMCPool(size=1)
+    m = pool.acquire()
+    assert pool.available == 0
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    pool.release(m)
+    assert pool.available == 1
+
+
+def test_bad_image_returns_machine():
+    pool = LMCPool(size=1)
+    with pytest.raises(MemoryErrorLMC):
+        pool.acquire([5000] * 100)
+    assert pool.available == 1
+
+
+def test_pool_threads_get_correct_results():
+    pool = LMCPool(size=3, factory=CompiledLMC)
+    image = TrustedImage.from_memory(SUM2)
+    errors = []
+
+    def worker(base):
+        for i in range(200):
+            res = pool.execute(image, [base, i])
+            if res.outputs != ((base + i) % 1000,):
+                errors.append((base, i, res.outputs))
+
+    threads = [threading.Thread(target=worker, args=(b,)) for b in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert pool.created <= 3 and pool.available == 3
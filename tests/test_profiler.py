@@ -0,0 +1,108 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC, CompiledLMC, NonTerminationDetected
+from lmc.profiler import Profile
+
+COUNTER = (ROOT / "examples" / "counter.asm").read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def counter():
+    return Assembler().assemble_program(COUNTER)
+
+
+def run_profiled(memory, inputs, cls=LMC):
+    m = cls()
+    m.reset(memory=memory, inputs=inputs)
+    m.profile = Profile()
+    m.run()
+    return m
+
+
+def test_counts_on_counter(counter):
+    memory, labels, _ = counter
+    m = run_profiled(memory, [3])
+    p = m.profile
+    assert list(m.output_queue) == [0, 1, 2, 3]
+    assert p.steps == 36
+    assert p.hits[labels["PRINT"]] == 4
+    assert p.hits[labels["START"]] == 1
+    brp = labels["CHECK"] + 2
+    assert (p.taken[brp], p.not_taken[brp]) == (3, 1)
+    assert p.reads[labels["I"]] == 12 and p.writes[labels["I"]] == 5
+    assert p.writes[labels["N"]] == 1
+    assert p.opcode_histogram() == {"LDA": 13, "STA": 6, "ADD": 4, "SUB": 4, "BRP": 4, "INP": 1, "OUT": 4}
+    assert sum(p.hits) == p.steps
+
+
+def test_hot_loop(counter):
+    memory, labels, _ = counter
+    p = run_profiled(memory, [3]).profile
+    loops = p.hot_loops(memory)
+    assert loops[0]["start"] == labels["PRINT"]
+    assert loops[0]["end"] == labels["CHECK"] + 2
+    assert loops[0]["iterations"] == 3
+    assert loops[0]["steps"] == 32
+
+
+def test_profiled_run_matches_plain(counter):
+    memory = counter[0]
+    plain = LMC()
+    plain.reset(memory=memory, inputs=[9])
+    steps = plain.run()
+    m = run_profiled(memory, [9])
+    assert m.profile.steps == steps
+    assert list(m.output_queue) == list(plain.output_queue)
+    assert (m.pc, m.accumulator, m.flag, m.memory) == (plain.pc, plain.accumulator, plain.flag, plain.memory)
+
+
+def test_compiled_machine_uses_profiler(counter):
+    memory = counter[0]
+    m = run_profiled(memory, [2], cls=CompiledLMC)
+    assert list(m.output_queue) == [0, 1, 2]
+    assert m.profile.steps == 28
+
+
+def test_counters_accumulate_and_reset(counter):
+    memory = counter[0]
+    m = run_profiled(memory, [1])
+    first = m.profile.steps
+    m.reset(memory=memory, inputs=[1])
+    m.run()
+    assert m.profile.steps == 2 * first
+    m.profile.reset()
+    assert m.profile.steps == 0 and not any(m.profile.hits) and not any(m.profile.opcodes)
+
+
+def test_report_maps_to_source(counter):
+    memory, labels, lines = counter
+    p = run_profiled(memory, [3]).profile
+    text = p.report(memory, labels, lines, COUNTER)
+    assert "Istruzioni eseguite: 36" in text
+    assert "PRINT" in text and "BRP PRINT" in text
+    assert "Cicli caldi:" in text
+    # senza informazioni di debug il report resta valido
+    assert "Istruzioni eseguite: 36" in p.report(memory)
+
+
+def test_step_limit_and_loop_detection():
+    memory = Assembler().assemble_source("LOOP BRA LOOP")
+    m = LMC()
+    m.reset(memory=memory)
+    m.profile = Profile()
+    assert m.run(max_steps=50) == 50
+    assert m.profile.hits[0] == 50
+    with pytest.raises(NonTerminationDetected):
+        m.run(detect_loops=True)
+
+
+def test_profile_none_by_default():
+    assert LMC().profile is None
@@ -0,0 +1,67 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC, CompiledLMC, InputUnderflowError, IllegalInstructionError
+from lmc import machine as m_
+
+
+def prepared(src, inputs=None, cls=LMC):
+    m = cls()
+    m.reset(memory=Assembler().assemble_source(src), inputs=inputs or [])
+    return m
+
+
+@pytest.mark.parametrize("cls", [LMC, CompiledLMC])
+def test_execute_reasons(cls):
+    sum2 = (ROOT / "examples" / "sum2.asm").read_text(encoding="utf-8")
+    res = prepared(sum2, [7, 8], cls).execute()
+    assert res.reason == m_.HALTED and res.halted
+    assert res.outputs == (15,) and res.steps == 5 and res.error is None
+
+    res = prepared("L BRA L", cls=cls).execute(max_steps=100)
+    assert res.reason == m_.STEP_LIMIT and res.steps == 100
+
+    res = prepared(sum2, [7], cls).execute()
+    assert res.reason == m_.INPUT_UNDERFLOW and res.steps == 2 and res.pc == 2
+    assert isinstance(res.error, InputUnderflowError)
+
+    res = prepared("LDA 0\nDAT 450", cls=cls).execute()
+    assert res.reason == m_.ILLEGAL_INSTRUCTION and res.steps == 1
+    assert isinstance(res.error, IllegalInstructionError)
+
+    res = prepared("L BRA L", cls=cls).execute(detect_loops=True)
+    assert res.reason == m_.NON_TERMINATION
+
+
+def test_execute_time_limit():
+    res = prepared("L BRA L").execute(max_steps=10**12, time_limit=0.01)
+    assert res.reason == m_.TIME_LIMIT
+    assert res.steps > 0 and res.steps % m_.TIME_CHECK_SLICE == 0
+    assert res.wall_ns >= 10_000_000
+
+
+def test_execute_time_limit_still_reports_halt():
+    res = prepared("OUT\nHLT").execute(time_limit=5)
+    assert res.reason == m_.HALTED and res.outputs == (0,) and res.steps == 1
+
+
+def test_execute_outputs_only_from_this_call():
+    m = prepared("L INP\nOUT\nBRA L", [1, 2])
+    m.output_queue.append(42)
+    res = m.execute()
+    assert res.outputs == (1, 2)
+    assert list(m.output_queue) == [42, 1, 2]
+
+
+def test_execute_outputs_empty_with_output_sink():
+    m = prepared("L INP\nOUT\nBRA L", [1, 2])
+    sink = []
+    m.output_sink = sink.append
+    assert m.execute().outputs == () and sink == [1, 2]
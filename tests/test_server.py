@@ -0,0 +1,137 @@
+# Francesco Falcon SM3201408
+
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import AssemblerError, ServerBusy, ServerError
+from lmc.client import LMCClient
+from lmc.protocol import LENGTH
+from lmc.server import LMCServer
+
+SUM2 = (ROOT / "examples" / "sum2.asm").read_text(encoding="utf-8")
+LOOP = "L BRA L"
+
+
+def test_run_source_assembles_once_and_caches_by_key():
+    with LMCServer() as server, LMCClient(server.address) as client:
+        for a, b in [(1, 2), (600, 500), (0, 0)]:
+            res = client.run_source(SUM2, [a, b])
+            assert res.halted and res.outputs == ((a + b) % 1000,) and res.error == ""
+        # stesso programma con spazi diversi: stessa chiave, nessun nuovo assemblaggio
+        key = client.assemble(SUM2.replace("\n", "   \r\n"))
+        assert client.run(key, [7, 8]).outputs == (15,)
+        stats = client.stats()
+        assert stats["misses"] == 1 and stats["hits"] == 4 and stats["programs"] == 1
+        # il profilo fa parte della chiave
+        assert client.assemble(SUM2, isa="wide") != key
+        assert client.run_source(SUM2, [900, 900], isa="wide").outputs == (1800,)
+
+
+def test_sessions_step_inspect_and_close():
+    with LMCServer() as server:
+        with LMCClient(server.address) as client:
+            sid = client.open(client.assemble(SUM2), [5])
+            first = client.step(sid, 2)
+            assert (first.reason, first.steps, first.pc, first.accumulator) == ("step_limit", 2, 2, 5)
+            assert client.step(sid, 10).reason == "input_wait"
+            # un valore fuori range rifiuta tutta la richiesta: nessun input accodato
+            with pytest.raises(ServerError):
+                client.step(sid, 10, inputs=[6, 1000])
+            assert client.inspect(sid).pending_inputs == 0
+            done = client.step(sid, 10, inputs=[6])
+            assert done.halted and done.outputs == (11,)
+            state = client.inspect(sid)
+            assert (state.pc, state.accumulator, state.steps, state.pending_inputs) == (5, 11, 5, 0)
+            assert state.memory[:5] == [901, 306, 901, 106, 902] and len(state.memory) == 100
+            assert client.stats()["sessions"] == 1
+            client.close_session(sid)
+            with pytest.raises(ServerError):
+                client.inspect(sid)
+            client.open(client.assemble(SUM2))
+        # le sessioni si chiudono con la connessione
+        with LMCClient(server.address) as client:
+            for _ in range(100):
+                if client.stats()["sessions"] == 0:
+                    break
+                time.sleep(0.01)
+            assert client.stats()["sessions"] == 0
+
+
+def test_step_and_time_limits_are_capped_by_the_server():
+    with LMCServer(max_steps=5000, time_limit=0.05) as server, LMCClient(server.address) as client:
+        key = client.assemble(LOOP)
+        assert client.run(key).steps == 5000
+        assert client.run(key, max_steps=123).steps == 123
+        assert client.run(key, max_steps=10 ** 9).steps == 5000
+    with LMCServer(max_steps=10 ** 9, time_limit=0.05) as server, LMCClient(server.address) as client:
+        res = client.run_source(LOOP)
+        assert res.reason == "time_limit" and res.wall_ns < 10 ** 9
+        res = client.run_source(LOOP, time_limit=0.01)
+        assert res.reason == "time_limit" and res.wall_ns < 0.05e9
+
+
+def test_busy_when_workers_and_queue_are_full():
+    with LMCServer(workers=1, queue_size=0, max_steps=10 ** 9, time_limit=0.5) as server:
+        with LMCClient(server.address) as slow, LMCClient(server.address) as fast:
+            key = fast.assemble(LOOP)
+
+            def occupy():
+                while True:
+                    try:
+                        return slow.run(key)
+                    except ServerBusy:
+                        pass
+
+            worker = threading.Thread(target=occupy)
+            worker.start()
+            rejected = False
+            while worker.is_alive() and not rejected:
+                try:
+                    fast.run(key, max_steps=1)
+                except ServerBusy:
+                    rejected = True
+            worker.join()
+            assert rejected and fast.stats()["busy"] >= 1
+            # a coda libera la stessa richiesta passa
+            assert fast.run(key, max_steps=1).steps == 1
+
+
+def test_errors_are_reported_without_closing_the_connection():
+    with LMCServer(max_frame=1024) as server, LMCClient(server.address) as client:
+        with pytest.raises(AssemblerError):
+            client.assemble("FOO 1")
+        with pytest.raises(ServerError):
+            client.run(bytes(32))
+        with pytest.raises(ServerError):
+            client.run_source(SUM2, isa="nessuno")
+        with pytest.raises(ServerError):
+            client.step(42)
+        with pytest.raises(ServerError):
+            client.run_source(SUM2, [1000, 1])  # input fuori range
+        res = client.run_source(SUM2, [1])
+        assert res.reason == "input_underflow" and res.error
+        assert client.run_source(SUM2, [1, 2]).outputs == (3,)
+        # trama oltre il limite: errore e connessione chiusa
+        raw = socket.create_connection(server.address)
+        with raw:
+            raw.sendall(LENGTH.pack(4096))
+            (size,) = LENGTH.unpack(raw.recv(4))
+            assert raw.recv(size)[0] != 0
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="socket Unix non disponibili")
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / "lmc.sock")
+    with LMCServer(path=path) as server:
+        assert server.address == path
+        with LMCClient(path) as client:
+            assert client.run_source(SUM2, [2, 3]).outputs == (5,)
+    assert not Path(path).exists()
@@ -0,0 +1,100 @@
+# Francesco Falcon SM3201408
+
+import pickle
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC, CompiledLMC
+from lmc import machine as m_
+from lmc.coverage import EdgeCoverage
+from lmc.debugger import Debugger
+from lmc.profiler import Profile
+from lmc.trace import TraceRecorder
+
+# prefisso: inizializza una tabella prima del primo INP, poi somma l'input a ogni cella
+SRC = """
+        LDA K
+        STA T0
+        ADD K
+        STA T1
+        INP
+        ADD T0
+        OUT
+        LDA T1
+        STA T0
+        HLT
+K       DAT 5
+T0      DAT 0
+T1      DAT 0
+"""
+MEM = Assembler().assemble_source(SRC)
+
+
+def run_prefix(cls=LMC):
+    m = cls(on_underflow=m_.UNDERFLOW_BLOCK)
+    m.reset(memory=MEM)
+    assert m.execute().reason == m_.INPUT_WAIT  # fermo sul primo INP
+    return m
+
+
+def test_snapshot_restore_and_pickle():
+    m = run_prefix()
+    snap = m.snapshot()
+    clone = pickle.loads(pickle.dumps(snap))
+    assert clone == snap
+    m.push_input(1)
+    m.run()
+    assert list(m.output_queue) == [6]
+    m.restore(clone)
+    m.push_input(2)
+    m.run()
+    assert list(m.output_queue) == [7]
+
+
+@pytest.mark.parametrize("cls", [LMC, CompiledLMC])
+def test_fork_shares_memory_until_first_store(cls):
+    parent = run_prefix(cls)
+    children = [parent.fork() for _ in range(3)]
+    assert all(c.memory.cells is parent.memory.cells for c in children)
+    for i, child in enumerate(children):
+        child.push_input(i)
+        child.run()
+        assert list(child.output_queue) == [5 + i]
+        assert child.memory.cells is not parent.memory.cells  # STA T0 ha forzato la copia
+        assert child.memory[11] == 10
+    assert parent.memory[11] == 5  # il padre non vede le scritture dei figli
+    parent.push_input(100)
+    parent.run()
+    assert list(parent.output_queue) == [105]
+
+
+def test_fork_does_not_share_instrumentation():
+    parent = run_prefix()
+    parent.profile = Profile()
+    parent.trace = TraceRecorder()
+    parent.debugger = Debugger()
+    parent.coverage = EdgeCoverage()
+    sink = []
+    parent.output_sink = sink.append
+    child = parent.fork()
+    assert (child.profile, child.trace, child.debugger, child.coverage) == (None, None, None, None)
+    assert child.output_sink == parent.output_sink
+    child.push_input(1)
+    child.run()
+    # le istruzioni del figlio non finiscono nella copertura del padre
+    assert not parent.coverage.touched and sink == [6]
+
+
+def test_fork_is_picklable_for_workers():
+    child = run_prefix().fork()
+    revived = pickle.loads(pickle.dumps(child.snapshot()))
+    m = LMC()
+    m.restore(revived)
+    m.push_input(3)
+    m.run()
+    assert list(m.output_queue) == [8]
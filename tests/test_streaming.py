@@ -0,0 +1,74 @@
+# Francesco Falcon SM3201408
+
+import itertools
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC, CompiledLMC, InputUnderflowError
+from lmc import machine as m_
+
+ECHO = Assembler().assemble_source("L INP\nOUT\nBRA L")
+
+
+@pytest.mark.parametrize("cls", [LMC, CompiledLMC])
+def test_generator_source_and_sink(cls):
+    seen = []
+    m = cls(input_source=(i % 1000 for i in range(50)), output_sink=seen.append)
+    m.reset(memory=ECHO)
+    with pytest.raises(InputUnderflowError):
+        m.run(max_steps=10**6)
+    assert seen == list(range(50))
+    assert not m.output_queue and m.pc == 0
+
+
+@pytest.mark.parametrize("cls", [LMC, CompiledLMC])
+def test_queue_is_drained_before_source(cls):
+    m = cls(input_source=[3, 4], on_underflow=m_.UNDERFLOW_HALT)
+    m.reset(memory=ECHO, inputs=[1, 2])
+    res = m.execute()
+    assert res.reason == m_.HALTED
+    assert res.outputs == (1, 2, 3, 4)
+
+
+def test_block_policy_suspends_and_resumes():
+    pending = []
+    m = LMC(input_source=lambda: pending.pop(0) if pending else None, on_underflow=m_.UNDERFLOW_BLOCK)
+    m.reset(memory=ECHO)
+    res = m.execute()
+    assert res.reason == m_.INPUT_WAIT and res.steps == 0 and m.pc == 0
+    pending.extend([7, 8])
+    res = m.execute()
+    assert res.reason == m_.INPUT_WAIT and res.outputs == (7, 8)
+    m.push_input(9)
+    assert m.execute().outputs == (9,)
+
+
+def test_iter_outputs_constant_memory():
+    m = LMC(on_underflow=m_.UNDERFLOW_HALT)
+    m.reset(memory=ECHO)
+    total = 0
+    for i, value in enumerate(m.iter_outputs(itertools.islice(itertools.cycle(range(1000)), 30000), max_steps=10**6)):
+        assert value == i % 1000
+        assert len(m.output_queue) == 0
+        total += 1
+    assert total == 30000
+    assert m.output_sink is None
+
+
+def test_source_values_are_validated():
+    m = LMC(input_source=[1000])
+    m.reset(memory=ECHO)
+    with pytest.raises(ValueError):
+        m.run()
+
+
+def test_loop_detection_accounts_for_stream_position():
+    # lo stato (pc, acc) si ripete ma ogni giro consuma input: non è un ciclo infinito certo
+    m = LMC(input_source=itertools.repeat(5))
+    m.reset(memory=Assembler().assemble_source("L INP\nBRA L"))
+    assert m.run(max_steps=5000, detect_loops=True) == 5000
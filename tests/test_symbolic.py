@@ -0,0 +1,122 @@
+# Francesco Falcon SM3201408
+
+import itertools
+import random
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC, WIDE
+from lmc.machine import HALTED, INPUT_UNDERFLOW, NON_TERMINATION, STEP_LIMIT
+from lmc.symbolic import UNKNOWN, SymValue, explore
+
+ASM = Assembler()
+
+
+def example(name):
+    return ASM.assemble_file(str(ROOT / "examples" / name))
+
+
+def concrete(memory, values, max_steps=10000, isa=None):
+    m = LMC() if isa is None else LMC(isa=isa)
+    m.reset(memory=memory, inputs=list(values))
+    return m.execute(max_steps)
+
+
+def test_counter_every_n_in_one_exploration():
+    r = explore(example("counter.asm"), [(0, 999)], max_steps=50000)
+    assert r.complete and len(r.paths) == 1000
+    # n=999: I torna a 0 dopo 999 e N-I non è mai negativo
+    assert [p.inputs for p in r.diverging] == [((999, 999),)]
+    assert r.check(lambda v: range(v[0] + 1)) == (999,)
+    for n in (0, 1, 500, 998):
+        p = r.lookup([n])
+        res = concrete(example("counter.asm"), [n])
+        assert p.reason == HALTED and p.evaluate([n]) == res.outputs and p.steps == res.steps
+
+
+def test_sum_is_a_single_symbolic_path():
+    r = explore(example("sum2.asm"), [(0, 999), (0, 999)])
+    assert r.terminates and len(r.paths) == 1
+    (out,) = r.paths[0].outputs
+    assert isinstance(out, SymValue) and str(out) == "(x0 + x1) mod 1000"
+    assert r.paths[0].output_bounds() == ((0, 999),)
+    assert r.paths[0].evaluate([600, 500]) == (100,)
+
+
+def test_multiplication_forks_only_on_the_loop_counter():
+    memory = example("multiplication.lmc")
+    r = explore(memory, [(0, 999), (0, 999)])
+    assert r.terminates and len(r.paths) == 1000
+    rng = random.Random(3)
+    for _ in range(50):
+        a, b = rng.randrange(1000), rng.randrange(1000)
+        assert r.lookup([a, b]).evaluate([a, b]) == concrete(memory, [a, b], 100000).outputs == ((a * b) % 1000,)
+
+
+def test_divergence_proof_and_join():
+    src = "INP\nL BRZ END\nBRA L\nEND HLT"
+    r = explore(ASM.assemble_source(src), [(0, 999)])
+    assert [(p.inputs, p.reason) for p in r.paths] == [(((0, 0),), HALTED), (((1, 999),), NON_TERMINATION)]
+    # i due rami del BRZ si ricongiungono con lo stesso stato: un solo dominio
+    src = "INP\nBRZ Z\nLDA ONE\nBRA J\nZ LDA ONE\nJ OUT\nHLT\nONE DAT 1"
+    r = explore(ASM.assemble_source(src), [(0, 999)])
+    assert [(p.inputs, p.outputs) for p in r.paths] == [(((0, 999),), (1,))]
+
+
+def test_limits_and_input_specs():
+    memory = example("counter.asm")
+    r = explore(memory, [(0, 999)], max_paths=10)
+    assert not r.complete and r.paths[-1].reason == UNKNOWN
+    assert sum(p.size for p in r.paths) == 1000
+    assert explore(memory, [3], max_steps=5).paths[0].reason == STEP_LIMIT
+    assert explore(memory, []).paths[0].reason == INPUT_UNDERFLOW
+    with pytest.raises(ValueError):
+        explore(memory, [(5, 1000)])
+
+
+def test_wide_indirect_load_with_symbolic_pointer():
+    src = "INP\nSTA P\nLDI P\nOUT\nHLT\nP DAT\nT DAT 11\nDAT 22\nDAT 33"
+    memory = Assembler(WIDE).assemble_source(src)
+    r = explore(memory, [(6, 8)], isa=WIDE)
+    assert [(p.inputs, p.outputs) for p in r.paths] == [(((6, 6),), (11,)), (((7, 7),), (22,)), (((8, 8),), (33,))]
+
+
+def _random_program(rng):
+    n = rng.randint(4, 12)
+    mem = [0] * 100
+    for i in range(n):
+        r = rng.random()
+        if r < 0.15:
+            mem[i] = 901
+        elif r < 0.25:
+            mem[i] = 902
+        elif r < 0.3:
+            mem[i] = 0
+        else:
+            mem[i] = rng.choice([100, 200, 300, 500, 600, 700, 800]) + rng.randrange(n + 4)
+    for i in range(n, n + 4):
+        mem[i] = rng.randrange(1000)
+    return mem
+
+
+def test_differential_against_concrete_runs():
+    rng = random.Random(0)
+    for _ in range(120):
+        memory = _random_program(rng)
+        spec = []
+        for _ in range(rng.randint(0, 2)):
+            lo = rng.choice([0, 990, rng.randrange(1000)])
+            spec.append((lo, min(999, lo + rng.randint(0, 9))))
+        r = explore(memory, spec, max_steps=200)
+        for values in itertools.product(*(range(lo, hi + 1) for lo, hi in spec)):
+            p = r.lookup(values)
+            res = concrete(memory, values, 200)
+            if p.reason == NON_TERMINATION:
+                assert res.reason == STEP_LIMIT
+            else:
+                assert (p.reason, p.evaluate(values)) == (res.reason, res.outputs), (memory, values)
@@ -0,0 +1,162 @@
+# Francesco Falcon SM3201408
+
+import sys
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from lmc import Assembler, LMC, CompiledLMC, LMCError, IllegalInstructionError
+from lmc.profiler import Profile
+from lmc.trace import TraceRecorder, load_trace
+
+MULT = Assembler().assemble_file(str(ROOT / "examples" / "multiplication.lmc"))
+
+
+def reference_states(memory, inputs, n):
+    """Snapshot prima di ogni passo 0..n ottenuti con step()."""
+    m = LMC()
+    m.reset(memory=memory, inputs=inputs)
+    states = [m.snapshot()]
+    for _ in range(n):
+        m.step()
+        states.append(m.snapshot())
+    return states
+
+
+def traced(memory, inputs, **kwargs):
+    m = LMC()
+    m.reset(memory=memory, inputs=inputs)
+    m.trace = TraceRecorder(**kwargs)
+    return m
+
+
+def test_trace_does_not_change_execution():
+    plain = LMC()
+    plain.reset(memory=MULT, inputs=[7, 40])
+    steps = plain.run()
+    m = traced(MULT, [7, 40])
+    assert m.run() == steps
+    assert m.snapshot() == plain.snapshot()
+    assert m.trace.total == steps
+
+
+def test_state_at_matches_step_by_step():
+    m = traced(MULT, [3, 25], capacity=64, checkpoint_every=16)
+    n = m.run()
+    states = reference_states(MULT, [3, 25], n)
+    trace = m.trace.trace()
+    assert trace.end == n
+    assert len(trace) == 64
+    for step in range(trace.start, n + 1):
+        assert trace.state_at(step) == states[step]
+
+
+def test_checkpoints_spread_out_with_many_outputs():
+    counter = Assembler().assemble_file(str(ROOT / "examples" / "counter.asm"))
+    m = traced(counter, [60], capacity=512, checkpoint_every=16)
+    n = m.run()
+    trace = m.trace.trace()
+    steps = [step for step, _ in trace.checkpoints]
+    # a coda di output lunga i checkpoint si diradano, sempre a multipli di checkpoint_every
+    assert all(step % 16 == 0 for step in steps[1:])
+    assert max(b - a for a, b in zip(steps, steps[1:])) > 16
+    states = reference_states(counter, [60], n)
+    for step in range(trace.start, n + 1):
+        assert trace.state_at(step) == states[step]
+
+
+def test_ring_buffer_drops_old_steps():
+    m = traced(MULT, [3, 25], capacity=64, checkpoint_every=16)
+    m.run()
+    trace = m.trace.trace()
+    assert trace.start >= trace.first > 0
+    with pytest.raises(IndexError):
+        trace.state_at(trace.first - 1)
+    with pytest.raises(IndexError):
+        trace.record(trace.end)
+
+
+def test_records_decode_executed_instruction():
+    m = traced(MULT, [2, 3])
+    m.run()
+    trace = m.trace.trace()
+    first = trace.record(0)
+    assert (first.pc, first.word, first.accumulator, first.flag) == (0, 901, 0, False)
+    assert [r.pc for r in trace][:4] == [0, 1, 2, 3]
+
+
+def test_resumed_slices_and_external_changes():
+    src = "LOOP INP\nOUT\nBRA LOOP"
+    memory = Assembler().assemble_source(src)
+    m = LMC(on_underflow="block")
+    m.reset(memory=memory, inputs=[1])
+    m.trace = TraceRecorder(capacity=32, checkpoint_every=8)
+    m.run()
+    m.push_input(2)
+    m.push_input(3)
+    m.run()
+    trace = m.trace.trace()
+    assert trace.state_at(trace.end).outputs == (1, 2, 3)
+    # gli input aggiunti dall'esterno compaiono dal passo in cui l'esecuzione è ripresa
+    assert trace.state_at(2).inputs == ()
+    assert trace.state_at(3).inputs == (2, 3)
+    assert trace.state_at(4).inputs == (3,)
+
+
+def test_file_roundtrip(tmp_path):
+    path = tmp_path / "run.lmct"
+    m = LMC()
+    m.reset(memory=MULT, inputs=[7, 90])
+    with TraceRecorder(capacity=128, checkpoint_every=32, path=str(path)) as rec:
+        m.trace = rec
+        n = m.run(max_steps=100)
+        n += m.run()
+    trace = load_trace(str(path))
+    assert trace.first == 0 and trace.end == n
+    states = reference_states(MULT, [7, 90], n)
+    for step in range(0, n + 1, 7):
+        assert trace.state_at(step) == states[step]
+    assert trace.state_at(n) == states[n]
+
+
+def test_load_trace_rejects_garbage(tmp_path):
+    path = tmp_path / "bad.lmct"
+    path.write_bytes(b"NOPE\x01\x00\x00\x00")
+    with pytest.raises(LMCError):
+        load_trace(str(path))
+
+
+def test_illegal_instruction_is_not_recorded():
+    memory = [0] * 100
+    memory[0] = 502
+    memory[1] = 400
+    m = LMC()
+    m.reset(memory=memory)
+    m.trace = TraceRecorder()
+    with pytest.raises(IllegalInstructionError):
+        m.run()
+    assert m.trace.total == 1
+    assert m.trace.trace().state_at(1).pc == 1
+
+
+def test_compiled_machine_records():
+    m = CompiledLMC()
+    m.reset(memory=MULT, inputs=[4, 5])
+    m.trace = TraceRecorder()
+    n = m.run()
+    assert m.trace.total == n
+    assert list(m.output_queue) == [20]
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        TraceRecorder(capacity=100, checkpoint_every=64)
+    m = LMC()
+    m.reset(memory=MULT, inputs=[1, 1])
+    m.trace = TraceRecorder()
+    m.profile = Profile()
+    with pytest.raises(ValueError):
+        m.run()
@@ -0,0 +1,88 @@
+# Francesco Falcon SM3201408
+
+import argparse
+import sys
+from pathlib import Path
+
+# Aggiunge la root del progetto al sys.path per permettere `import lmc`
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lmc import Assembler
+from lmc.analysis import analyze
+from lmc.machine import STEP_LIMIT
+from lmc.symbolic import explore
+
+
+def _cells(cells) -> str:
+    return ", ".join(f"{c:02d}" for c in sorted(cells)) or "-"
+
+
+def _input_spec(text: str):
+    """'7' -> 7, '0:999' -> (0, 999)."""
+    lo, sep, hi = text.partition(":")
+    return (int(lo), int(hi)) if sep else int(lo)
+
+
+def _interval(lo: int, hi: int) -> str:
+    return str(lo) if lo == hi else f"{lo}..{hi}"
+
+
+def symbolic(memory, inputs, max_steps: int, limit: int):
+    """Stampa l'esito dell'esecuzione simbolica per ogni dominio di input."""
+    result = explore(memory, inputs, max_steps=max_steps)
+    print(f"Domini: {len(result.paths)} (stati esplorati: {result.explored})")
+    for path in result.paths[:limit]:
+        domain = ", ".join(f"x{i}={_interval(lo, hi)}" for i, (lo, hi) in enumerate(path.inputs)) or "-"
+        outputs = ", ".join(map(str, path.outputs))
+        print(f"  {domain}: {path.reason}, output [{outputs}]")
+    if len(result.paths) > limit:
+        print(f"  ... altri {len(result.paths) - limit} domini")
+    if result.terminates:
+        print("Termina per tutti gli input")
+    if result.diverging:
+        print(f"Non termina (dimostrato) su {sum(p.size for p in result.diverging)} combinazioni di input")
+    limited = sum(p.size for p in result.paths if p.reason == STEP_LIMIT)
+    if limited:
+        print(f"Budget di istruzioni esaurito su {limited} combinazioni di input")
+    if not result.complete:
+        print("Budget di stati esaurito: i domini 'unknown' vanno verificati eseguendo il programma")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analisi statica di un programma LMC senza eseguirlo")
+    parser.add_argument("asm", help="Percorso al file sorgente .asm")
+    parser.add_argument("--symbolic", nargs="*", type=_input_spec, default=None, metavar="INPUT",
+                        help="Esecuzione simbolica: un valore o un intervallo lo:hi per ogni INP")
+    parser.add_argument("--max-steps", type=int, default=10000, help="Budget di istruzioni per input (--symbolic)")
+    parser.add_argument("--limit", type=int, default=50, help="Domini stampati al massimo (--symbolic)")
+    args = parser.parse_args()
+
+    memory = Assembler().assemble_file(args.asm)
+    if args.symbolic is not None:
+        symbolic(memory, args.symbolic, args.max_steps, args.limit)
+        return
+    result = analyze(memory)
+    if result.unknown_code:
+        print("Codice automodificante non analizzabile: nessuna garanzia statica")
+        return
+    print(f"Raggiungibili:     {_cells(result.reachable)}")
+    print(f"Dati:              {_cells(result.data)}")
+    print(f"Non raggiungibili: {_cells(result.unreachable)}")
+    print(f"Scritte da STA:    {_cells(result.dynamic)}")
+    print(f"HLT raggiungibili: {_cells(result.halts)}")
+    print(f"Illegali:          {_cells(result.illegal)}")
+    for loop in result.infinite_loops:
+        print(f"Ciclo infinito:    ingresso {loop.entry:02d}, celle {_cells(loop.cells)}")
+    print("Blocchi base:")
+    for start in result.leaders:
+        block = result.blocks[start]
+        print(f"  {start:02d}: {_cells(block.cells)} -> {_cells(block.successors)}")
+    if not result.can_halt:
+        print("Il programma non può terminare")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Francesco Falcon SM3201408
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Aggiunge la root del progetto al sys.path per permettere `import lmc`
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.workloads import assembly_corpus
+from lmc import Assembler, AssemblerError
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Misura il throughput dell'assembler (programmi/secondo)")
+    parser.add_argument("--count", type=int, default=2000, help="Sorgenti nel corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Ripetizioni (si tiene la migliore)")
+    parser.add_argument("--seed", type=int, default=0, help="Seme per i programmi sintetici")
+    args = parser.parse_args()
+
+    sources = assembly_corpus(args.count, args.seed)
+    asm = Assembler()
+
+    def single():
+        for src in sources:
+            try:
+                asm.assemble_source(src)
+            except AssemblerError:
+                pass
+
+    def many():
+        for _ in asm.assemble_many(sources):
+            pass
+
+    methods = (("assemble_source", single), ("assemble_many", many))
+    best = [float("inf")] * len(methods)
+    # metodi alternati a ogni ripetizione: il rumore della macchina pesa su entrambi
+    for _ in range(args.repeat):
+        for i, (_, fn) in enumerate(methods):
+            t0 = time.perf_counter()
+            fn()
+            best[i] = min(best[i], time.perf_counter() - t0)
+    print(f"{'metodo':<18}{'programmi/s':>14}")
+    for (name, _), elapsed in zip(methods, best):
+        print(f"{name:<18}{len(sources) / elapsed:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Francesco Falcon SM3201408
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Aggiunge la root del progetto al sys.path per permettere `import lmc`
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lmc import Assembler, LMC
+from lmc.compiler import CompiledLMC
+
+# (file, input, max_steps): counter con n=999 non termina e misura un ciclo lungo
+WORKLOADS = [
+    ("exec.lmc", [901, 902, 705, 600, 0, 4, 5, 6, 7, 8, 9, 0], 10000),
+    ("quine.lmc", [], 10000),
+    ("multiplication.lmc", [99, 99], 10000),
+    ("counter.asm", [999], 200000),
+]
+
+
+def measure(machine: LMC, memory, inputs, max_steps, runner, repeat):
+    """Ritorna istruzioni/secondo per `repeat` esecuzioni (reset incluso)."""
+    total = 0
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        machine.reset(memory=memory, inputs=inputs)
+        total += runner(machine, max_steps)
+    return total / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Confronta step(), run() e il motore compilato sugli esempi")
+    parser.add_argument("--repeat", type=int, default=200, help="Esecuzioni per workload")
+    args = parser.parse_args()
+
+    asm = Assembler()
+    engines = [
+        ("step", LMC, lambda m, n: m._run_steps(n)),
+        ("run", LMC, lambda m, n: m.run(n)),
+        ("compiled", CompiledLMC, lambda m, n: m.run(n)),
+    ]
+    # lo speedup confronta il motore compilato con `run()`, l'interprete veloce di riferimento
+    print(f"{'workload':<20}" + "".join(f"{name:>14}" for name, _, _ in engines) + f"{'vs run':>10}")
+    for name, inputs, max_steps in WORKLOADS:
+        memory = asm.assemble_file(str(ROOT / "examples" / name))
+        repeat = max(1, args.repeat * 10000 // max_steps)
+        rates = [measure(cls(), memory, inputs, max_steps, fn, repeat) for _, cls, fn in engines]
+        cells = "".join(f"{r / 1e6:>11.2f} M/s" for r in rates)
+        print(f"{name:<20}{cells}{rates[2] / rates[1]:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Francesco Falcon SM3201408
+
+import argparse
+import sys
+from pathlib import Path
+
+# Aggiunge la root del progetto al sys.path per permettere `import lmc`
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lmc import Assembler
+from lmc.fuzzer import Fuzzer
+
+
+def _values(text: str):
+    """'1,2,3' -> (1, 2, 3); '' -> ()."""
+    return tuple(int(v) for v in text.split(",") if v.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzing guidato dalla copertura degli input di un programma LMC")
+    parser.add_argument("asm", help="Percorso al file sorgente .asm")
+    parser.add_argument("--executions", type=int, default=10000, help="Numero di esecuzioni")
+    parser.add_argument("--time", type=float, default=None, help="Limite di tempo in secondi")
+    parser.add_argument("--workers", type=int, default=0, help="Processi paralleli (0 = nel processo corrente)")
+    parser.add_argument("--max-steps", type=int, default=10000, help="Budget di istruzioni per esecuzione")
+    parser.add_argument("--max-len", type=int, default=16, help="Lunghezza massima degli input generati")
+    parser.add_argument("--seed", type=int, default=0, help="Seme del generatore casuale")
+    parser.add_argument("--corpus", nargs="*", type=_values, default=[()], metavar="INPUTS",
+                        help="Input iniziali, valori separati da virgola (es. 5 oppure 3,4)")
+    args = parser.parse_args()
+
+    memory = Assembler().assemble_file(args.asm)
+    fuzzer = Fuzzer(memory, seeds=args.corpus, max_steps=args.max_steps, max_len=args.max_len,
+                    seed=args.seed, workers=args.workers)
+    report = fuzzer.run(args.executions, time_limit=args.time)
+    print(f"Esecuzioni: {report.executions} in {report.seconds:.2f}s ({report.execs_per_sec:,.0f}/s)")
+    print(f"Archi coperti: {len(report.edges)}, corpus: {len(report.corpus)}")
+    for crash in report.crashes:
+        inputs = ", ".join(map(str, crash.inputs))
+        print(f"  {crash.reason} a pc {crash.pc:02d}: input [{inputs}] (originale lungo {len(crash.original)})")
+    if report.crashes:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# Francesco Falcon SM3201408
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Aggiunge la root del progetto al sys.path per permettere `import lmc`
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lmc.grading import grade, load_manifest, result_to_json
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valuta in parallelo i programmi di un manifest JSONL")
+    parser.add_argument("manifest", help="File JSONL con programmi e casi di prova")
+    parser.add_argument("--workers", type=int, default=None, help="Processi worker (default: numero di CPU, 0 = nessun pool)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Casi per chunk inviato a un worker")
+    parser.add_argument("--max-steps", type=int, default=10000, help="Budget di istruzioni per caso")
+    parser.add_argument("--cache-dir", default=None, help="Cartella della cache su disco dei programmi assemblati")
+    parser.add_argument("--precheck", action="store_true", help="Boccia senza eseguirli i programmi che non possono terminare")
+    parser.add_argument("--optimize", action="store_true", help="Applica l'ottimizzatore peephole prima dell'esecuzione")
+    args = parser.parse_args()
+
+    programs = load_manifest(args.manifest)
+    total = passed = 0
+    t0 = time.perf_counter()
+    for result in grade(programs, args.workers, args.chunk_size, args.max_steps, args.cache_dir, args.precheck, args.optimize):
+        print(result_to_json(result))
+        total += 1
+        passed += result.passed
+    elapsed = time.perf_counter() - t0
+    print(f"{passed}/{total} casi superati in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
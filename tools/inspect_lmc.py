@@ -1,11 +1,13 @@
 # Francesco Falcon SM3201408
 
+import argparse
 import sys
 from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from lmc import Assembler, LMC
+from lmc import Assembler, LMC, LMCError, MachineSnapshot
+from lmc.trace import TraceRecorder
 
 
 def inspect_lmc_state(machine: LMC, step_num: int = 0):
@@ -21,19 +23,20 @@ def inspect_lmc_state(machine: LMC, step_num: int = 0):
         print(f"PROSSIMA ISTRUZIONE: {machine.memory[machine.pc]:03d}")
 
 
+# Programma: leggi due numeri e stampa la somma
+DEMO_SRC = """
+INP
+STA 10
+INP
+ADD 10
+OUT
+HLT
+"""
+
+
 def demo_inspection():
-    # Programma: leggi due numeri e stampa la somma
-    src = """
-    INP
-    STA 10
-    INP  
-    ADD 10
-    OUT
-    HLT
-    """
-    
     asm = Assembler()
-    memory = asm.assemble_source(src)
+    memory = asm.assemble_source(DEMO_SRC)
     
     machine = LMC()
     machine.reset(memory=memory, inputs=[5, 7])
@@ -55,5 +58,101 @@ def demo_inspection():
             break
 
 
+def inspect_snapshot(snap: MachineSnapshot, step_num: int):
+    """Stampa uno stato ricostruito dalla traccia."""
+    print(f"\n=== STEP {step_num} ===")
+    print(f"PC: {snap.pc:02d}")
+    print(f"ACC: {snap.accumulator}")
+    print(f"FLAG: {snap.flag}")
+    print(f"INPUT: {list(snap.inputs)}")
+    print(f"OUTPUT: {list(snap.outputs)}")
+    print(f"MEMORIA (0-20): {list(snap.memory[:21])}")
+    print(f"PROSSIMA ISTRUZIONE: {snap.memory[snap.pc]:03d}")
+
+
+def interactive(memory, inputs):
+    """Ispezione interattiva con passo avanti (s) e passo indietro (b) sulla traccia."""
+    machine = LMC()
+    machine.reset(memory=memory, inputs=inputs)
+    recorder = TraceRecorder()
+    machine.trace = recorder
+    cursor = 0
+    halted = False
+    inspect_snapshot(machine.snapshot(), cursor)
+    while True:
+        cmd = input("[s]tep, [b]ack, [q]uit > ").strip().lower() or "s"
+        if cmd == "q":
+            break
+        if cmd == "b":
+            if cursor == recorder.trace().start:
+                print("Inizio della traccia")
+                continue
+            cursor -= 1
+        elif cmd == "s":
+            if cursor == recorder.total:
+                if halted:
+                    print("HALT raggiunto!")
+                    continue
+                try:
+                    halted = machine.run(max_steps=1) == 0
+                except LMCError as e:
+                    print(f"\nErrore: {e}")
+                    continue
+                if halted:
+                    print("\nHALT raggiunto!")
+                    continue
+            cursor += 1
+        else:
+            continue
+        inspect_snapshot(recorder.trace().state_at(cursor), cursor)
+
+
+def run_to_breaks(memory, inputs, breaks, watches, max_steps):
+    """Esegue fino a ogni breakpoint/watchpoint e stampa lo stato a ciascun arresto."""
+    machine = LMC()
+    machine.reset(memory=memory, inputs=inputs)
+    for addr in breaks:
+        machine.break_at(addr)
+    for addr in watches:
+        machine.watch(addr, read=True, write=True)
+    total = 0
+    while total < max_steps:
+        try:
+            total += machine.run(max_steps - total)
+        except LMCError as e:
+            print(f"\nErrore: {e}")
+            return
+        hit = machine.last_break
+        if hit is None:
+            break
+        print(f"\n*** {hit.kind} @ {hit.address:02d} (valore {hit.value})")
+        inspect_lmc_state(machine, total)
+    if total >= max_steps:
+        print(f"\nLimite di {max_steps} passi raggiunto")
+    else:
+        print("\nHALT raggiunto!")
+    print(f"OUTPUT: {list(machine.output_queue)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ispezione passo-passo di un programma LMC")
+    parser.add_argument("asm", nargs="?", help="Percorso al file sorgente .asm (default: demo)")
+    parser.add_argument("--inputs", nargs="*", type=int, default=[], help="Valori di input (0..999)")
+    parser.add_argument("-i", "--interactive", action="store_true", help="Modalità interattiva con passo indietro")
+    parser.add_argument("--break", dest="breaks", nargs="+", type=int, default=[], metavar="ADDR", help="Ferma prima dell'istruzione in ADDR")
+    parser.add_argument("--watch", nargs="+", type=int, default=[], metavar="ADDR", help="Ferma dopo letture/scritture della cella ADDR")
+    parser.add_argument("--max-steps", type=int, default=10000, help="Budget di istruzioni con --break/--watch")
+    args = parser.parse_args()
+    if args.breaks or args.watch:
+        memory = Assembler().assemble_file(args.asm) if args.asm else Assembler().assemble_source(DEMO_SRC)
+        run_to_breaks(memory, args.inputs, args.breaks, args.watch, args.max_steps)
+        return
+    if args.asm is None and not args.interactive:
+        demo_inspection()
+        return
+    memory = Assembler().assemble_file(args.asm) if args.asm else Assembler().assemble_source(DEMO_SRC)
+    interactive(memory, args.inputs)
+
+
 if __name__ == "__main__":
-    demo_inspection()
+    main()
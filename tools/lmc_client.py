@@ -0,0 +1,39 @@
+# Francesco Falcon SM3201408
+
+import argparse
+import sys
+from pathlib import Path
+
+# Aggiunge la root del progetto al sys.path per permettere `import lmc`
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# solo client e protocollo: assembler e simulatore girano nel server
+from lmc.client import LMCClient
+from lmc.protocol import DEFAULT_PORT
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Esegui un programma LMC da file .asm sul server di sessione (come run_lmc.py)")
+    parser.add_argument("asm", help="Percorso al file sorgente .asm")
+    parser.add_argument("--inputs", nargs="*", type=int, default=[], help="Valori di input (0..999)")
+    parser.add_argument("--isa", default="classic", help="Geometria della macchina (default: classic)")
+    parser.add_argument("--max-steps", type=int, default=10000, help="Budget di istruzioni")
+    parser.add_argument("--socket", default=None, help="Socket Unix del server (altrimenti TCP su --host/--port)")
+    parser.add_argument("--host", default="127.0.0.1", help="Indirizzo TCP del server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Porta TCP del server (default: {DEFAULT_PORT})")
+    args = parser.parse_args()
+
+    source = Path(args.asm).read_text(encoding="utf-8")
+    address = args.socket or (args.host, args.port)
+    with LMCClient(address) as client:
+        result = client.run_source(source, args.inputs, isa=args.isa, max_steps=args.max_steps)
+    if result.error:
+        print(f"Errore: {result.error}", file=sys.stderr)
+        sys.exit(1)
+    print("Output:", list(result.outputs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Francesco Falcon SM3201408
+
+import argparse
+import sys
+from pathlib import Path
+
+# Aggiunge la root del progetto al sys.path per permettere `import lmc`
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lmc.protocol import DEFAULT_PORT
+from lmc.server import LMCServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server di sessione LMC su socket locale")
+    parser.add_argument("--socket", default=None, help="Percorso del socket Unix (altrimenti TCP su --host/--port)")
+    parser.add_argument("--host", default="127.0.0.1", help="Indirizzo TCP (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Porta TCP (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=4, help="Thread di esecuzione")
+    parser.add_argument("--queue-size", type=int, default=64, help="Richieste in coda oltre a quelle in esecuzione (oltre: BUSY)")
+    parser.add_argument("--max-steps", type=int, default=1_000_000, help="Limite di istruzioni per richiesta")
+    parser.add_argument("--time-limit", type=float, default=1.0, help="Limite di tempo per richiesta in secondi")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Programmi assemblati tenuti in memoria")
+    args = parser.parse_args()
+
+    server = LMCServer(
+        path=args.socket,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        max_steps=args.max_steps,
+        time_limit=args.time_limit,
+        cache_size=args.cache_size,
+    )
+    where = args.socket or f"{args.host}:{args.port}"
+    print(f"Server LMC in ascolto su {where} (Ctrl+C per terminare)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# Francesco Falcon SM3201408
+
+import argparse
+import sys
+from pathlib import Path
+
+# Aggiunge la root del progetto al sys.path per permettere `import lmc`
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lmc import Assembler, AssemblerError
+from lmc.image import write_archive
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assembla più sorgenti in un unico archivio di immagini (.lmca)")
+    parser.add_argument("sources", nargs="+", help="File sorgente .asm/.lmc")
+    parser.add_argument("-o", "--output", required=True, help="File archivio da scrivere")
+    parser.add_argument("--no-debug", action="store_true", help="Ometti simboli e mappa delle linee")
+    args = parser.parse_args()
+
+    asm = Assembler()
+
+    def images():
+        for path in args.sources:
+            try:
+                source = Path(path).read_text(encoding="utf-8")
+                yield path, asm.assemble_image(source, debug=not args.no_debug)
+            except AssemblerError as e:
+                print(f"{path}: {e}", file=sys.stderr)
+
+    write_archive(args.output, images())
+    print(f"Archivio scritto: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
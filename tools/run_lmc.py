@@ -10,22 +10,51 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from lmc import Assembler, LMC
+from lmc.isa import CLASSIC, PROFILES
+from lmc.optimizer import differential_check, optimize
+from lmc.profiler import Profile
 
 
 def main():
     parser = argparse.ArgumentParser(description="Esegui un programma LMC da file .asm")
     parser.add_argument("asm", help="Percorso al file sorgente .asm")
     parser.add_argument("--inputs", nargs="*", type=int, default=[], help="Valori di input (0..999)")
+    parser.add_argument("--profile", action="store_true", help="Stampa un profilo di esecuzione")
+    parser.add_argument("--optimize", action="store_true", help="Applica l'ottimizzatore peephole (con verifica differenziale)")
+    parser.add_argument("--isa", choices=sorted(PROFILES), default=CLASSIC.name, help="Geometria della macchina (default: classic)")
+    parser.add_argument("--max-steps", type=int, default=10000, help="Budget di istruzioni")
     args = parser.parse_args()
-
-    asm = Assembler()
-    memory = asm.assemble_file(args.asm)
-
-    m = LMC(memory=memory)
+    isa = PROFILES[args.isa]
+    if isa is not CLASSIC and (args.profile or args.optimize):
+        parser.error("--profile e --optimize richiedono il profilo classic")
+
+    source = Path(args.asm).read_text(encoding="utf-8")
+    memory, labels, lines = Assembler(isa).assemble_program(source)
+    if args.optimize:
+        result = optimize(memory)
+        if differential_check(memory, result.memory, inputs=[args.inputs]):
+            print("Ottimizzazione scartata: comportamento diverso dall'originale", file=sys.stderr)
+        else:
+            print(f"Ottimizzazione: {len(result.removed)} celle rimosse, {result.retargeted} salti ridiretti")
+            memory = result.memory
+            # le informazioni di debug vanno riportate ai nuovi indirizzi
+            labels = {name: result.address_map[addr] for name, addr in labels.items()}
+            moved = [0] * 100
+            for old, new in enumerate(result.address_map):
+                if old not in result.removed:
+                    moved[new] = lines[old]
+            lines = moved
+
+    m = LMC(isa=isa)
     m.reset(memory=memory, inputs=args.inputs)
-    m.run()
+    if args.profile:
+        m.profile = Profile()
+    m.run(args.max_steps)
 
     print("Output:", list(m.output_queue))
+    if args.profile:
+        print()
+        print(m.profile.report(memory, labels, lines, source))
 
 
 if __name__ == "__main__":